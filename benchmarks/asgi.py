@@ -0,0 +1,231 @@
+"""
+WSGI vs ASGI under concurrency: serves the app once as it is deployed today (gunicorn sync workers on
+``todolist.wsgi``) and once with uvicorn workers on ``todolist.asgi``, both with the same number of worker
+processes, and drives the hot read endpoints over keep-alive connections at increasing concurrency.
+Prints requests/sec, latency percentiles and the servers' resident memory as JSON.
+
+    python -m benchmarks.asgi [--workers 4] [--concurrency 8,32,128] [--duration 10] [--goals 300]
+
+Runs against the configured database with a seeded ``load-<run>-0`` user, removed afterwards. The list
+cache is disabled in the servers so every request reaches Postgres, unless ``--cache`` is given.
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from http.cookies import SimpleCookie
+from pathlib import Path
+from urllib.parse import quote
+
+from benchmarks.load import PASSWORD, SEARCH_TERMS, _percentile, cleanup, seed
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+
+DEPLOYMENTS = {
+    'wsgi': lambda port, workers: [
+        sys.executable, '-m', 'gunicorn', 'todolist.wsgi', '-w', str(workers), '-b', f'127.0.0.1:{port}',
+    ],
+    'asgi': lambda port, workers: [
+        sys.executable, '-m', 'uvicorn', 'todolist.asgi:application', '--workers', str(workers),
+        '--lifespan', 'off', '--no-access-log', '--host', '127.0.0.1', '--port', str(port),
+    ],
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _rss(pid: int) -> int:
+    """Resident bytes of ``pid`` and all of its descendants."""
+    children: dict[int, list[int]] = {}
+    for status in Path('/proc').glob('[0-9]*/status'):
+        try:
+            fields = dict(line.split(':', 1) for line in status.read_text().splitlines() if ':' in line)
+        except OSError:
+            continue
+        children.setdefault(int(fields['PPid']), []).append(int(fields['Pid']))
+
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack += children.get(current, [])
+        try:
+            status = Path(f'/proc/{current}/status').read_text()
+        except OSError:
+            continue
+        total += next((int(line.split()[1]) * 1024 for line in status.splitlines() if line.startswith('VmRSS:')), 0)
+    return total
+
+
+@contextmanager
+def serve(deployment: str, workers: int, env: dict):
+    port = _free_port()
+    process = subprocess.Popen(
+        DEPLOYMENTS[deployment](port, workers), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+                connection.request('GET', '/ping/')
+                if connection.getresponse().status == 200:
+                    break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f'{deployment} server did not start')
+                time.sleep(0.2)
+        yield process, port
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def login(port: int, username: str) -> str:
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    body = json.dumps({'username': username, 'password': PASSWORD})
+    connection.request('POST', '/core/login', body, {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    response.read()
+    cookie = SimpleCookie(response.getheader('Set-Cookie'))
+    return f'sessionid={cookie["sessionid"].value}'
+
+
+def read_paths(username: str) -> list[str]:
+    goals = list(Goal.objects.filter(user__username=username).values_list('id', flat=True)[:20])
+    categories = list(GoalCategory.objects.filter(user__username=username).values_list('id', flat=True)[:5])
+    comments = list(GoalComment.objects.filter(user__username=username).values_list('id', flat=True)[:5])
+    return [
+        '/goals/goal/list?limit=20',
+        '/goals/goal/list?limit=20&cursor=&ordering=-created',
+        *(f'/goals/goal/list?limit=20&search={quote(term)}' for term in SEARCH_TERMS[:2]),
+        f'/goals/goal/list?limit=20&category={categories[0]}&status__in=1,2',
+        '/goals/goal_category/list?limit=20',
+        '/goals/goal_comment/list?limit=20',
+        *(f'/goals/goal/{goal_id}' for goal_id in goals[:5]),
+        *(f'/goals/goal_category/{category_id}' for category_id in categories[:2]),
+        *(f'/goals/goal_comment/{comment_id}' for comment_id in comments[:2]),
+        '/core/profile',
+        '/ping/',
+    ]
+
+
+async def _request(reader, writer, path: str, cookie: str) -> tuple[int, bool]:
+    writer.write(
+        f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: application/json\r\nCookie: {cookie}\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length, keep_alive = 0, True
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+        elif name.lower() == 'connection' and value.strip().lower() == 'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def _client(port: int, cookie: str, paths: list[str], deadline: float, rng: random.Random,
+                  latencies: list[float], errors: list[int]) -> None:
+    connection = None
+    while time.monotonic() < deadline:
+        path = rng.choice(paths)
+        start = time.perf_counter()
+        try:
+            # Sync gunicorn workers close the connection after every response, reconnecting is part of the cost
+            if connection is None:
+                connection = await asyncio.open_connection('127.0.0.1', port)
+            status, keep_alive = await _request(*connection, path, cookie)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            status, keep_alive = 599, False
+        latencies.append(time.perf_counter() - start)
+        if status >= 400:
+            errors.append(status)
+        if not keep_alive and connection is not None:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def drive(port: int, cookie: str, paths: list[str], concurrency: int, duration: float, seed_value: int) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    start = time.monotonic()
+    await asyncio.gather(*(
+        _client(port, cookie, paths, start + duration, random.Random(seed_value + index), latencies, errors)
+        for index in range(concurrency)
+    ))
+    elapsed = time.monotonic() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': round(len(latencies) / elapsed, 2),
+        **{f'p{p}_ms': round(_percentile(latencies, p) * 1000, 2) for p in (50, 95, 99)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='worker processes of either server')
+    parser.add_argument('--concurrency', default='8,32,128', help='comma-separated numbers of open connections')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per concurrency level')
+    parser.add_argument('--goals', type=int, default=300, help='goals seeded for the benchmark user')
+    parser.add_argument('--deployments', default=','.join(DEPLOYMENTS), help='comma-separated subset to run')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--cache', action='store_true', help='keep the list cache enabled in the servers')
+    parser.add_argument('--output', help='write the JSON result here instead of stdout')
+    args = parser.parse_args()
+
+    run = uuid.uuid4().hex[:8]
+    (username,) = seed(run, 1, args.goals, random.Random(args.seed))
+    metrics_dir = tempfile.TemporaryDirectory(prefix='todolist-benchmark-metrics-')
+    env = {**os.environ, 'METRICS_DIR': metrics_dir.name}
+    if not args.cache:
+        env['LIST_CACHE_TIMEOUT'] = '0'
+
+    results = {}
+    try:
+        paths = read_paths(username)
+        for deployment in args.deployments.split(','):
+            with serve(deployment, args.workers, env) as (process, port):
+                cookie = login(port, username)
+                # Warm up every worker's imports and connections before measuring memory
+                asyncio.run(drive(port, cookie, paths, args.workers * 2, 2, args.seed))
+                runs = {
+                    concurrency: asyncio.run(drive(port, cookie, paths, concurrency, args.duration, args.seed))
+                    for concurrency in map(int, args.concurrency.split(','))
+                }
+                results[deployment] = {'rss_mb': round(_rss(process.pid) / 2 ** 20, 1), 'runs': runs}
+    finally:
+        cleanup(run)
+        metrics_dir.cleanup()
+
+    result = {
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'deployments': results,
+    }
+    output = json.dumps(result, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == '__main__':
+    main()
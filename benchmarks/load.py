@@ -0,0 +1,302 @@
+"""
+Load benchmark: concurrent synthetic users drive ``todolist.wsgi.application`` in-process through plain WSGI
+calls and the results are printed as JSON (requests/sec and latency percentiles per endpoint).
+
+    python -m benchmarks.load [--users 8] [--duration 20] [--goals 200] [--output result.json]
+
+Runs against the configured database. Benchmark users are created as ``load-<run>-<n>`` and removed
+afterwards together with their data unless ``--keep`` is given.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connections  # noqa: E402
+
+from todolist.core.models import User  # noqa: E402
+from todolist.goals.models import Goal, GoalCategory, GoalComment  # noqa: E402
+from todolist.wsgi import application  # noqa: E402
+
+PASSWORD = 'Load-benchmark-42'
+SEARCH_TERMS = ('отчёт', 'план', 'report', 'read', 'спорт', 'проект')
+TITLES = (
+    'Подготовить отчёт', 'План на неделю', 'Read a book', 'Спорт три раза', 'Write report', 'Проект сайта',
+    'Выучить английский', 'Call the bank', 'Купить продукты', 'Fix the bike',
+)
+
+
+class Client:
+    """Minimal WSGI client keeping cookies and the CSRF token between calls."""
+
+    def __init__(self):
+        self.cookies = SimpleCookie()
+
+    def request(self, method: str, path: str, params: dict | None = None, data=None) -> tuple[int, bytes]:
+        body = json.dumps(data).encode() if data is not None else b''
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': urlencode(params or {}, doseq=True),
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'HTTP_ACCEPT': 'application/json',
+            'HTTP_COOKIE': '; '.join(f'{key}={morsel.value}' for key, morsel in self.cookies.items()),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+        }
+        if 'csrftoken' in self.cookies:
+            environ['HTTP_X_CSRFTOKEN'] = self.cookies['csrftoken'].value
+        setup_testing_defaults(environ)
+
+        status = []
+
+        def start_response(status_line, headers, exc_info=None):
+            status.append(int(status_line.split()[0]))
+            for name, value in headers:
+                if name.lower() == 'set-cookie':
+                    self.cookies.load(value)
+
+        result = application(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status[0], content
+
+
+class VirtualUser:
+    """One synthetic user running a weighted mix of the calls the frontend makes."""
+
+    def __init__(self, username: str, rng: random.Random):
+        self.username = username
+        self.rng = rng
+        self.client = Client()
+        self.categories: list[int] = []
+        self.goals: list[int] = []
+        self.actions = (
+            (30, 'list goals', self.list_goals),
+            (15, 'filter goals', self.filter_goals),
+            (15, 'search goals', self.search_goals),
+            (10, 'list categories', self.list_categories),
+            (5, 'autocomplete goals', self.autocomplete_goals),
+            (5, 'list comments', self.list_comments),
+            (10, 'create goal', self.create_goal),
+            (10, 'patch goal', self.patch_goal),
+        )
+
+    def login(self) -> int:
+        credentials = {'username': self.username, 'password': PASSWORD}
+        status, _ = self.client.request('POST', '/core/login', data=credentials)
+        _, content = self.client.request('GET', '/goals/goal_category/list', {'limit': 100})
+        self.categories = [category['id'] for category in json.loads(content)['results']]
+        _, content = self.client.request('GET', '/goals/goal/list', {'limit': 100})
+        self.goals = [goal['id'] for goal in json.loads(content)['results']]
+        return status
+
+    def list_goals(self) -> int:
+        params = {
+            'limit': 20,
+            'offset': self.rng.choice((0, 0, 20, 40)),
+            'ordering': self.rng.choice(('title', '-created')),
+        }
+        return self.client.request('GET', '/goals/goal/list', params)[0]
+
+    def filter_goals(self) -> int:
+        params = {
+            'limit': 20,
+            'category__in': ','.join(map(str, self.rng.sample(self.categories, min(2, len(self.categories))))),
+            'status__in': '1,2',
+            'priority': self.rng.randint(1, 4),
+        }
+        return self.client.request('GET', '/goals/goal/list', params)[0]
+
+    def search_goals(self) -> int:
+        params = {'limit': 20, 'search': self.rng.choice(SEARCH_TERMS)}
+        return self.client.request('GET', '/goals/goal/list', params)[0]
+
+    def list_categories(self) -> int:
+        return self.client.request('GET', '/goals/goal_category/list', {'limit': 20})[0]
+
+    def autocomplete_goals(self) -> int:
+        term = self.rng.choice(TITLES)[:self.rng.randint(2, 5)]
+        return self.client.request('GET', '/goals/goal/autocomplete', {'search': term})[0]
+
+    def list_comments(self) -> int:
+        params = {'limit': 20, 'goal': self.rng.choice(self.goals)} if self.goals else {'limit': 20}
+        return self.client.request('GET', '/goals/goal_comment/list', params)[0]
+
+    def create_goal(self) -> int:
+        status, content = self.client.request('POST', '/goals/goal/create', data={
+            'title': self.rng.choice(TITLES),
+            'category': self.rng.choice(self.categories),
+            'priority': self.rng.randint(1, 4),
+        })
+        if status == 201:
+            self.goals.append(json.loads(content)['id'])
+        return status
+
+    def patch_goal(self) -> int:
+        if not self.goals:
+            return self.create_goal()
+        goal_id = self.rng.choice(self.goals)
+        return self.client.request('PATCH', f'/goals/goal/{goal_id}', data={'status': self.rng.randint(1, 3)})[0]
+
+    def pick(self):
+        weights = [weight for weight, _, _ in self.actions]
+        _, name, action = self.rng.choices(self.actions, weights=weights)[0]
+        return name, action
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, func) -> None:
+        start = time.perf_counter()
+        try:
+            status = func()
+        except Exception:
+            # A crashed request counts as failed, the run goes on
+            status = 599
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.latencies[name].append(elapsed)
+            if status >= 400:
+                self.errors[name] += 1
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    # Nearest-rank on already sorted values
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for name, latencies in sorted(recorder.latencies.items()):
+        latencies = sorted(latencies)
+        endpoints[name] = {
+            'requests': len(latencies),
+            'errors': recorder.errors[name],
+            'rps': round(len(latencies) / elapsed, 2),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+            **{f'p{p}_ms': round(_percentile(latencies, p) * 1000, 2) for p in (50, 95, 99)},
+        }
+    total = sum(endpoint['requests'] for endpoint in endpoints.values())
+    return {
+        'requests': total,
+        'errors': sum(recorder.errors.values()),
+        'rps': round(total / elapsed, 2),
+        'endpoints': endpoints,
+    }
+
+
+def seed(run: str, users: int, goals: int, rng: random.Random) -> list[str]:
+    password = make_password(PASSWORD)
+    created = User.objects.bulk_create(
+        User(username=f'load-{run}-{index}', password=password) for index in range(users)
+    )
+    for user in created:
+        categories = GoalCategory.objects.bulk_create(
+            GoalCategory(user=user, title=f'{rng.choice(TITLES)} {index}') for index in range(max(1, goals // 20))
+        )
+        user_goals = Goal.objects.bulk_create(
+            Goal(
+                user=user,
+                category=rng.choice(categories),
+                title=rng.choice(TITLES),
+                description=' '.join(rng.choices(TITLES, k=3)),
+                status=rng.randint(1, 3),
+                priority=rng.randint(1, 4),
+            )
+            for _ in range(goals)
+        )
+        GoalComment.objects.bulk_create(
+            GoalComment(user=user, goal=goal, text='Комментарий') for goal in user_goals[::4]
+        )
+    return [user.username for user in created]
+
+
+def cleanup(run: str) -> None:
+    users = User.objects.filter(username__startswith=f'load-{run}-')
+    # Authors are PROTECTed, so remove their data bottom-up
+    for model in (GoalComment, Goal, GoalCategory):
+        model.objects.filter(user__in=users).delete()
+    users.delete()
+
+
+def worker(username: str, seed_value: int, deadline: float, recorder: Recorder) -> None:
+    user = VirtualUser(username, random.Random(seed_value))
+    try:
+        recorder.record('login', user.login)
+        while time.monotonic() < deadline:
+            name, action = user.pick()
+            recorder.record(name, action)
+    finally:
+        connections.close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=8, help='concurrent virtual users (threads)')
+    parser.add_argument('--duration', type=float, default=20, help='seconds to run')
+    parser.add_argument('--goals', type=int, default=200, help='goals seeded per user')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the JSON result here instead of stdout')
+    parser.add_argument('--keep', action='store_true', help='keep the benchmark users and their data')
+    args = parser.parse_args()
+
+    run = uuid.uuid4().hex[:8]
+    rng = random.Random(args.seed)
+    usernames = seed(run, args.users, args.goals, rng)
+    recorder = Recorder()
+    try:
+        start = time.monotonic()
+        threads = [
+            threading.Thread(target=worker, args=(username, args.seed + index, start + args.duration, recorder))
+            for index, username in enumerate(usernames)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+    finally:
+        if not args.keep:
+            cleanup(run)
+        connections.close_all()
+
+    result = {
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'keep')},
+        **summarize(recorder, elapsed),
+    }
+    output = json.dumps(result, indent=2, ensure_ascii=False) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == '__main__':
+    main()
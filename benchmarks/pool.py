@@ -0,0 +1,92 @@
+"""
+Per-request latency with and without the connection pool: serves the app with DB_POOL off and on, under
+gunicorn (``todolist.wsgi``) and uvicorn (``todolist.asgi``) as in benchmarks.asgi, and drives the hot read
+endpoints at each concurrency level. Prints requests/sec and latency percentiles as JSON, along with the
+connections the servers opened and their mean wait for a pooled one.
+
+    python -m benchmarks.pool [--workers 2] [--concurrency 1,8,32] [--duration 10] [--goals 300]
+
+Runs against the configured database with a seeded ``load-<run>-0`` user, removed afterwards. The list
+cache is disabled in the servers so every request reaches Postgres.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+from django.test import override_settings
+
+from benchmarks.asgi import DEPLOYMENTS, drive, login, read_paths, serve
+from benchmarks.load import cleanup, seed
+from todolist.metrics import collect, registry
+
+
+def pool_metrics(metrics_dir: str) -> dict:
+    # collect() adds this process' own metrics, of the seeding queries
+    registry.reset()
+    with override_settings(METRICS_DIR=metrics_dir):
+        metrics = collect()
+    opened = sum(value for key, value in metrics['counters'].items() if 'pool_connections_opened' in key)
+    waits = [value for key, value in metrics['histograms'].items() if 'pool_wait' in key]
+    count = sum(wait['count'] for wait in waits)
+    return {
+        'connections_opened': opened,
+        'checkouts': count,
+        'mean_wait_ms': round(sum(wait['sum'] for wait in waits) / count * 1000, 3) if count else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=2, help='worker processes of either server')
+    parser.add_argument('--concurrency', default='1,8,32', help='comma-separated numbers of open connections')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per concurrency level')
+    parser.add_argument('--goals', type=int, default=300, help='goals seeded for the benchmark user')
+    parser.add_argument('--deployments', default=','.join(DEPLOYMENTS), help='comma-separated subset to run')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the JSON result here instead of stdout')
+    args = parser.parse_args()
+
+    run = uuid.uuid4().hex[:8]
+    (username,) = seed(run, 1, args.goals, random.Random(args.seed))
+    results = {}
+    try:
+        paths = read_paths(username)
+        for deployment in args.deployments.split(','):
+            for pooled in (False, True):
+                with tempfile.TemporaryDirectory(prefix='todolist-benchmark-metrics-') as metrics_dir:
+                    env = {
+                        **os.environ, 'METRICS_DIR': metrics_dir, 'LIST_CACHE_TIMEOUT': '0',
+                        'DB_POOL': str(pooled), 'DB_POOL_SIZE': str(max(map(int, args.concurrency.split(',')))),
+                    }
+                    with serve(deployment, args.workers, env) as (process, port):
+                        cookie = login(port, username)
+                        asyncio.run(drive(port, cookie, paths, args.workers * 2, 2, args.seed))
+                        runs = {
+                            concurrency: asyncio.run(drive(port, cookie, paths, concurrency, args.duration, args.seed))
+                            for concurrency in map(int, args.concurrency.split(','))
+                        }
+                    results[f'{deployment}-{"pool" if pooled else "no-pool"}'] = {
+                        'runs': runs, **pool_metrics(metrics_dir),
+                    }
+    finally:
+        cleanup(run)
+
+    result = {
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'deployments': results,
+    }
+    output = json.dumps(result, indent=2) + '\n'
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Rows/sec of the list serializers against their ValuesReader counterparts.
+
+    python -m benchmarks.serializers [--rows 5000] [--repeat 5]
+
+Seeds its own user, categories, goals and comments inside a transaction that is rolled back afterwards.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from todolist.core.models import User  # noqa: E402
+from todolist.goals.models import Goal, GoalCategory, GoalComment  # noqa: E402
+from todolist.goals.readers import get_reader  # noqa: E402
+from todolist.goals.serializers import GoalCategorySerializer, GoalCommentSerializer, GoalSerializer  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def seed(rows: int) -> User:
+    user = User.objects.create_user(username='benchmark-serializers', first_name='Bench', email='bench@example.com')
+    categories = GoalCategory.objects.bulk_create(
+        GoalCategory(user=user, title=f'Category {index}') for index in range(rows)
+    )
+    goals = Goal.objects.bulk_create(
+        Goal(user=user, category=category, title=f'Goal {index}', description='x' * 100)
+        for index, category in enumerate(categories)
+    )
+    GoalComment.objects.bulk_create(GoalComment(user=user, goal=goal, text='Comment') for goal in goals)
+    return user
+
+
+def best_of(repeat: int, func, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def serialize(renderer, serializer_class, queryset) -> bytes:
+    return renderer.render(serializer_class(queryset.all(), many=True).data)
+
+
+def read(renderer, reader, queryset) -> bytes:
+    return renderer.render(reader.render(queryset.values(*reader.columns)))
+
+
+def run(rows: int, repeat: int) -> dict:
+    renderer = JSONRenderer()
+    user = seed(rows)
+    cases = (
+        (GoalCategorySerializer, GoalCategory.objects.select_related('user')),
+        (GoalSerializer, Goal.objects.all()),
+        (GoalCommentSerializer, GoalComment.objects.select_related('user')),
+    )
+    results = {}
+    for serializer_class, queryset in cases:
+        queryset = queryset.filter(user=user).order_by('id')
+        reader = get_reader(serializer_class)
+        before = best_of(repeat, serialize, renderer, serializer_class, queryset)
+        after = best_of(repeat, read, renderer, reader, queryset)
+        results[serializer_class.__name__] = {
+            'serializer_rows_per_sec': round(rows / before),
+            'reader_rows_per_sec': round(rows / after),
+            'speedup': round(before / after, 2),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with contextlib.suppress(Rollback), transaction.atomic():
+        sys.stdout.write(json.dumps(run(args.rows, args.repeat), indent=2) + '\n')
+        raise Rollback
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Worker boot cost per APP_PROFILE: imports ``todolist.wsgi`` (Django setup and warmup, as a gunicorn worker
+does) in fresh processes and prints as JSON the medians of the import time, the modules loaded and the
+worker's resident memory after booting and after serving a few requests.
+
+    python -m benchmarks.startup [--runs 5] [--requests 50] [--output result.json]
+
+Warmup opens a connection to the configured database. The requests are anonymous and need no data.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROFILES = ('full', 'api')
+
+WORKER = '''
+import json
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+
+def rss() -> int:
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+
+PAGE_SIZE = int(sys.argv[2])
+started = time.perf_counter()
+from todolist.wsgi import application  # noqa: E402
+boot = time.perf_counter() - started
+booted_rss, modules = rss(), len(sys.modules)
+
+paths = ['/ping/', '/goals/goal/list', '/core/profile']
+for n in range(int(sys.argv[1])):
+    environ = {'PATH_INFO': paths[n % len(paths)]}
+    setup_testing_defaults(environ)
+    b''.join(application(environ, lambda status, headers: None))
+print(json.dumps({'boot_ms': boot * 1000, 'modules': modules, 'booted_rss': booted_rss, 'served_rss': rss()}))
+'''
+
+
+def boot(profile: str, requests: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, '-c', WORKER, str(requests), str(os.sysconf('SC_PAGE_SIZE'))],
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'todolist.settings', 'APP_PROFILE': profile},
+        cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def measure(profile: str, runs: int, requests: int) -> dict:
+    samples = [boot(profile, requests) for _ in range(runs)]
+    return {
+        'boot_ms': round(statistics.median(sample['boot_ms'] for sample in samples), 1),
+        'modules': statistics.median(sample['modules'] for sample in samples),
+        'booted_rss_mb': round(statistics.median(sample['booted_rss'] for sample in samples) / 2 ** 20, 1),
+        'served_rss_mb': round(statistics.median(sample['served_rss'] for sample in samples) / 2 ** 20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='worker processes booted per profile')
+    parser.add_argument('--requests', type=int, default=50, help='requests served by every worker after booting')
+    parser.add_argument('--output', help='write the JSON result here instead of stdout')
+    args = parser.parse_args()
+
+    result = {profile: measure(profile, args.runs, args.requests) for profile in PROFILES}
+    output = json.dumps(result, indent=2) + '\n'
+    if args.output:
+        Path(args.output).write_text(output)
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == '__main__':
+    main()
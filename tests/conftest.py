@@ -1,7 +1,33 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
+from todolist.core import auth
 from todolist.core.models import User
+from todolist.goals.models import Goal, GoalCategory
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def last_logins(monkeypatch) -> auth.LastLoginBatch:
+    # A batch per test: pending writes must not outlive the test database
+    batch = auth.LastLoginBatch()
+    monkeypatch.setattr(auth, 'last_logins', batch)
+    yield batch
+    batch.stop()
+
+
+@pytest.fixture(autouse=True)
+def throttle_dir(settings, tmp_path):
+    # Fresh token buckets per test, the default rates would throttle the suite's many logins
+    settings.THROTTLE_DIR = str(tmp_path / 'throttle')
+    return tmp_path / 'throttle'
 
 
 @pytest.fixture()
@@ -19,3 +45,13 @@ def user(faker) -> User:
         user_data['email'] = faker.email()
 
     return User.objects.create_user(**user_data)
+
+
+@pytest.fixture()
+def category(user, faker) -> GoalCategory:
+    return GoalCategory.objects.create(user=user, title=faker.sentence(nb_words=3))
+
+
+@pytest.fixture()
+def goal(user, category, faker) -> Goal:
+    return Goal.objects.create(user=user, category=category, title=faker.sentence(nb_words=4))
@@ -0,0 +1,134 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from todolist.core import auth
+from todolist.core.models import User
+
+PASSWORD = 'Cached-password-42'
+
+
+@pytest.fixture()
+def account(faker) -> User:
+    return User.objects.create_user(username=faker.user_name(), password=PASSWORD)
+
+
+def _login(user: User) -> APIClient:
+    client = APIClient()
+    response = client.post(reverse('login'), {'username': user.username, 'password': PASSWORD})
+    assert response.status_code == status.HTTP_200_OK
+    return client
+
+
+@pytest.mark.django_db
+def test_warm_requests_skip_the_auth_queries(account):
+    client = _login(account)
+    client.get(reverse('profile'))
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('profile'))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(queries) == 0
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('list-goals'), {'limit': 5, 'offset': 5})
+    assert response.status_code == status.HTTP_200_OK
+    tables = ' '.join(query['sql'] for query in queries.captured_queries)
+    assert 'django_session' not in tables and 'core_user' not in tables
+
+
+@pytest.mark.django_db
+def test_profile_update_is_seen(account):
+    client = _login(account)
+    client.get(reverse('profile'))
+    client.patch(reverse('profile'), {'first_name': 'Renamed'})
+    assert client.get(reverse('profile')).json()['first_name'] == 'Renamed'
+
+
+@pytest.mark.django_db
+def test_password_hash_is_not_cached(account):
+    client = _login(account)
+    client.get(reverse('profile'))
+    user, _ = cache.get(auth._user_key(account.id))
+    assert 'password' not in vars(user)
+
+    # Loaded again for the check of the old password
+    response = client.patch(reverse('update-password'), {'old_password': PASSWORD, 'new_password': 'New-password-42'})
+    assert response.status_code == status.HTTP_200_OK
+    account.refresh_from_db()
+    assert account.check_password('New-password-42')
+
+
+@pytest.mark.django_db
+def test_password_change_ends_other_sessions(account):
+    client, other = _login(account), _login(account)
+    assert other.get(reverse('profile')).status_code == status.HTTP_200_OK
+
+    response = client.patch(reverse('update-password'), {'old_password': PASSWORD, 'new_password': 'New-password-42'})
+    assert response.status_code == status.HTTP_200_OK
+    assert other.get(reverse('profile')).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_logout(account):
+    client = _login(account)
+    assert client.get(reverse('profile')).status_code == status.HTTP_200_OK
+    assert client.delete(reverse('profile')).status_code == status.HTTP_204_NO_CONTENT
+    assert client.get(reverse('profile')).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_last_login_is_written_in_batches(settings, faker):
+    settings.LAST_LOGIN_BATCH_SIZE = 2
+    first, second = (User.objects.create_user(username=faker.user_name() + f'-{n}', password=PASSWORD)
+                     for n in range(2))
+
+    _login(first)
+    first.refresh_from_db()
+    assert first.last_login is None
+
+    with CaptureQueriesContext(connection) as queries:
+        _login(second)
+    assert sum('UPDATE core_user' in query['sql'] for query in queries.captured_queries) == 1
+    assert all(user.last_login for user in User.objects.filter(id__in=[first.id, second.id]))
+
+
+@pytest.mark.django_db
+def test_last_login_interval(settings, account):
+    settings.LAST_LOGIN_FLUSH_INTERVAL = 0
+    _login(account)
+    account.refresh_from_db()
+    assert account.last_login is not None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_last_login_timer(settings, account):
+    # Written by the timer's thread, which only sees committed rows
+    settings.LAST_LOGIN_FLUSH_INTERVAL = 0.1
+    _login(account)
+    account.refresh_from_db()
+    assert account.last_login is None
+
+    deadline = time.monotonic() + 5
+    while account.last_login is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+        account.refresh_from_db()
+    assert account.last_login is not None
+
+
+@pytest.mark.django_db
+def test_disabled(settings, account):
+    settings.CACHED_AUTH = False
+    client = _login(account)
+    account.refresh_from_db()
+    assert account.last_login is not None
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(reverse('profile'))
+    assert any('core_user' in query['sql'] for query in queries.captured_queries)
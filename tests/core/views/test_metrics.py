@@ -0,0 +1,115 @@
+import json
+import subprocess
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.metrics import registry
+
+
+@pytest.fixture(autouse=True)
+def metrics_dir(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    registry.reset()
+    yield tmp_path
+    registry.reset()
+
+
+def _snapshot(path, requests: int) -> None:
+    path.write_text(json.dumps({
+        'counters': {json.dumps(['todolist_http_requests_total', [
+            ['method', 'GET'], ['route', 'ping/'], ['status', '200'],
+        ]]): requests},
+        'histograms': {},
+    }))
+
+
+def _metrics(client) -> dict[str, float]:
+    response = client.get(reverse('metrics'))
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if not line.startswith('#'):
+            series, value = line.rsplit(' ', 1)
+            samples[series] = float(value)
+    return samples
+
+
+@pytest.mark.django_db
+def test_forbidden_for_other_addresses(client):
+    response = client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_requests_are_recorded_per_route(client, user, goal):
+    client.force_login(user)
+    client.get(reverse('list-goals'))
+    client.get(reverse('retrieve-update-destroy-goal', args=[goal.id]))
+    client.get(reverse('retrieve-update-destroy-goal', args=[0]))
+    content = client.get(reverse('export', args=['ndjson']))
+    size = len(b''.join(content.streaming_content))
+
+    samples = _metrics(client)
+    detail = 'method="GET",route="goals/goal/<pk>"'
+    export = 'method="GET",route="goals/export.<str:export_format>"'
+    assert samples[f'todolist_http_requests_total{{{detail},status="200"}}'] == 1
+    assert samples[f'todolist_http_requests_total{{{detail},status="404"}}'] == 1
+    assert samples[f'todolist_http_request_duration_seconds_count{{{detail}}}'] == 2
+    assert samples[f'todolist_http_request_duration_seconds_bucket{{{detail},le="+Inf"}}'] == 2
+    assert samples[f'todolist_db_queries_total{{{detail}}}'] > 0
+    # Export queries run while the body is consumed
+    assert samples[f'todolist_db_queries_total{{{export}}}'] >= 3
+    assert samples[f'todolist_http_response_size_bytes_total{{{export}}}'] == size
+
+
+@pytest.mark.django_db
+def test_snapshots_of_other_workers_are_summed(client, metrics_dir):
+    client.get(reverse('health-check'))
+    own = _metrics(client)
+    series = 'todolist_http_requests_total{method="GET",route="ping/",status="200"}'
+
+    # PID 1 is always running
+    _snapshot(metrics_dir / '1-0a.json', 5)
+    assert _metrics(client)[series] == own[series] + 5
+
+
+@pytest.mark.django_db
+def test_snapshots_of_exited_workers_are_folded(client, metrics_dir):
+    client.get(reverse('health-check'))
+    own = _metrics(client)
+    series = 'todolist_http_requests_total{method="GET",route="ping/",status="200"}'
+    process = subprocess.Popen(['true'])
+    process.wait()
+    pid = process.pid
+
+    _snapshot(metrics_dir / f'{pid}-0a.json', 5)
+    _snapshot(metrics_dir / f'{pid}-0b.json', 2)
+    assert _metrics(client)[series] == own[series] + 7
+    assert not list(metrics_dir.glob(f'{pid}-*.json'))
+
+    # A later worker with the same PID adds to the totals instead of replacing them
+    _snapshot(metrics_dir / f'{pid}-0c.json', 1)
+    assert _metrics(client)[series] == own[series] + 8
+    assert _metrics(client)[series] == own[series] + 8
+
+
+@pytest.mark.django_db
+def test_async_views_are_recorded(client, user, goal, settings):
+    settings.ROOT_URLCONF = 'todolist.asgi_urls'
+    async_client = AsyncClient()
+    async_client.force_login(user)
+
+    async def get():
+        return await async_client.get(reverse('list-goals'))
+
+    assert async_to_sync(get)().status_code == status.HTTP_200_OK
+    samples = _metrics(client)
+    labels = 'method="GET",route="goals/goal/list"'
+    assert samples[f'todolist_http_requests_total{{{labels},status="200"}}'] == 1
+    # Counted although the async ORM runs them in another thread
+    assert samples[f'todolist_db_queries_total{{{labels}}}'] >= 3
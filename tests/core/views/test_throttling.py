@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from todolist.core import throttling
+from todolist.core.models import User
+
+PASSWORD = 'Throttled-password-42'
+
+
+@pytest.fixture()
+def rates(settings):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'login.ip': '5/min', 'login.username': '2/min', 'signup.ip': '1/hour'},
+    }
+
+
+def _login(client: APIClient, username: str, password: str = 'Wrong-password-42', ip: str = '10.0.0.1'):
+    return client.post(reverse('login'), {'username': username, 'password': password}, REMOTE_ADDR=ip)
+
+
+@pytest.mark.django_db
+def test_login_per_username(client, rates, faker):
+    user = User.objects.create_user(username=faker.user_name(), password=PASSWORD)
+    assert _login(client, user.username, ip='10.0.0.1').status_code == status.HTTP_403_FORBIDDEN
+    assert _login(client, user.username.upper(), ip='10.0.0.2').status_code == status.HTTP_403_FORBIDDEN
+
+    response = _login(client, user.username, PASSWORD, ip='10.0.0.3')
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert 0 < int(response['Retry-After']) <= 30
+    assert _login(client, 'someone-else', ip='10.0.0.3').status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_login_per_address(client, rates):
+    codes = [_login(client, f'user-{n}').status_code for n in range(6)]
+    assert codes == [status.HTTP_403_FORBIDDEN] * 5 + [status.HTTP_429_TOO_MANY_REQUESTS]
+    assert _login(client, 'user-6', ip='10.0.0.2').status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_spoofed_forwarded_for(client, rates):
+    # As nginx forwards them, with the client's own header kept in front of the address it connected from
+    def login(n: int, address: str = '10.0.0.1'):
+        return client.post(reverse('login'), {'username': f'user-{n}', 'password': 'Wrong-password-42'},
+                           HTTP_X_FORWARDED_FOR=f'192.0.2.{n}, {address}', REMOTE_ADDR='172.16.0.2')
+
+    codes = [login(n).status_code for n in range(6)]
+    assert codes == [status.HTTP_403_FORBIDDEN] * 5 + [status.HTTP_429_TOO_MANY_REQUESTS]
+    assert login(6, address='10.0.0.2').status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_signup_per_address(client, rates):
+    def signup(username: str):
+        return client.post(reverse('signup'), {
+            'username': username, 'password': PASSWORD, 'password_repeat': PASSWORD,
+        }, REMOTE_ADDR='10.0.0.1')
+
+    assert signup('first').status_code == status.HTTP_201_CREATED
+    assert signup('second').status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert not User.objects.filter(username='second').exists()
+
+
+def test_bucket_refills(throttle_dir):
+    store = throttling.BucketStore(throttle_dir / 'buckets')
+    assert [store.take('key', 2, 0.5, now=100) for _ in range(3)] == [0, 0, 2]
+    assert store.take('key', 2, 0.5, now=101) == 1
+    assert store.take('key', 2, 0.5, now=102) == 0
+    # Shared through the file
+    assert throttling.BucketStore(throttle_dir / 'buckets').take('key', 2, 0.5, now=102) == 2
+
+
+def test_hashing_slots_cap_concurrency(settings):
+    settings.PASSWORD_HASHING_CPU_SHARE = 0
+    settings.PASSWORD_HASHING_WAIT = 5
+    running, peak, lock = 0, 0, threading.Lock()
+
+    def hash_password():
+        nonlocal running, peak
+        with throttling.hashing_slot():
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+    threads = [threading.Thread(target=hash_password) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert throttling.hashing_slots() == 1
+    assert peak == 1
+
+
+def test_hashing_slot_wait(settings):
+    settings.PASSWORD_HASHING_CPU_SHARE = 0
+    settings.PASSWORD_HASHING_WAIT = 0
+    with throttling.hashing_slot(), pytest.raises(throttling.Throttled), throttling.hashing_slot():
+        pass
+    with throttling.hashing_slot():
+        pass
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import F
+
+from todolist.core.models import User
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+
+SIZES = {'users': 5, 'categories': 40, 'goals': 400, 'comments': 300}
+
+
+def _generate(seed: int = 7, **sizes) -> None:
+    options = {**SIZES, **sizes}
+    call_command('generate_data', *(f'--{name}={value}' for name, value in options.items()), f'--seed={seed}',
+                 '--batch-size=50', stdout=io.StringIO())
+
+
+def _content() -> list[tuple]:
+    return list(Goal.objects.order_by('id').values_list('title', 'description', 'status', 'priority'))
+
+
+@pytest.mark.django_db
+def test_counts_and_consistency():
+    _generate()
+
+    assert User.objects.count() == SIZES['users']
+    assert GoalCategory.objects.count() == SIZES['categories']
+    assert Goal.objects.count() == SIZES['goals']
+    assert GoalComment.objects.count() == SIZES['comments']
+    assert not Goal.objects.exclude(user=F('category__user')).exists()
+    assert not GoalComment.objects.exclude(user=F('goal__user')).exists()
+    assert not Goal.objects.filter(category__is_deleted=True).exclude(status=Goal.Status.archived).exists()
+    assert set(Goal.objects.values_list('status', flat=True)) == set(Goal.Status.values)
+    assert Goal.objects.filter(due_date__isnull=True).exists()
+    assert Goal.objects.filter(search_vector__isnull=True).count() == 0
+    assert User.objects.first().check_password('generated')
+
+
+@pytest.mark.django_db
+def test_reproducible_by_seed():
+    _generate()
+    first = _content()
+    Goal.objects.all().delete()
+
+    _generate()
+    assert _content() == first
+
+    Goal.objects.all().delete()
+    _generate(seed=8)
+    assert _content() != first
+
+
+@pytest.mark.django_db
+def test_goals_need_categories():
+    with pytest.raises(CommandError):
+        _generate(categories=0)
@@ -0,0 +1,77 @@
+import datetime
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from todolist.core.models import User
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+
+USERS = 20
+CATEGORIES_PER_USER = 10
+GOALS_PER_CATEGORY = 20
+COMMENTS_PER_GOAL = 2
+
+
+@pytest.fixture()
+def seeded_user() -> User:
+    users = User.objects.bulk_create(User(username=f'seed-{i}') for i in range(USERS))
+    categories = GoalCategory.objects.bulk_create(
+        GoalCategory(user=user, title=f'category {i}', is_deleted=i % 5 == 0)
+        for user in users for i in range(CATEGORIES_PER_USER)
+    )
+    goals = Goal.objects.bulk_create(
+        Goal(
+            user_id=category.user_id,
+            category=category,
+            title=f'goal {i}',
+            status=i % len(Goal.Status) + 1,
+            priority=i % len(Goal.Priority) + 1,
+            due_date=timezone.now() + datetime.timedelta(days=i) if i % 4 else None,
+        )
+        for category in categories for i in range(GOALS_PER_CATEGORY)
+    )
+    GoalComment.objects.bulk_create(
+        GoalComment(user_id=goal.user_id, goal=goal, text=f'comment {i}')
+        for goal in goals for i in range(COMMENTS_PER_GOAL)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return users[0]
+
+
+def explain(client, url: str, params: dict, table: str) -> str:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == 200
+
+    pattern = re.compile(rf'^SELECT .* FROM "{table}" .* ORDER BY')
+    queries = [query['sql'] for query in context.captured_queries if pattern.match(query['sql'])]
+    assert queries, f'No list query against {table} captured'
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN {queries[-1]}')
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(('url_name', 'params', 'table'), [
+    ('list-goals', {'limit': 10}, 'goals_goal'),
+    ('list-goals', {'limit': 10, 'ordering': '-created'}, 'goals_goal'),
+    ('list-goals', {'cursor': '', 'limit': 10}, 'goals_goal'),
+    ('list-goals', {'limit': 10, 'due_date__gte': '2022-01-01T00:00:00Z'}, 'goals_goal'),
+    ('list-categories', {'limit': 10}, 'goals_goalcategory'),
+    ('list-categories', {'cursor': '', 'limit': 10, 'ordering': 'created'}, 'goals_goalcategory'),
+    ('list-comment', {'limit': 10}, 'goals_goalcomment'),
+    ('list-comment', {'limit': 10, 'goal': None}, 'goals_goalcomment'),
+])
+def test_list_queries_use_index(client, seeded_user, url_name, params, table):
+    if 'goal' in params:
+        params['goal'] = seeded_user.goals.exclude(status=Goal.Status.archived).first().id
+
+    client.force_login(seeded_user)
+    plan = explain(client, reverse(url_name), params, table)
+    assert f'Seq Scan on {table}' not in plan, plan
@@ -0,0 +1,51 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal, GoalCategory
+from todolist.goals.views import TitleAutocompleteView
+
+
+@pytest.mark.django_db
+def test_auth_required(client):
+    response = client.get(reverse('autocomplete-goals'), {'search': 'run'})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_prefix_matches_come_first(client, user, category):
+    fuzzy = Goal.objects.create(user=user, category=category, title='Morning swim')
+    prefix = Goal.objects.create(user=user, category=category, title='Swimming pool')
+    Goal.objects.create(user=user, category=category, title='Running')
+    Goal.objects.create(user=user, category=category, title='Swimming archive', status=Goal.Status.archived)
+
+    client.force_login(user)
+    response = client.get(reverse('autocomplete-goals'), {'search': 'swim'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {'id': prefix.id, 'title': prefix.title},
+        {'id': fuzzy.id, 'title': fuzzy.title},
+    ]
+
+
+@pytest.mark.django_db
+def test_categories_case_insensitive_and_scoped(client, user, django_user_model):
+    stranger = django_user_model.objects.create_user(username='stranger', password='stranger')
+    mine = GoalCategory.objects.create(user=user, title='Работа')
+    GoalCategory.objects.create(user=user, title='Работа старая', is_deleted=True)
+    GoalCategory.objects.create(user=stranger, title='Работа')
+
+    client.force_login(user)
+    response = client.get(reverse('autocomplete-categories'), {'search': 'раб'})
+    assert response.json() == [{'id': mine.id, 'title': mine.title}]
+
+
+@pytest.mark.django_db
+def test_short_term_and_result_cap(client, user, category):
+    Goal.objects.bulk_create(
+        Goal(user=user, category=category, title=f'Read book {i}') for i in range(TitleAutocompleteView.max_results + 5)
+    )
+    client.force_login(user)
+    assert client.get(reverse('autocomplete-goals'), {'search': 'r'}).json() == []
+    response = client.get(reverse('autocomplete-goals'), {'search': 'read'})
+    assert len(response.json()) == TitleAutocompleteView.max_results
@@ -0,0 +1,100 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+
+from todolist.goals.models import GoalComment
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', ['list-goals', 'list-categories', 'list-comment'])
+def test_list_not_modified(client, user, goal, url_name):
+    GoalComment.objects.create(user=user, goal=goal, text='comment')
+    client.force_login(user)
+    response = client.get(reverse(url_name))
+    assert response.status_code == status.HTTP_200_OK
+    etag = response['ETag']
+
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse(url_name), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response['ETag'] == etag
+    assert not response.content
+    assert len([query for query in context.captured_queries if '"goals_' in query['sql']]) == 1
+
+    response = client.get(reverse(url_name), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_list_etag_changes_on_write(client, user, goal):
+    client.force_login(user)
+    etag = client.get(reverse('list-goals'))['ETag']
+
+    client.patch(reverse('retrieve-update-destroy-goal', args=[goal.id]), {'title': 'Updated'})
+    response = client.get(reverse('list-goals'), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['ETag'] != etag
+    assert response.json()[0]['title'] == 'Updated'
+
+
+@pytest.mark.django_db
+def test_list_modified_by_removal(client, user, goal):
+    comment = GoalComment.objects.create(user=user, goal=goal, text='comment')
+    client.force_login(user)
+    response = client.get(reverse('list-comment'))
+    assert not response.has_header('Last-Modified')
+
+    client.delete(reverse('retrieve-update-destroy-comment', args=[comment.id]))
+    # As browsers revalidate without an ETag
+    response = client.get(reverse('list-comment'), HTTP_IF_MODIFIED_SINCE=http_date())
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
+@pytest.mark.django_db
+def test_list_etag_depends_on_query(client, user, goal):
+    client.force_login(user)
+    etag = client.get(reverse('list-goals'))['ETag']
+    response = client.get(reverse('list-goals'), {'limit': 1}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_detail_conditional(client, user, goal):
+    client.force_login(user)
+    url = reverse('retrieve-update-destroy-goal', args=[goal.id])
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Last-Modified']
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    etag = response['ETag']
+    goal.title = 'Updated'
+    goal.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['title'] == 'Updated'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', ['retrieve-update-destroy-category', 'retrieve-update-destroy-comment'])
+def test_detail_modified_by_profile_edit(client, user, goal, category, url_name):
+    comment = GoalComment.objects.create(user=user, goal=goal, text='comment')
+    url = reverse(url_name, args=[category.id if 'category' in url_name else comment.id])
+    client.force_login(user)
+    response = client.get(url)
+    assert not response.has_header('Last-Modified')
+
+    client.patch(reverse('profile'), {'first_name': 'Renamed'})
+    response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['user']['first_name'] == 'Renamed'
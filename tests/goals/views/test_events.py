@@ -0,0 +1,139 @@
+import asyncio
+import json
+import select
+import time
+
+import psycopg2
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection, transaction
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.asyncviews import StreamingASGIHandler
+from todolist.core.models import User
+from todolist.goals.events import CHANNEL, RETRY_MS, hub
+from todolist.goals.models import Goal, GoalCategory
+
+ASGI_URLCONF = 'todolist.asgi_urls'
+
+
+@pytest.fixture()
+def listener():
+    listener = psycopg2.connect(**connection.get_connection_params())
+    listener.autocommit = True
+    with listener.cursor() as cursor:
+        cursor.execute(f'LISTEN {CHANNEL}')
+    yield listener
+    listener.close()
+
+
+def _notifications(listener, expected: int) -> list[dict]:
+    events = []
+    deadline = time.monotonic() + 5
+    while len(events) < expected and time.monotonic() < deadline:
+        select.select([listener], [], [], 0.1)
+        listener.poll()
+        while listener.notifies:
+            events.append(json.loads(listener.notifies.pop(0).payload))
+    return events
+
+
+def _event(user, kind: str, action: str, *objects) -> dict:
+    return {'user': user.id, 'type': kind, 'action': action, 'ids': [obj.id for obj in objects]}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_writes_notify_their_owner(client, user, category, listener):
+    client.force_login(user)
+    response = client.post(reverse('create-goal'), {'title': 'New', 'category': category.id})
+    goal = Goal.objects.get(id=response.json()['id'])
+    assert _notifications(listener, 1) == [_event(user, 'goal', 'created', goal)]
+
+    client.patch(reverse('retrieve-update-destroy-goal', args=[goal.id]), {'title': 'Renamed'})
+    assert _notifications(listener, 1) == [_event(user, 'goal', 'updated', goal)]
+
+    response = client.post(reverse('create-comment'), {'goal': goal.id, 'text': 'Soon'})
+    comment_id = response.json()['id']
+    client.delete(reverse('retrieve-update-destroy-comment', args=[comment_id]))
+    assert _notifications(listener, 2) == [
+        {'user': user.id, 'type': 'comment', 'action': 'created', 'ids': [comment_id]},
+        {'user': user.id, 'type': 'comment', 'action': 'deleted', 'ids': [comment_id]},
+    ]
+
+    client.delete(reverse('retrieve-update-destroy-category', args=[category.id]))
+    assert _notifications(listener, 2) == [
+        _event(user, 'category', 'deleted', category),
+        _event(user, 'goal', 'archived', goal),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_large_writes_are_chunked(user, category, listener):
+    goals = Goal.objects.bulk_create(Goal(user=user, category=category, title=f'#{n}') for n in range(450))
+    events = _notifications(listener, 3)
+    assert [len(event['ids']) for event in events] == [200, 200, 50]
+    assert [goal_id for event in events for goal_id in event['ids']] == [goal.id for goal in goals]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_writes_notify_nobody(user, category, listener):
+    with pytest.raises(RuntimeError), transaction.atomic():
+        Goal.objects.create(user=user, category=category, title='Never')
+        raise RuntimeError
+    goal = Goal.objects.create(user=user, category=category, title='Committed')
+    # Notifications arrive in commit order, one of the rolled back write would come first
+    assert _notifications(listener, 1) == [_event(user, 'goal', 'created', goal)]
+
+
+@pytest.mark.django_db
+def test_auth_required(settings):
+    settings.ROOT_URLCONF = ASGI_URLCONF
+
+    async def get():
+        return await AsyncClient().get(reverse('goal-events'))
+
+    response = async_to_sync(get)()
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream(client, user, category, settings):
+    settings.ROOT_URLCONF = ASGI_URLCONF
+    client.force_login(user)
+    other = User.objects.create_user(username='other', password='Other-password-42')
+    other_category = GoalCategory.objects.create(user=other, title='Theirs')
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': reverse('goal-events'),
+        'query_string': b'',
+        'headers': [
+            (b'accept', b'text/event-stream'),
+            (b'cookie', f'sessionid={client.cookies["sessionid"].value}'.encode()),
+        ],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+
+    async def run():
+        received, sent = asyncio.Queue(), asyncio.Queue()
+        await received.put({'type': 'http.request', 'body': b''})
+        app = asyncio.ensure_future(StreamingASGIHandler()(scope, received.get, sent.put))
+
+        start = await asyncio.wait_for(sent.get(), 5)
+        assert start['status'] == status.HTTP_200_OK
+        assert (b'Content-Type', b'text/event-stream') in start['headers']
+        assert (await asyncio.wait_for(sent.get(), 5))['body'] == f'retry: {RETRY_MS}\n\n'.encode()
+
+        await sync_to_async(Goal.objects.create)(user=other, category=other_category, title='Not mine')
+        goal = await sync_to_async(Goal.objects.create)(user=user, category=category, title='Mine')
+        message = await asyncio.wait_for(sent.get(), 5)
+        assert message['body'] == f'event: goal\ndata: {{"action": "created", "ids": [{goal.id}]}}\n\n'.encode()
+
+        await received.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(app, 5)
+        assert not hub.listening
+
+    async_to_sync(run)()
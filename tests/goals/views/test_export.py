@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+
+
+@pytest.fixture()
+def data(user, category, goal, django_user_model) -> dict:
+    comment = GoalComment.objects.create(user=user, goal=goal, text='Привет, "мир"\nвторая строка')
+    archived = Goal.objects.create(user=user, category=category, title='Old', status=Goal.Status.archived)
+    stranger = django_user_model.objects.create_user(username='stranger', password='stranger')
+    GoalCategory.objects.create(user=stranger, title='Foreign')
+    return {'category': category, 'goals': [goal, archived], 'comment': comment}
+
+
+def _content(response) -> str:
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_auth_required(client):
+    response = client.get(reverse('export', args=['ndjson']))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_unknown_format(client, user):
+    client.force_login(user)
+    response = client.get(reverse('export', args=['xml']))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_ndjson(client, user, data):
+    client.force_login(user)
+    response = client.get(reverse('export', args=['ndjson']))
+    assert response['Content-Type'] == 'application/x-ndjson'
+    records = [json.loads(line) for line in _content(response).splitlines()]
+
+    assert [(record['type'], record['id']) for record in records] == [
+        ('category', data['category'].id),
+        *[('goal', goal.id) for goal in data['goals']],
+        ('comment', data['comment'].id),
+    ]
+    assert records[2]['status'] == Goal.Status.archived
+    assert records[3]['text'] == data['comment'].text
+    assert records[3]['goal_id'] == data['goals'][0].id
+    detail = client.get(reverse('retrieve-update-destroy-goal', args=[data['goals'][0].id])).json()
+    assert records[1]['created'] == detail['created']
+
+
+@pytest.mark.django_db
+def test_csv(client, user, data):
+    client.force_login(user)
+    response = client.get(reverse('export', args=['csv']))
+    assert response['Content-Type'] == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(_content(response))))
+
+    assert [row['type'] for row in rows] == ['category', 'goal', 'goal', 'comment']
+    assert rows[0]['title'] == data['category'].title
+    assert rows[0]['text'] == ''
+    assert rows[3]['text'] == data['comment'].text
@@ -0,0 +1,101 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal, GoalCategory
+
+
+@pytest.mark.django_db
+def test_auth_required(client):
+    response = client.post(reverse('bulk-goals'), [])
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('payload', [[], {'action': 'create'}], ids=('empty', 'not a list'))
+def test_invalid_payload(client, user, payload):
+    client.force_login(user)
+    response = client.post(reverse('bulk-goals'), payload)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_mixed_batch(client, user, category, goal, django_user_model, django_assert_max_num_queries):
+    stranger = django_user_model.objects.create_user(username='stranger', password='stranger')
+    foreign_category = GoalCategory.objects.create(user=stranger, title='Foreign')
+    to_archive = Goal.objects.create(user=user, category=category, title='Old')
+    client.force_login(user)
+
+    payload = [
+        {'action': 'create', 'title': 'First', 'category': category.id},
+        {'action': 'create', 'title': 'Second', 'category': category.id, 'priority': Goal.Priority.high},
+        {'action': 'update', 'id': goal.id, 'title': 'Renamed', 'status': Goal.Status.in_progress},
+        {'action': 'archive', 'id': to_archive.id},
+        {'action': 'create', 'title': 'Stolen', 'category': foreign_category.id},
+        {'action': 'update', 'id': goal.id, 'title': 'Twice'},
+        {'action': 'create', 'category': category.id},
+        {'action': 'delete', 'id': goal.id},
+    ]
+    with django_assert_max_num_queries(8):
+        response = client.post(reverse('bulk-goals'), payload)
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()
+
+    assert [result.get('action') for result in results] == ['create', 'create', 'update', 'archive'] + [None] * 4
+    assert results[4] == {'errors': {'category': [f'Invalid pk "{foreign_category.id}" - object does not exist.']}}
+    assert results[5] == {'errors': {'id': ['Goal appears more than once in the batch.']}}
+    assert results[6] == {'errors': {'title': ['This field is required.']}}
+    assert 'action' in results[7]['errors']
+
+    created = Goal.objects.filter(id__in=[results[0]['goal']['id'], results[1]['goal']['id']]).order_by('id')
+    assert [(g.title, g.priority, g.user_id) for g in created] == [
+        ('First', Goal.Priority.medium, user.id),
+        ('Second', Goal.Priority.high, user.id),
+    ]
+    goal.refresh_from_db()
+    assert (goal.title, goal.status) == ('Renamed', Goal.Status.in_progress)
+    assert results[2]['goal']['title'] == 'Renamed'
+    to_archive.refresh_from_db()
+    assert to_archive.status == Goal.Status.archived
+
+
+@pytest.mark.django_db
+def test_goals_only_write_their_own_fields(client, user, category, goal):
+    other = Goal.objects.create(user=user, category=category, title='Other')
+    client.force_login(user)
+    payload = [
+        {'action': 'update', 'id': goal.id, 'title': 'Renamed'},
+        {'action': 'archive', 'id': other.id},
+    ]
+    with CaptureQueriesContext(connection) as queries:
+        assert client.post(reverse('bulk-goals'), payload).status_code == status.HTTP_200_OK
+
+    sql = [query['sql'] for query in queries.captured_queries]
+    assert any(query.endswith('FOR UPDATE OF "goals_goal"') for query in sql)
+    updates = [query for query in sql if query.startswith('UPDATE "goals_goal"')]
+    # A concurrent rename of the other goal is not written back
+    assert len(updates) == 2
+    assert all(f'= {other.id})' not in query for query in updates if '"title" =' in query)
+
+
+@pytest.mark.django_db
+def test_cannot_touch_foreign_goal(client, user, category, django_user_model):
+    stranger = django_user_model.objects.create_user(username='stranger', password='stranger')
+    foreign = Goal.objects.create(
+        user=stranger, category=GoalCategory.objects.create(user=stranger, title='Foreign'), title='Foreign',
+    )
+    client.force_login(user)
+    response = client.post(reverse('bulk-goals'), [{'action': 'archive', 'id': foreign.id}])
+    assert response.json() == [{'errors': {'id': [f'Invalid pk "{foreign.id}" - object does not exist.']}}]
+    foreign.refresh_from_db()
+    assert foreign.status == Goal.Status.to_do
+
+
+@pytest.mark.django_db
+def test_bulk_write_invalidates_list_cache(client, user, category):
+    client.force_login(user)
+    assert client.get(reverse('list-goals')).json() == []
+    client.post(reverse('bulk-goals'), [{'action': 'create', 'title': 'Cached?', 'category': category.id}])
+    assert [goal['title'] for goal in client.get(reverse('list-goals')).json()] == ['Cached?']
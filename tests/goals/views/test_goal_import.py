@@ -0,0 +1,136 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals import importer
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+
+
+def _upload(client, name: str, content: str):
+    return client.post(
+        reverse('import-goals'),
+        {'file': SimpleUploadedFile(name, content.encode())},
+        format='multipart',
+    )
+
+
+@pytest.mark.django_db
+def test_auth_required(client):
+    response = _upload(client, 'goals.csv', 'title,category\n')
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_unknown_format(client, user):
+    client.force_login(user)
+    response = _upload(client, 'goals.xml', '<goals/>')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_csv(client, user, category, django_user_model):
+    stranger = django_user_model.objects.create_user(username='stranger', password='stranger')
+    foreign = GoalCategory.objects.create(user=stranger, title='Foreign')
+    client.force_login(user)
+
+    content = (
+        'title,category,status,priority,due_date,description\n'
+        f'First,{category.id},done,Высокий,2022-11-01T10:00:00Z,"multi\nline"\n'
+        f'Second,{category.title.upper()},,,,\n'
+        f'Third,{foreign.id},,,,\n'
+        f',{category.id},,,,\n'
+        f'Fifth,{category.id},unknown,,,\n'
+    )
+    response = _upload(client, 'goals.csv', content)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['goals'] == 2
+    assert response.json()['failed'] == 3
+    assert [(error['line'], list(error['errors'])) for error in response.json()['errors']] == [
+        (5, ['category']),
+        (6, ['title']),
+        (7, ['status']),
+    ]
+
+    first, second = Goal.objects.filter(user=user).order_by('id')
+    assert (first.title, first.description, first.status, first.priority) == (
+        'First', 'multi\nline', Goal.Status.done, Goal.Priority.high,
+    )
+    assert first.due_date.isoformat() == '2022-11-01T10:00:00+00:00'
+    assert (second.category_id, second.description, second.status) == (category.id, None, Goal.Status.to_do)
+    assert not Goal.objects.filter(category=foreign).exists()
+
+
+@pytest.mark.django_db
+def test_unreadable_csv(client, user, category):
+    client.force_login(user)
+    content = (
+        f'\ufefftitle,category\nFirst,{category.id}\n"{"x" * (csv.field_size_limit() + 1)}",{category.id}\n'
+        f'Third,{category.id}\n'
+    ).encode() + f'Fourth,{category.id}\n'.encode('cp1251') + f'Пятая,{category.id}\n'.encode('cp1251')
+    response = client.post(
+        reverse('import-goals'), {'file': SimpleUploadedFile('goals.csv', content)}, format='multipart',
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['goals'] == 3
+    assert [(error['line'], list(error['errors'])) for error in response.json()['errors']] == [
+        (3, ['non_field_errors']),
+        (6, ['non_field_errors']),
+    ]
+    assert set(Goal.objects.values_list('title', flat=True)) == {'First', 'Third', 'Fourth'}
+
+
+@pytest.mark.django_db
+def test_ndjson_with_comments(client, user, category, goal, monkeypatch):
+    monkeypatch.setattr(importer.GoalImporter, 'batch_size', 2)
+    client.force_login(user)
+
+    records = [
+        {'type': 'goal', 'id': 1000, 'category_id': category.id, 'title': 'Imported'},
+        {'type': 'comment', 'goal_id': 1000, 'text': 'on the imported goal'},
+        {'type': 'comment', 'goal_id': goal.id, 'text': 'on an existing goal'},
+        {'type': 'comment', 'goal_id': 999999, 'text': 'dangling'},
+        {'type': 'goal', 'id': 1000, 'category_id': category.id, 'title': 'Duplicate'},
+    ]
+    content = '\n'.join(json.dumps(record) for record in records) + '\nnot json\n'
+    response = _upload(client, 'goals.ndjson', content)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() | {'errors': None} == {'goals': 1, 'comments': 2, 'failed': 3, 'errors': None}
+    assert [error['line'] for error in response.json()['errors']] == [4, 5, 6]
+
+    imported = Goal.objects.get(title='Imported')
+    assert imported.search_vector is not None
+    assert dict(GoalComment.objects.values_list('text', 'goal_id')) == {
+        'on the imported goal': imported.id,
+        'on an existing goal': goal.id,
+    }
+
+
+@pytest.mark.django_db
+def test_import_refreshes_cached_list(client, user, category):
+    client.force_login(user)
+    assert len(client.get(reverse('list-goals')).json()) == 0
+
+    _upload(client, 'goals.csv', f'title,category\nNew,{category.id}\n')
+    assert len(client.get(reverse('list-goals')).json()) == 1
+
+
+@pytest.mark.django_db
+def test_command(user, category, tmp_path):
+    path = tmp_path / 'goals.csv'
+    path.write_text(f'title,category\nFirst,{category.id}\nSecond,missing\n')
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    call_command('import_goals', user.username, str(path), stdout=stdout, stderr=stderr)
+
+    assert 'Imported 1 goals and 0 comments, 1 rows failed' in stdout.getvalue()
+    assert json.loads(stderr.getvalue())['line'] == 3
+    assert Goal.objects.filter(user=user).count() == 1
@@ -0,0 +1,64 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal
+
+
+@pytest.fixture()
+def goals(user, category) -> dict[str, Goal]:
+    return {
+        'title': Goal.objects.create(user=user, category=category, title='Running every morning'),
+        'description': Goal.objects.create(
+            user=user, category=category, title='Health', description='Run a marathon before summer',
+        ),
+        'other': Goal.objects.create(user=user, category=category, title='Читать книги', description='Рунические'),
+    }
+
+
+def _search(client, **params) -> list[int]:
+    response = client.get(reverse('list-goals'), params)
+    assert response.status_code == status.HTTP_200_OK
+    return [goal['id'] for goal in response.json()]
+
+
+@pytest.mark.django_db
+def test_search_is_stemmed_and_ranked(client, user, goals):
+    client.force_login(user)
+    assert _search(client, search='runs') == [goals['title'].id, goals['description'].id]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast_lists', [True, False], ids=('values', 'serializer'))
+def test_cursor_keeps_the_rank(client, settings, user, goals, fast_lists):
+    settings.FAST_LIST_SERIALIZERS = fast_lists
+    client.force_login(user)
+    ids, url = [], reverse('list-goals') + '?search=runs&cursor=&limit=1'
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        ids += [goal['id'] for goal in response.json()['results']]
+        url = response.json()['next']
+    assert ids == [goals['title'].id, goals['description'].id]
+
+
+@pytest.mark.django_db
+def test_search_cyrillic(client, user, goals):
+    client.force_login(user)
+    assert _search(client, search='книга') == [goals['other'].id]
+
+
+@pytest.mark.django_db
+def test_explicit_ordering_wins_over_rank(client, user, goals):
+    client.force_login(user)
+    assert _search(client, search='run', ordering='title') == [goals['description'].id, goals['title'].id]
+
+
+@pytest.mark.django_db
+def test_search_vector_follows_updates(client, user, goals):
+    goal = goals['other']
+    goal.title = 'Swim across the lake'
+    goal.save()
+    client.force_login(user)
+    assert _search(client, search='swimming') == [goal.id]
+    assert 'search_vector' not in client.get(reverse('retrieve-update-destroy-goal', args=[goal.id])).json()
@@ -0,0 +1,116 @@
+import datetime
+import io
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from todolist.goals.models import Goal, GoalDailyStat
+
+
+def _stats(user) -> dict:
+    return {
+        stat.day: (stat.goals_created, stat.goals_completed) for stat in GoalDailyStat.objects.filter(user=user)
+    }
+
+
+def _at(day: datetime.date) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(12)))
+
+
+@pytest.mark.django_db
+def test_auth_required(client):
+    response = client.get(reverse('stats-goals'))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_triggers_count_creations_and_completions(client, user, category, goal):
+    today = timezone.localdate()
+    Goal.objects.create(user=user, category=category, title='Done already', status=Goal.Status.done)
+    assert _stats(user) == {today: (2, 1)}
+
+    goal.status = Goal.Status.done
+    goal.save()
+    # Saving a done goal again is not another completion, reopening and finishing it again is
+    goal.save()
+    Goal.objects.filter(id=goal.id).update(status=Goal.Status.in_progress)
+    Goal.objects.filter(id=goal.id).update(status=Goal.Status.done)
+    assert _stats(user) == {today: (2, 3)}
+
+
+@pytest.mark.django_db
+def test_rebuild_command(user, category, django_user_model):
+    stranger = django_user_model.objects.create_user(username='stranger', password='stranger')
+    monday = datetime.date(2026, 3, 2)
+    Goal.objects.bulk_create([
+        Goal(user=user, category=category, title='Old', status=Goal.Status.done),
+        Goal(user=user, category=category, title='Open'),
+        Goal(user=stranger, category=category, title='Foreign'),
+    ])
+    Goal.objects.filter(title='Old').update(created=_at(monday), updated=_at(monday + datetime.timedelta(days=3)))
+    Goal.objects.filter(title='Open').update(created=_at(monday))
+
+    call_command('rebuild_goal_stats', str(user.id), stdout=io.StringIO())
+    assert _stats(user) == {monday: (2, 0), monday + datetime.timedelta(days=3): (0, 1)}
+    assert _stats(stranger) == {timezone.localdate(): (1, 0)}
+
+    GoalDailyStat.objects.all().delete()
+    call_command('rebuild_goal_stats', stdout=io.StringIO())
+    assert len(_stats(user)) == 2
+    assert len(_stats(stranger)) == 1
+
+
+@pytest.mark.django_db
+def test_series(client, user, django_assert_num_queries):
+    GoalDailyStat.objects.bulk_create([
+        GoalDailyStat(user=user, day=datetime.date(2026, 3, 2), goals_created=2, goals_completed=1),
+        GoalDailyStat(user=user, day=datetime.date(2026, 3, 8), goals_created=1),
+        GoalDailyStat(user=user, day=datetime.date(2026, 3, 17), goals_completed=4),
+        GoalDailyStat(user=user, day=datetime.date(2026, 5, 1), goals_created=7),
+    ])
+    client.force_login(user)
+
+    # The user and the read; the session comes from the cache
+    with django_assert_num_queries(2):
+        response = client.get(reverse('stats-goals'), {
+            'period': 'week', 'date_from': '2026-03-04', 'date_to': '2026-03-20',
+        })
+    assert response.status_code == status.HTTP_200_OK
+    # The range is read by day; the first bucket starts on the Monday before date_from
+    assert response.json() == {
+        'period': 'week',
+        'date_from': '2026-03-04',
+        'date_to': '2026-03-20',
+        'series': [
+            {'date': '2026-03-02', 'created': 1, 'completed': 0},
+            {'date': '2026-03-09', 'created': 0, 'completed': 0},
+            {'date': '2026-03-16', 'created': 0, 'completed': 4},
+        ],
+    }
+
+    response = client.get(reverse('stats-goals'), {
+        'period': 'month', 'date_from': '2026-01-15', 'date_to': '2026-05-31',
+    })
+    assert [(item['date'], item['created'], item['completed']) for item in response.json()['series']] == [
+        ('2026-01-01', 0, 0), ('2026-02-01', 0, 0), ('2026-03-01', 3, 5), ('2026-04-01', 0, 0), ('2026-05-01', 7, 0),
+    ]
+
+    response = client.get(reverse('stats-goals'))
+    assert len(response.json()['series']) == 30
+    assert response.json()['date_to'] == timezone.localdate().isoformat()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', [
+    {'period': 'year'},
+    {'date_from': '2026-03-05', 'date_to': '2026-03-04'},
+    {'date_from': '2020-01-01', 'date_to': '2026-01-01'},
+    {'date_to': 'tomorrow'},
+], ids=('period', 'reversed', 'too long', 'date'))
+def test_invalid_query(client, user, params):
+    client.force_login(user)
+    response = client.get(reverse('stats-goals'), params)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,101 @@
+from collections import Counter
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal, GoalCategory, GoalSummaryCounter
+
+
+def _counters(user) -> Counter:
+    return Counter({
+        (row.category_id, row.status, row.priority): row.count
+        for row in GoalSummaryCounter.objects.filter(user=user) if row.count
+    })
+
+
+def _recount(user) -> Counter:
+    return Counter(
+        (goal.category_id, goal.status, goal.priority) for goal in Goal.objects.filter(user=user)
+    )
+
+
+@pytest.mark.django_db
+def test_auth_required(client):
+    response = client.get(reverse('summary-goals'))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_counters_follow_every_write_path(client, user, category, goal):
+    client.force_login(user)
+    other = GoalCategory.objects.create(user=user, title='Other')
+    assert _counters(user) == _recount(user)
+
+    # Single-row ORM writes
+    goal.status = Goal.Status.in_progress
+    goal.save()
+    Goal.objects.create(user=user, category=other, title='Second', priority=Goal.Priority.high)
+    assert _counters(user) == _recount(user)
+
+    # Bulk endpoint
+    client.post(reverse('bulk-goals'), [
+        {'action': 'create', 'title': 'Bulk', 'category': other.id},
+        {'action': 'update', 'id': goal.id, 'priority': Goal.Priority.critical},
+    ], format='json')
+    assert _counters(user) == _recount(user)
+
+    # COPY-based import
+    upload = SimpleUploadedFile('goals.csv', f'title,category,status\nImported,{other.id},done\n'.encode())
+    client.post(reverse('import-goals'), {'file': upload}, format='multipart')
+    assert _counters(user) == _recount(user)
+
+    # Deleting a category archives its goals with QuerySet.update()
+    client.delete(reverse('retrieve-update-destroy-category', args=[other.id]))
+    assert _counters(user) == _recount(user)
+    assert not Goal.objects.filter(category=other).exclude(status=Goal.Status.archived).exists()
+
+    Goal.objects.filter(category=category).delete()
+    assert _counters(user) == _recount(user)
+    Goal.objects.filter(user=user).delete()
+    assert not _counters(user)
+
+
+@pytest.mark.django_db
+def test_summary(client, user, category, goal, django_user_model, django_assert_num_queries):
+    stranger = django_user_model.objects.create_user(username='stranger', password='stranger')
+    Goal.objects.create(
+        user=stranger, category=GoalCategory.objects.create(user=stranger, title='Foreign'), title='Foreign',
+    )
+    second = GoalCategory.objects.create(user=user, title='A second category')
+    Goal.objects.create(user=user, category=second, title='High', priority=Goal.Priority.high)
+    Goal.objects.create(user=user, category=second, title='Done', status=Goal.Status.done)
+    Goal.objects.create(user=user, category=category, title='Old', status=Goal.Status.archived)
+    deleted = GoalCategory.objects.create(user=user, title='Deleted', is_deleted=True)
+    Goal.objects.create(user=user, category=deleted, title='Hidden')
+    client.force_login(user)
+
+    # The user and the read; the session comes from the cache
+    with django_assert_num_queries(2):
+        response = client.get(reverse('summary-goals'))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        'total': 3,
+        'by_status': [
+            {'status': Goal.Status.to_do, 'count': 2},
+            {'status': Goal.Status.in_progress, 'count': 0},
+            {'status': Goal.Status.done, 'count': 1},
+            {'status': Goal.Status.archived, 'count': 1},
+        ],
+        'by_priority': [
+            {'priority': Goal.Priority.low, 'count': 0},
+            {'priority': Goal.Priority.medium, 'count': 2},
+            {'priority': Goal.Priority.high, 'count': 1},
+            {'priority': Goal.Priority.critical, 'count': 0},
+        ],
+        'categories': sorted([
+            {'id': category.id, 'title': category.title, 'count': 1},
+            {'id': second.id, 'title': second.title, 'count': 2},
+        ], key=lambda item: item['title']),
+    }
@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal, GoalComment
+
+
+def _get(client, url_name: str, **params) -> tuple[list[dict], list[str]]:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse(url_name), params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json(), [query['sql'] for query in context.captured_queries if '"goals_' in query['sql']]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name', ['list-goals', 'list-categories', 'list-comment'])
+def test_repeated_read_skips_database(client, user, goal, url_name):
+    GoalComment.objects.create(user=user, goal=goal, text='comment')
+    client.force_login(user)
+
+    first, queries = _get(client, url_name)
+    assert queries
+    second, queries = _get(client, url_name)
+    assert second == first
+    assert not queries
+
+
+@pytest.mark.django_db
+def test_goal_update_invalidates(client, user, goal):
+    client.force_login(user)
+    _get(client, 'list-goals')
+
+    response = client.patch(reverse('retrieve-update-destroy-goal', args=[goal.id]), {'title': 'Updated'})
+    assert response.status_code == status.HTTP_200_OK
+    results, _ = _get(client, 'list-goals')
+    assert [goal['title'] for goal in results] == ['Updated']
+
+
+@pytest.mark.django_db
+def test_category_delete_invalidates_goals(client, user, category, goal):
+    client.force_login(user)
+    assert _get(client, 'list-goals')[0]
+
+    response = client.delete(reverse('retrieve-update-destroy-category', args=[category.id]))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert _get(client, 'list-goals')[0] == []
+    assert Goal.objects.get(id=goal.id).status == Goal.Status.archived
+
+
+@pytest.mark.django_db
+def test_comment_write_invalidates(client, user, goal):
+    client.force_login(user)
+    assert _get(client, 'list-comment')[0] == []
+
+    response = client.post(reverse('create-comment'), {'goal': goal.id, 'text': 'First'})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [comment['text'] for comment in _get(client, 'list-comment')[0]] == ['First']
+
+    response = client.delete(reverse('retrieve-update-destroy-comment', args=[response.json()['id']]))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert _get(client, 'list-comment')[0] == []
+
+
+@pytest.mark.django_db
+def test_cache_is_per_user(client, user, goal, django_user_model):
+    stranger = django_user_model.objects.create_user(username='stranger', password='stranger')
+    client.force_login(user)
+    assert _get(client, 'list-goals')[0]
+
+    client.force_login(stranger)
+    assert _get(client, 'list-goals')[0] == []
@@ -0,0 +1,89 @@
+import json
+from base64 import b64encode
+from urllib.parse import urlencode
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal, GoalComment
+
+
+def _walk(client, url: str, direction: str = 'next') -> list[dict]:
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK, response.json()
+        pages.append(response.json())
+        url = pages[-1][direction]
+    return pages
+
+
+@pytest.fixture()
+def goals(user, category) -> list[Goal]:
+    # Duplicated titles force the id tiebreak to do the work
+    return [Goal.objects.create(user=user, category=category, title=f'goal {i % 3}') for i in range(7)]
+
+
+@pytest.mark.django_db
+def test_limit_offset_is_default(client, user, goals):
+    client.force_login(user)
+    response = client.get(reverse('list-goals'), {'limit': 2})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['count'] == len(goals)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ordering', ['title', '-title', 'created', '-created'])
+def test_cursor_walks_every_goal_once(client, user, goals, ordering):
+    client.force_login(user)
+    tiebreak = ordering.replace(ordering.lstrip('-'), 'id')
+    expected = Goal.objects.order_by(ordering, tiebreak).values_list('id', flat=True)
+
+    pages = _walk(client, reverse('list-goals') + f'?cursor=&limit=3&ordering={ordering}')
+    assert [len(page['results']) for page in pages] == [3, 3, 1]
+    assert 'count' not in pages[0]
+    assert pages[0]['previous'] is None
+    assert [goal['id'] for page in pages for goal in page['results']] == list(expected)
+
+    backwards = _walk(client, pages[-1]['previous'], direction='previous')
+    assert [goal['id'] for page in backwards for goal in page['results']] == [
+        goal['id'] for page in pages[-2::-1] for goal in page['results']
+    ]
+
+
+@pytest.mark.django_db
+def test_cursor_comments_newest_first(client, user, goal):
+    comments = [GoalComment.objects.create(user=user, goal=goal, text=str(i)) for i in range(5)]
+    client.force_login(user)
+
+    pages = _walk(client, reverse('list-comment') + '?cursor=&limit=2')
+    assert [comment['id'] for page in pages for comment in page['results']] == [c.id for c in reversed(comments)]
+
+
+@pytest.mark.django_db
+def test_invalid_cursor(client, user, goals):
+    client.force_login(user)
+    response = client.get(reverse('list-goals'), {'cursor': 'garbage'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('position', [
+    [['title', 'id'], ['Goal', 1]],
+    [['-created', '-id'], ['not a date', 1]],
+    [['-created', '-id'], ['2022-01-01T00:00:00+00:00', 'not an id']],
+    [['-created', '-id'], [{}, 1]],
+    {'ordering': ['-created', '-id']},
+    [['-created', '-id'], 'xy'],
+], ids=('other-ordering', 'date', 'id', 'object', 'dict', 'string'))
+def test_cursor_must_match_ordering_and_fields(client, user, goals, position):
+    client.force_login(user)
+    url = reverse('list-goals')
+    next_url = client.get(url, {'cursor': '', 'limit': 2, 'ordering': '-created'}).json()['next']
+    assert client.get(next_url).status_code == status.HTTP_200_OK
+
+    # As DRF encodes cursors
+    cursor = b64encode(urlencode({'p': json.dumps(position)}).encode()).decode()
+    response = client.get(url, {'cursor': cursor, 'ordering': '-created'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
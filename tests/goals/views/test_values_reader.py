@@ -0,0 +1,59 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+
+
+@pytest.fixture()
+def data(user, faker):
+    user.first_name, user.last_name, user.email = 'Иван', '', faker.email()
+    user.save()
+    for index in range(3):
+        category = GoalCategory.objects.create(user=user, title=f'Категория {index}')
+        for number in range(4):
+            goal = Goal.objects.create(
+                user=user,
+                category=category,
+                title=f'Run {index}-{number}',
+                description=None if number % 2 else 'Run "fast" — ✓',
+                status=number % 3 + 1,
+                due_date=datetime.datetime(2022, 12, 31, 23, 30, tzinfo=datetime.timezone.utc) if number else None,
+            )
+            GoalComment.objects.create(user=user, goal=goal, text=faker.sentence())
+
+
+def _content(client, settings, fast: bool, url: str, params: dict) -> bytes:
+    settings.FAST_LIST_SERIALIZERS = fast
+    cache.clear()
+    response = client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name, params', [
+    ('list-categories', {}),
+    ('list-categories', {'limit': 2, 'offset': 1, 'ordering': '-created'}),
+    ('list-categories', {'cursor': '', 'limit': 2}),
+    ('list-goals', {}),
+    ('list-goals', {'search': 'run', 'limit': 5}),
+    ('list-goals', {'search': 'fast', 'cursor': '', 'limit': 5}),
+    ('list-goals', {'ordering': '-created', 'cursor': '', 'limit': 3}),
+    ('list-comment', {}),
+    ('list-comment', {'limit': 4, 'offset': 2}),
+])
+def test_output_is_byte_identical(client, settings, user, data, name, params):
+    client.force_login(user)
+    url = reverse(name)
+    assert _content(client, settings, True, url, params) == _content(client, settings, False, url, params)
+
+
+@pytest.mark.django_db
+def test_next_page_is_identical(client, settings, user, data):
+    client.force_login(user)
+    next_url = client.get(reverse('list-goals'), {'cursor': '', 'limit': 5}).json()['next']
+    assert _content(client, settings, True, next_url, {}) == _content(client, settings, False, next_url, {})
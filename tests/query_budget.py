@@ -0,0 +1,57 @@
+"""
+Query budgets: a request must run at most its declared number of queries, and exactly as many once the
+data set has grown by SCALE, so an N+1 fails the test instead of showing up in production.
+"""
+import re
+from collections import Counter
+from typing import Callable
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SCALE = 10
+
+
+def _shape(sql: str) -> str:
+    return re.sub(r"'(?:[^']|'')*'|\b\d+\b", '?', sql)
+
+
+def _measure(make_request: Callable) -> CaptureQueriesContext:
+    # Cached list pages would hide the queries behind them
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = make_request()
+        if response.streaming:
+            b''.join(response.streaming_content)
+    return context
+
+
+def _report(budget: int, small: CaptureQueriesContext, large: CaptureQueriesContext) -> str:
+    shapes = Counter(_shape(query['sql']) for query in large.captured_queries)
+    lines = [
+        f'{len(small)} queries at N, {len(large)} at {SCALE}N, budget {budget}.',
+        f'Queries at {SCALE}N (repeated shapes marked with their count):',
+    ]
+    for index, query in enumerate(large.captured_queries, start=1):
+        repeated = shapes[_shape(query['sql'])]
+        lines.append(f'{index:>3}. {f"[x{repeated}] " if repeated > 1 else ""}{query["sql"]}')
+    return '\n'.join(lines)
+
+
+@pytest.fixture()
+def assert_query_budget() -> Callable:
+    """
+    ``assert_query_budget(budget, make_request, grow)`` measures ``make_request()``, calls ``grow()`` to scale
+    the data up and measures it again.
+    """
+
+    def check(budget: int, make_request: Callable, grow: Callable) -> None:
+        small = _measure(make_request)
+        grow()
+        large = _measure(make_request)
+        if len(small) != len(large) or len(large) > budget:
+            pytest.fail(_report(budget, small, large), pytrace=False)
+
+    return check
@@ -0,0 +1,181 @@
+"""The async views of todolist.asgi_urls must answer exactly like the sync views they shadow."""
+import asyncio
+from typing import Callable, NamedTuple
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from rest_framework import status
+
+from todolist.asyncviews import StreamingASGIHandler
+from todolist.goals import export
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+from todolist.metrics import registry
+
+ASGI_URLCONF = 'todolist.asgi_urls'
+
+
+class Read(NamedTuple):
+    name: str
+    args: Callable[[dict], list] = lambda objects: []
+    params: Callable[[dict], dict] = lambda objects: {}
+
+
+READS = [
+    Read('health-check'),
+    Read('profile'),
+    Read('list-categories'),
+    Read('list-categories', params=lambda objects: {'limit': 2, 'offset': 1, 'ordering': '-created'}),
+    Read('list-categories', params=lambda objects: {'cursor': '', 'limit': 2, 'search': 'Category'}),
+    Read('retrieve-update-destroy-category', lambda objects: [objects['category'].id]),
+    Read('retrieve-update-destroy-category', lambda objects: [0]),
+    Read('list-goals', params=lambda objects: {'limit': 3}),
+    Read('list-goals', params=lambda objects: {'cursor': '', 'limit': 2, 'ordering': '-created'}),
+    Read('list-goals', params=lambda objects: {'search': 'report', 'limit': 5}),
+    Read('list-goals', params=lambda objects: {'category': objects['category'].id, 'status__in': '1,2'}),
+    Read('list-goals', params=lambda objects: {'category': 0}),
+    Read('retrieve-update-destroy-goal', lambda objects: [objects['goal'].id]),
+    Read('retrieve-update-destroy-goal', lambda objects: [objects['archived'].id]),
+    Read('list-comment', params=lambda objects: {'goal': objects['goal'].id, 'limit': 10}),
+    Read('retrieve-update-destroy-comment', lambda objects: [objects['comment'].id]),
+]
+
+
+@pytest.fixture()
+def objects(user) -> dict:
+    categories = GoalCategory.objects.bulk_create(GoalCategory(user=user, title=f'Category {n}') for n in range(4))
+    goals = Goal.objects.bulk_create(
+        Goal(user=user, category=categories[n % 2], title=title, status=n % 3 + 1)
+        for n, title in enumerate(('Write report', 'Read a book', 'Report again', 'Plan the week', 'Fix the bike'))
+    )
+    archived = Goal.objects.create(user=user, category=categories[0], title='Old', status=Goal.Status.archived)
+    comments = GoalComment.objects.bulk_create(GoalComment(user=user, goal=goals[0], text=f'#{n}') for n in range(3))
+    return {'category': categories[0], 'goal': goals[0], 'archived': archived, 'comment': comments[0]}
+
+
+@pytest.fixture()
+def async_client(user) -> AsyncClient:
+    async_client = AsyncClient()
+    async_client.force_login(user)
+    return async_client
+
+
+def _run(awaitable):
+    # AsyncClient methods return awaitables, they are not coroutine functions themselves
+    async def run():
+        return await awaitable
+
+    return async_to_sync(run)()
+
+
+def _get(make_request: Callable):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = make_request()
+    return response, len(queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast_lists', [True, False], ids=('values', 'serializer'))
+@pytest.mark.parametrize('read', READS, ids=[f'{read.name}-{index}' for index, read in enumerate(READS)])
+def test_same_response_as_sync_view(client, async_client, user, objects, settings, read, fast_lists):
+    settings.FAST_LIST_SERIALIZERS = fast_lists
+    client.force_login(user)
+    url = reverse(read.name, args=read.args(objects))
+    params = read.params(objects)
+    expected, expected_queries = _get(lambda: client.get(url, params))
+
+    settings.ROOT_URLCONF = ASGI_URLCONF
+    assert asyncio.iscoroutinefunction(resolve(url).func)
+    response, queries = _get(lambda: _run(async_client.get(url, params)))
+
+    assert response.status_code == expected.status_code
+    assert response.json() == expected.json()
+    assert response.get('ETag') == expected.get('ETag')
+    # Filter sets validate their model choices once here, not once per filter_queryset() call
+    assert queries <= expected_queries
+
+
+# Served by StreamingASGIHandler, which the test client doesn't use; its queries run in another thread
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('export_format', ['ndjson', 'csv'])
+def test_export(client, user, objects, settings, monkeypatch, export_format):
+    monkeypatch.setattr(export, 'CHUNK_SIZE', 2)
+    client.force_login(user)
+    url = reverse('export', args=[export_format])
+    expected = client.get(url)
+    expected_content = b''.join(expected.streaming_content)
+    settings.ROOT_URLCONF = ASGI_URLCONF
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': url,
+        'query_string': b'',
+        'headers': [(b'cookie', f'sessionid={client.cookies["sessionid"].value}'.encode())],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+
+    async def run():
+        received, sent = asyncio.Queue(), asyncio.Queue()
+        await received.put({'type': 'http.request', 'body': b''})
+        await StreamingASGIHandler()(scope, received.get, sent.put)
+        return [sent.get_nowait() for _ in range(sent.qsize())]
+
+    registry.reset()
+    start, *bodies = async_to_sync(run)()
+    assert start['status'] == status.HTTP_200_OK
+    assert (b'Content-Disposition', expected['Content-Disposition'].encode()) in start['headers']
+    # Sent as it is produced, not in one piece
+    assert len([body for body in bodies if body.get('body')]) > 2
+    content = b''.join(body.get('body', b'') for body in bodies)
+    assert content == expected_content
+    # Measured until the last chunk, with the queries run while streaming
+    counters = registry.snapshot()['counters']
+    assert sum(value for key, value in counters.items() if 'response_size' in key) == len(content)
+    assert sum(value for key, value in counters.items() if 'db_queries' in key) >= 3
+
+
+@pytest.mark.django_db
+def test_anonymous(objects, settings):
+    settings.ROOT_URLCONF = ASGI_URLCONF
+    response = _run(AsyncClient().get(reverse('list-goals')))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.json() == {'detail': 'Authentication credentials were not provided.'}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name, args', [
+    ('list-goals', lambda objects: []),
+    ('retrieve-update-destroy-goal', lambda objects: [objects['goal'].id]),
+], ids=('list', 'detail'))
+def test_not_modified(async_client, objects, settings, name, args):
+    settings.ROOT_URLCONF = ASGI_URLCONF
+    url = reverse(name, args=args(objects))
+    etag = _run(async_client.get(url))['ETag']
+    response = _run(async_client.get(url, **{'If-None-Match': etag}))
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_other_methods_use_the_sync_handlers(async_client, objects, settings):
+    settings.ROOT_URLCONF = ASGI_URLCONF
+    goal_url = reverse('retrieve-update-destroy-goal', args=[objects['goal'].id])
+    response = _run(async_client.patch(goal_url, {'title': 'Renamed'}, content_type='application/json'))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['title'] == 'Renamed'
+
+    category_url = reverse('retrieve-update-destroy-category', args=[objects['category'].id])
+    response = _run(async_client.delete(category_url))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert GoalCategory.objects.get(id=objects['category'].id).is_deleted
+
+    response = _run(async_client.post(reverse('list-goals'), {}, content_type='application/json'))
+    assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+    # Routes without an async view, like goal/create, are the sync views
+    assert not asyncio.iscoroutinefunction(resolve(reverse('create-goal')).func)
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+from django.db import connection
+
+from todolist.db.pool import ConnectionPool
+from todolist.metrics import registry
+
+
+@pytest.fixture()
+def connect():
+    params = connection.get_connection_params()
+    return lambda: psycopg2.connect(**params)
+
+
+@pytest.fixture()
+def pool():
+    pool = ConnectionPool(size=1, max_lifetime=60, idle_timeout=60, health_checks=True, timeout=1)
+    yield pool
+    pool.close()
+
+
+def _backend_pid(conn) -> int:
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_reuse(pool, connect):
+    first = pool.get(connect)
+    first.autocommit = False
+    with first.cursor() as cursor:
+        cursor.execute('SELECT 1')
+    pool.put(first)
+    # Handed back with its transaction rolled back
+    assert first.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    assert pool.get(connect) is first
+
+
+@pytest.mark.django_db
+def test_wait_and_timeout(pool, connect):
+    registry.reset()
+    first = pool.get(connect)
+    threading.Timer(0.1, pool.put, [first]).start()
+    assert pool.get(connect) is first
+    wait = registry.snapshot()['histograms']
+    assert max(histogram['sum'] for histogram in wait.values()) >= 0.1
+
+    pool.timeout = 0.05
+    with pytest.raises(psycopg2.OperationalError, match='No database connection free'):
+        pool.get(connect)
+    assert sum(value for key, value in registry.snapshot()['counters'].items() if 'timeouts' in key) == 1
+    pool.put(first)
+
+
+@pytest.mark.django_db
+def test_lifetime_and_idle_timeout(pool, connect):
+    first = pool.get(connect)
+    pool.max_lifetime = 0
+    pool.put(first)
+    assert first.closed
+
+    pool.max_lifetime = 60
+    second = pool.get(connect)
+    pool.put(second)
+    pool.idle_timeout = 0
+    assert pool.get(connect) is not second
+    assert second.closed
+
+
+@pytest.mark.django_db
+def test_health_check(pool, connect):
+    first = pool.get(connect)
+    pid = _backend_pid(first)
+    pool.put(first)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_terminate_backend(%s)', [pid])
+    time.sleep(0.1)
+
+    second = pool.get(connect)
+    assert second is not first
+    assert _backend_pid(second) != pid
+
+
+@pytest.mark.django_db
+def test_fork(pool, connect, monkeypatch):
+    first = pool.get(connect)
+    pool.put(first)
+    monkeypatch.setattr('os.getpid', lambda: -1)
+    assert pool.get(connect) is not first
+    # The parent's connection is left open for the parent
+    assert not first.closed
+    first.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_django_connections_are_pooled():
+    connection.ensure_connection()
+    pid = _backend_pid(connection.connection)
+    connection.close()
+    connection.ensure_connection()
+    assert _backend_pid(connection.connection) == pid
@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings as django_settings
+from django.db import connection
+from rest_framework.test import APIClient
+
+# Settings are read once per process, so the api profile is served from a fresh one
+SCRIPT = '''
+import json
+import sys
+from wsgiref.util import setup_testing_defaults
+
+from django.apps import apps
+
+from todolist.wsgi import application
+
+
+def request(path):
+    environ = {'PATH_INFO': path, 'HTTP_COOKIE': sys.argv[1], 'HTTP_ACCEPT': 'text/html,*/*'}
+    setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status, headers):
+        response.update(status=int(status[:3]), type=dict(headers)['Content-Type'])
+
+    response['body'] = b''.join(application(environ, start_response)).decode()
+    return response
+
+
+print(json.dumps({
+    'apps': [config.name for config in apps.get_app_configs()],
+    'responses': {
+        path: request(path) for path in ('/goals/goal/list', '/core/profile', '/admin/', '/oauth/login/vk-oauth2/')
+    },
+}))
+'''
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_profile(user, tmp_path):
+    client = APIClient()
+    # Sessions of users who logged in through OAuth are served too
+    client.force_login(user, backend='social_core.backends.vk.VKOAuth2')
+
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'todolist.settings',
+        'APP_PROFILE': 'api',
+        'POSTGRES_DB': connection.settings_dict['NAME'],
+        'METRICS_DIR': str(tmp_path / 'metrics'),
+        'THROTTLE_DIR': str(tmp_path / 'throttle'),
+    }
+    result = subprocess.run(
+        [sys.executable, '-c', SCRIPT, f'sessionid={client.cookies["sessionid"].value}'], env=env,
+        cwd=django_settings.BASE_DIR, capture_output=True, text=True, timeout=60, check=True,
+    )
+    data = json.loads(result.stdout.splitlines()[-1])
+
+    dropped = {'django.contrib.admin', 'django.contrib.messages', 'django.contrib.staticfiles'}
+    assert dropped & set(data['apps']) == set()
+    responses = data['responses']
+    assert responses['/goals/goal/list']['status'] == 200
+    assert responses['/goals/goal/list']['type'] == 'application/json'
+    assert json.loads(responses['/core/profile']['body'])['username'] == user.username
+    assert responses['/admin/']['status'] == responses['/oauth/login/vk-oauth2/']['status'] == 404
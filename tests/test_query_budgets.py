@@ -0,0 +1,168 @@
+import itertools
+from typing import Callable, NamedTuple
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import URLPattern, reverse
+
+from tests.query_budget import SCALE
+from todolist.core.models import User
+from todolist.core.urls import urlpatterns as core_urlpatterns
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+from todolist.goals.urls import urlpatterns as goals_urlpatterns
+
+N = 3
+PASSWORD = 'Budget-password-42'
+
+_counter = itertools.count()
+
+
+class Endpoint(NamedTuple):
+    name: str
+    method: str
+    budget: int
+    args: Callable[[dict], list] = lambda objects: []
+    data: Callable[[dict], dict] | None = None
+    anonymous: bool = False
+    multipart: bool = False
+
+
+def _unique(prefix: str) -> str:
+    return f'{prefix}-{next(_counter)}'
+
+
+def _import_file(objects: dict) -> dict:
+    content = f'title,category,status\nImported,{objects["category"].id},done\nBroken,0,\n'
+    return {'file': SimpleUploadedFile('goals.csv', content.encode())}
+
+
+ENDPOINTS = [
+    Endpoint('signup', 'post', 2, anonymous=True, data=lambda objects: {
+        'username': _unique('signup'), 'password': PASSWORD, 'password_repeat': PASSWORD,
+    }),
+    Endpoint('login', 'post', 8, anonymous=True, data=lambda objects: {
+        'username': objects['owner'].username, 'password': PASSWORD,
+    }),
+    Endpoint('profile', 'get', 2),
+    Endpoint('profile', 'patch', 3, data=lambda objects: {'first_name': _unique('name')}),
+    Endpoint('profile', 'delete', 4),
+    Endpoint('update-password', 'put', 3, data=lambda objects: {'old_password': PASSWORD, 'new_password': PASSWORD}),
+
+    Endpoint('create-category', 'post', 3, data=lambda objects: {'title': _unique('category')}),
+    Endpoint('list-categories', 'get', 4),
+    Endpoint('list-categories', 'get', 5, data=lambda objects: {'limit': N, 'ordering': '-created'}),
+    Endpoint('list-categories', 'get', 4, data=lambda objects: {'cursor': '', 'limit': N}),
+    Endpoint('autocomplete-categories', 'get', 3, data=lambda objects: {'search': 'Category'}),
+    Endpoint('retrieve-update-destroy-category', 'get', 3, lambda objects: [objects['category'].id]),
+    Endpoint(
+        'retrieve-update-destroy-category', 'put', 4, lambda objects: [objects['category'].id],
+        lambda objects: {'title': _unique('category')},
+    ),
+    Endpoint('retrieve-update-destroy-category', 'delete', 8, lambda objects: [objects['spare_categories'].pop().id]),
+
+    Endpoint('create-goal', 'post', 5, data=lambda objects: {
+        'title': _unique('goal'), 'category': objects['category'].id,
+    }),
+    Endpoint('list-goals', 'get', 4),
+    Endpoint('list-goals', 'get', 5, data=lambda objects: {'limit': N, 'search': 'goal'}),
+    Endpoint('list-goals', 'get', 4, data=lambda objects: {'cursor': '', 'limit': N, 'ordering': '-created'}),
+    Endpoint('autocomplete-goals', 'get', 3, data=lambda objects: {'search': 'Goal'}),
+    Endpoint('bulk-goals', 'post', 8, data=lambda objects: [
+        {'action': 'create', 'title': _unique('goal'), 'category': objects['category'].id},
+        {'action': 'update', 'id': objects['goal'].id, 'priority': 3},
+    ]),
+    Endpoint('import-goals', 'post', 13, data=_import_file, multipart=True),
+    Endpoint('summary-goals', 'get', 3),
+    Endpoint('stats-goals', 'get', 3, data=lambda objects: {'period': 'week'}),
+    Endpoint('sync-goals', 'get', 7, data=lambda objects: {'limit': 100}),
+    Endpoint('retrieve-update-destroy-goal', 'get', 3, lambda objects: [objects['goal'].id]),
+    Endpoint(
+        'retrieve-update-destroy-goal', 'patch', 5, lambda objects: [objects['goal'].id],
+        lambda objects: {'title': _unique('goal')},
+    ),
+
+    Endpoint('create-comment', 'post', 4, data=lambda objects: {'goal': objects['goal'].id, 'text': 'comment'}),
+    Endpoint('list-comment', 'get', 4),
+    Endpoint('list-comment', 'get', 7, data=lambda objects: {'goal': objects['goal'].id, 'limit': N}),
+    Endpoint('retrieve-update-destroy-comment', 'get', 3, lambda objects: [objects['comment'].id]),
+    Endpoint(
+        'retrieve-update-destroy-comment', 'patch', 4, lambda objects: [objects['comment'].id],
+        lambda objects: {'text': _unique('comment')},
+    ),
+    Endpoint('retrieve-update-destroy-comment', 'delete', 4, lambda objects: [objects['spare_comments'].pop().id]),
+    Endpoint('export', 'get', 5, lambda objects: ['ndjson']),
+]
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hasher(settings):
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def _seed(owner: User, stranger: User, count: int) -> None:
+    """Tops each user up to ``count`` categories, goals and comments."""
+    for user in (owner, stranger):
+        existing = GoalCategory.objects.filter(user=user).count()
+        categories = GoalCategory.objects.bulk_create(
+            GoalCategory(user=user, title=f'Category {index}') for index in range(existing, count)
+        )
+        goals = Goal.objects.bulk_create(
+            Goal(user=user, category=category, title=f'Goal {category.title}', due_date=category.created)
+            for category in categories
+        )
+        GoalComment.objects.bulk_create(GoalComment(user=user, goal=goal, text='Comment') for goal in goals)
+
+
+@pytest.fixture()
+def objects(django_user_model) -> dict:
+    owner = django_user_model.objects.create_user(username='owner', password=PASSWORD)
+    stranger = django_user_model.objects.create_user(username='stranger', password=PASSWORD)
+    _seed(owner, stranger, N)
+    goal = Goal.objects.filter(user=owner).earliest('id')
+    comment = GoalComment.objects.get(goal=goal)
+    return {
+        # Objects for the destructive endpoints, one per measured request
+        'spare_categories': [GoalCategory.objects.create(user=owner, title=f'Spare {index}') for index in range(2)],
+        'spare_comments': [GoalComment.objects.create(user=owner, goal=goal, text='Spare') for _ in range(2)],
+        'owner': owner,
+        'stranger': stranger,
+        'category': goal.category,
+        'goal': goal,
+        'comment': comment,
+    }
+
+
+def test_every_endpoint_has_a_budget():
+    declared = {endpoint.name for endpoint in ENDPOINTS}
+    names = {
+        pattern.name for pattern in [*core_urlpatterns, *goals_urlpatterns] if isinstance(pattern, URLPattern)
+    }
+    assert names - declared == set(), 'Declare a query budget for every endpoint'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fast_lists', [True, False], ids=['values-reader', 'serializer'])
+@pytest.mark.parametrize('endpoint', ENDPOINTS, ids=lambda endpoint: f'{endpoint.method}-{endpoint.name}')
+def test_query_budget(client, settings, objects, assert_query_budget, endpoint: Endpoint, fast_lists: bool):
+    settings.FAST_LIST_SERIALIZERS = fast_lists
+
+    def login():
+        client.logout()
+        if not endpoint.anonymous:
+            objects['owner'].refresh_from_db()
+            client.force_login(objects['owner'])
+
+    def make_request():
+        url = reverse(endpoint.name, args=endpoint.args(objects))
+        data = endpoint.data(objects) if endpoint.data else None
+        response = getattr(client, endpoint.method)(url, data, format='multipart' if endpoint.multipart else None)
+        assert response.status_code < 400, response.content
+        return response
+
+    def grow():
+        _seed(objects['owner'], objects['stranger'], N * SCALE)
+        # Start from a fresh session: logout, login and password changes all replace it
+        login()
+
+    login()
+    assert_query_budget(endpoint.budget, make_request, grow)
@@ -0,0 +1,109 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from todolist.db.replicas import ReplicaRouter
+from todolist.goals.models import Goal
+
+# The replica is a second alias of the test database: what it reads must have been committed
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture()
+def replica(settings):
+    connections.settings['replica0'] = {**connections['default'].settings_dict}
+    settings.REPLICA_DATABASES = ['replica0']
+    yield connections['replica0']
+    connections['replica0'].close()
+    del connections['replica0']
+    del connections.settings['replica0']
+
+
+def _queries(path: str, client, **params) -> tuple[list[str], list[str]]:
+    """Queries sent to the primary and to the replica by a GET."""
+    with CaptureQueriesContext(connections['default']) as primary, \
+            CaptureQueriesContext(connections['replica0']) as replica:
+        response = client.get(path, params)
+    assert response.status_code == status.HTTP_200_OK
+    return [query['sql'] for query in primary.captured_queries], [query['sql'] for query in replica.captured_queries]
+
+
+def _loads_user(sql: str) -> bool:
+    return 'FROM "core_user"' in sql
+
+
+def test_reads_go_to_the_replica(client, replica, user, goal):
+    client.force_login(user)
+    paths = [reverse('list-goals'), reverse('list-categories'), reverse('retrieve-update-destroy-goal', args=[goal.id])]
+    for path in paths:
+        primary, replicated = _queries(path, client)
+        # Only the user is loaded from the primary, to be cached
+        assert all(_loads_user(sql) for sql in primary) and replicated, path
+        assert not [sql for sql in replicated if _loads_user(sql)], path
+
+
+def test_replica_reads_are_not_cached(client, replica, user, goal):
+    client.force_login(user)
+    primary, _ = _queries(reverse('list-goals'), client)
+    assert primary
+    # The user was cached, the list, read from the replica, was not
+    primary, replicated = _queries(reverse('list-goals'), client)
+    assert not primary and replicated
+
+
+def test_writers_read_their_writes_from_the_primary(client, replica, settings, user, category):
+    client.force_login(user)
+    response = client.post(reverse('create-goal'), {'title': 'New', 'category': category.id})
+    assert response.status_code == status.HTTP_201_CREATED
+
+    primary, replicated = _queries(reverse('list-goals'), client)
+    assert primary and not replicated
+    # Other users aren't pinned
+    other = type(user).objects.create_user(username=user.username + '-other', password='Other-password-42')
+    client.force_login(other)
+    assert _queries(reverse('list-goals'), client)[1]
+
+    settings.REPLICA_PIN_SECONDS = 0
+    client.force_login(user)
+    client.patch(reverse('retrieve-update-destroy-goal', args=[response.json()['id']]), {'title': 'Renamed'})
+    assert _queries(reverse('list-goals'), client)[1]
+
+
+def test_async_views(replica, settings, user, goal):
+    settings.ROOT_URLCONF = 'todolist.asgi_urls'
+    client = AsyncClient()
+    client.force_login(user)
+
+    async def get():
+        return await client.get(reverse('list-goals'))
+
+    with CaptureQueriesContext(connections['default']) as primary, \
+            CaptureQueriesContext(connections['replica0']) as replicated:
+        assert async_to_sync(get)().status_code == status.HTTP_200_OK
+    assert all(_loads_user(query['sql']) for query in primary.captured_queries) and replicated.captured_queries
+
+
+def test_sync_reads_from_the_primary(client, replica, user, goal):
+    client.force_login(user)
+    primary, replicated = _queries(reverse('sync-goals'), client)
+    assert any('goals_goalchange' in sql for sql in primary)
+    # Loading the user for the permission check comes before the view
+    assert not [sql for sql in replicated if 'goals_' in sql]
+
+
+def test_no_replicas(client, user, goal):
+    client.force_login(user)
+    with CaptureQueriesContext(connections['default']) as primary:
+        assert client.get(reverse('list-goals')).status_code == status.HTTP_200_OK
+    assert len(primary) > 0
+
+
+def test_router():
+    router = ReplicaRouter()
+    # Outside requests
+    assert router.db_for_read(Goal) == router.db_for_write(Goal) == 'default'
+    assert router.allow_migrate('default', 'goals') and not router.allow_migrate('replica0', 'goals')
@@ -0,0 +1,67 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings as django_settings
+from django.db import connection
+from rest_framework.test import APIClient
+
+from todolist.goals.models import Goal
+
+# Times requests through todolist.wsgi in a fresh process, where nothing has been imported or built yet
+SCRIPT = '''
+import json
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+from todolist.wsgi import application
+
+
+def request(path):
+    environ = {'PATH_INFO': path, 'HTTP_COOKIE': sys.argv[1]}
+    setup_testing_defaults(environ)
+    started = time.perf_counter()
+    body = b''.join(application(environ, lambda status, headers: None))
+    assert json.loads(body), body
+    return time.perf_counter() - started
+
+
+paths = ['/goals/goal/list', '/goals/goal_category/list', '/core/profile']
+print(json.dumps({path: [request(path) for _ in range(20)] for path in paths}))
+'''
+
+
+def _timings(cookie: str, tmp_path, warmup: bool) -> dict[str, list[float]]:
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'todolist.settings',
+        'POSTGRES_DB': connection.settings_dict['NAME'],
+        'METRICS_DIR': str(tmp_path / 'metrics'),
+        'THROTTLE_DIR': str(tmp_path / 'throttle'),
+        'WARMUP': str(warmup),
+    }
+    result = subprocess.run(
+        [sys.executable, '-c', SCRIPT, cookie], env=env, cwd=django_settings.BASE_DIR,
+        capture_output=True, text=True, timeout=60, check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_first_request_is_not_slower_than_the_rest(user, category, tmp_path):
+    Goal.objects.bulk_create(Goal(user=user, category=category, title=f'Goal {n}') for n in range(20))
+    client = APIClient()
+    client.force_login(user)
+    cookie = f'sessionid={client.cookies["sessionid"].value}'
+
+    cold, warm = _timings(cookie, tmp_path, warmup=False), _timings(cookie, tmp_path, warmup=True)
+    for path, timings in warm.items():
+        first, steady = timings[0], statistics.median(timings[5:])
+        assert first < max(steady * 3, steady + 0.01), (path, first, steady)
+    # Without warmup the first request pays for it
+    first_path = next(iter(cold))
+    assert cold[first_path][0] > warm[first_path][0] * 2
@@ -1,7 +1,10 @@
 """
 ASGI config for todolist project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named ``application``, routed through
+todolist.asgi_urls, where the hot read paths are async views and goals/events streams server-sent events:
+
+    uvicorn todolist.asgi:application --workers 4 --lifespan off --host 0.0.0.0 --port 8000
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
@@ -9,8 +12,25 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+os.environ.setdefault('ROOT_URLCONF', 'todolist.asgi_urls')
+
+# As get_asgi_application(), with a handler that can send event streams
+django.setup(set_prefix=False)
+
+from django.conf import settings  # noqa: E402
+
+from todolist.asyncviews import StreamingASGIHandler  # noqa: E402
+
+application = StreamingASGIHandler()
+
+if settings.WARMUP:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from todolist.warmup import warm_up
 
-application = get_asgi_application()
+    # uvicorn imports the application from within its event loop, where Django refuses to touch the database
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(warm_up).result()
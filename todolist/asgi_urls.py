@@ -0,0 +1,28 @@
+"""
+URLconf of the ASGI deployment: the hot read paths are served by async views, everything else (and every
+write to the same URLs) by the sync views todolist.urls uses under WSGI.
+"""
+from django.urls import path
+
+from todolist import urls
+from todolist.core.views import AsyncHealthCheckView, AsyncProfileView
+from todolist.goals import views
+
+# Listed first so they shadow their sync counterparts; <int:pk> leaves goal/create, goal/list etc. alone
+urlpatterns = [
+    path('core/profile', AsyncProfileView.as_view(), name='profile'),
+    path('goals/goal_category/list', views.AsyncGoalCategoryListView.as_view(), name='list-categories'),
+    path(
+        'goals/goal_category/<int:pk>', views.AsyncGoalCategoryView.as_view(),
+        name='retrieve-update-destroy-category',
+    ),
+    path('goals/goal/list', views.AsyncGoalListView.as_view(), name='list-goals'),
+    path('goals/goal/<int:pk>', views.AsyncGoalView.as_view(), name='retrieve-update-destroy-goal'),
+    path('goals/goal_comment/list', views.AsyncGoalCommentListView.as_view(), name='list-comment'),
+    path('goals/goal_comment/<int:pk>', views.AsyncGoalCommentView.as_view(), name='retrieve-update-destroy-comment'),
+    path('goals/export.<str:export_format>', views.AsyncExportView.as_view(), name='export'),
+    # Only served under ASGI, a sync worker would be tied up for as long as the stream is open
+    path('goals/events', views.GoalEventsView.as_view(), name='goal-events'),
+    path('ping/', AsyncHealthCheckView.as_view(), name='health-check'),
+    *urls.urlpatterns,
+]
@@ -0,0 +1,181 @@
+"""
+Async counterparts of the DRF views for the ASGI deployment (see todolist.asgi_urls).
+
+Authentication, permissions and content negotiation still run DRF's synchronous ``initial()`` in one
+``sync_to_async`` call, since sessions and auth have no async API in Django 4.1; the view's own queries
+use the async ORM. Methods without an ``a<method>`` handler fall back to the sync handler.
+
+Streamed bodies are returned as AsyncStreamingResponse, server-sent events as its EventStreamResponse subclass;
+both need StreamingASGIHandler (todolist.asgi).
+"""
+import asyncio
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterable
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.handlers.asgi import ASGIHandler
+from django.http import Http404, HttpResponseBase, StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+class AsyncAPIView:
+    """Mixed into an APIView subclass; ``as_view()`` then returns a coroutine function."""
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Only for the checks of initkwargs and the class-level queryset
+        super().as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.cls = view.view_class = cls
+        view.initkwargs = view.view_initkwargs = initkwargs
+        # As in APIView.as_view(), SessionAuthentication does the CSRF check. csrf_exempt() itself
+        # would wrap the coroutine function in a sync one.
+        view.csrf_exempt = True
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            method = request.method.lower()
+            if method not in self.http_method_names:
+                handler = sync_to_async(self.http_method_not_allowed)
+            elif (handler := getattr(self, f'a{method}', None)) is None:
+                handler = sync_to_async(getattr(self, method, self.http_method_not_allowed))
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncListMixin:
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def afilter_queryset(self):
+        # Filter sets validate model choices (e.g. ?category=) with a query of their own
+        if not hasattr(self, '_filtered_queryset'):
+            self._filtered_queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        return self._filtered_queryset
+
+
+class AsyncRetrieveMixin:
+
+    async def aget(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    async def aget_object(self):
+        """GenericAPIView.get_object() with the lookup done by the async ORM."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+class AsyncStreamingResponse(HttpResponseBase):
+    """A body read from an async iterator of bytes, sent by StreamingASGIHandler as it is produced."""
+    streaming = True
+
+    def __init__(self, chunks: AsyncIterator[bytes], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chunks = chunks
+
+    @classmethod
+    def from_streaming(cls, response: StreamingHttpResponse) -> 'AsyncStreamingResponse':
+        """
+        Sends a StreamingHttpResponse whose body queries the database while it is iterated: every chunk is
+        produced by a sync_to_async() call, all in the thread that holds the request's connection.
+        """
+        streamed = cls(_iterate_in_thread(response.streaming_content), status=response.status_code)
+        for header, value in response.items():
+            streamed[header] = value
+        # Closes the iterator, and the server-side cursor it may hold, whether or not it was sent to the end
+        streamed._resource_closers.append(response.close)
+        return streamed
+
+
+async def _iterate_in_thread(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    iterator = iter(chunks)
+    step = sync_to_async(next)
+    while (chunk := await step(iterator, None)) is not None:
+        yield chunk
+
+
+class EventStreamResponse(AsyncStreamingResponse):
+    """Server-sent events read from an async iterator of encoded messages."""
+
+    def __init__(self, events: AsyncIterator[bytes], *args, **kwargs):
+        super().__init__(events, *args, content_type='text/event-stream', **kwargs)
+        self['Cache-Control'] = 'no-cache'
+        # nginx buffers proxied responses by default
+        self['X-Accel-Buffering'] = 'no'
+
+
+class EventStreamRenderer(JSONRenderer):
+    """Lets ``Accept: text/event-stream`` through content negotiation; errors are still rendered as JSON."""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+
+_receive: ContextVar = ContextVar('asgi_receive')
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """
+    ASGIHandler that also sends AsyncStreamingResponse, whose body Django 4.1 can't iterate asynchronously.
+    The stream is cancelled as soon as the client disconnects.
+    """
+
+    async def handle(self, scope, receive, send):
+        _receive.set(receive)
+        await super().handle(scope, receive, send)
+
+    async def send_response(self, response, send):
+        if not isinstance(response, AsyncStreamingResponse):
+            return await super().send_response(response, send)
+
+        headers = [(name.encode('ascii'), value.encode('latin1')) for name, value in response.items()]
+        headers += [(b'Set-Cookie', cookie.output(header='').encode('ascii').strip())
+                    for cookie in response.cookies.values()]
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+
+        streaming = asyncio.ensure_future(self._send_chunks(response.chunks, send))
+        disconnected = asyncio.ensure_future(self._disconnected(_receive.get()))
+        try:
+            await asyncio.wait((streaming, disconnected), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            streaming.cancel()
+            disconnected.cancel()
+            result, _ = await asyncio.gather(streaming, disconnected, return_exceptions=True)
+            await sync_to_async(response.close, thread_sensitive=True)()
+        if isinstance(result, Exception):
+            raise result
+
+    @staticmethod
+    async def _send_chunks(chunks: AsyncIterator[bytes], send):
+        async for chunk in chunks:
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body'})
+
+    @staticmethod
+    async def _disconnected(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
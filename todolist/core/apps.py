@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todolist.core'
+
+    def ready(self):
+        from django.contrib.auth.signals import user_logged_in
+
+        from todolist.core import auth
+
+        # Replaced by a receiver that batches the last_login write
+        user_logged_in.disconnect(dispatch_uid='update_last_login')
+        user_logged_in.connect(auth.record_last_login, dispatch_uid='record_last_login')
@@ -0,0 +1,174 @@
+"""
+Cached authentication, unless CACHED_AUTH is off: sessions use the cached_db engine, the user behind a session
+is cached too and last_login is written in batches, so an authenticated request with warm caches runs no query
+before its view. Cached users are dropped whenever their row is saved or deleted and on logout.
+"""
+import atexit
+import copy
+import datetime
+import logging
+import threading
+import time
+from contextlib import suppress
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from todolist.core.models import User
+from todolist.db.replicas import read_from_primary
+
+logger = logging.getLogger(__name__)
+
+
+def _user_key(user_id) -> str:
+    return f'auth:session-user:{user_id}'
+
+
+def _without_password(user: User) -> User:
+    """A copy with the password hash deferred: it isn't cached, and is loaded again if something needs it."""
+    user = copy.copy(user)
+    vars(user).pop('password', None)
+    return user
+
+
+def get_user(request):
+    """auth.get_user() answered from the cache while the session's password hash still matches the cached one."""
+    if (user_id := request.session.get(auth.SESSION_KEY)) is None:
+        return auth.get_user(request)
+
+    key = _user_key(user_id)
+    if (cached := cache.get(key)) is not None:
+        user, session_auth_hash = cached
+        if request.session.get(auth.BACKEND_SESSION_KEY) in settings.AUTHENTICATION_BACKENDS \
+                and constant_time_compare(request.session.get(auth.HASH_SESSION_KEY, ''), session_auth_hash):
+            return user
+
+    # Also flushes sessions whose hash doesn't match the user in the database. From the primary, as it is cached:
+    # a lagging replica could keep a changed password or a deactivation from taking effect for USER_CACHE_TIMEOUT
+    with read_from_primary():
+        user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(key, (_without_password(user), user.get_session_auth_hash()), timeout=settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_user(*user_ids: int) -> None:
+    keys = [_user_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    # Again once committed, so a concurrent request can't cache the row as it was before
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+
+    def process_request(self, request):
+        super().process_request(request)
+        if settings.CACHED_AUTH:
+            request.user = SimpleLazyObject(lambda: _get_cached_user(request))
+
+
+def _get_cached_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+@receiver([post_save, post_delete], sender=User)
+def _user_changed(sender, instance: User, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(auth.user_logged_out)
+def _user_logged_out(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
+
+
+class LastLoginBatch:
+    """
+    last_login of the users who logged in through this process, written with one UPDATE per batch: once it is
+    full or, from a timer, LAST_LOGIN_FLUSH_INTERVAL seconds after its first login.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[int, datetime.datetime] = {}
+        self._started = 0.0
+        self._timer: threading.Timer | None = None
+
+    def add(self, user_id: int, when: datetime.datetime) -> None:
+        with self._lock:
+            if not self._pending:
+                self._started = time.monotonic()
+            self._pending[user_id] = when
+            due = len(self._pending) >= settings.LAST_LOGIN_BATCH_SIZE or (
+                time.monotonic() - self._started >= settings.LAST_LOGIN_FLUSH_INTERVAL
+            )
+            # Not alive after a fork either
+            if not due and not (self._timer and self._timer.is_alive()):
+                self._timer = threading.Timer(settings.LAST_LOGIN_FLUSH_INTERVAL, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self.stop()
+        if not pending:
+            return
+
+        # In id order, like every other batched write, so concurrent flushes can't deadlock
+        rows = sorted(pending.items())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {User._meta.db_table} AS target SET last_login = batch.last_login '
+                f'FROM (VALUES {", ".join(["(%s, %s)"] * len(rows))}) AS batch (id, last_login) '
+                'WHERE target.id = batch.id AND (target.last_login IS NULL OR target.last_login < batch.last_login)',
+                [value for row in rows for value in row],
+            )
+        # Cached users still carry the old value, which a full save() would write back
+        invalidate_user(*pending)
+
+    def stop(self) -> None:
+        """Cancels the timer; what is pending is written by the next flush()."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _flush_from_timer(self) -> None:
+        try:
+            self.flush()
+        except DatabaseError:
+            logger.warning('Could not write last_login', exc_info=True)
+        finally:
+            # Or the timer's thread would leave its connection behind
+            connection.close()
+
+
+last_logins = LastLoginBatch()
+
+
+def record_last_login(sender, user: User, **kwargs):
+    """Replaces django.contrib.auth's update_last_login receiver, see CoreConfig.ready()."""
+    if not settings.CACHED_AUTH:
+        return update_last_login(sender, user, **kwargs)
+    user.last_login = timezone.now()
+    last_logins.add(user.pk, user.last_login)
+
+
+@atexit.register
+def _flush_last_logins():
+    # The database may already be gone when the process exits; last_login is not worth a traceback
+    with suppress(DatabaseError):
+        last_logins.flush()
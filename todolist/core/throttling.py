@@ -0,0 +1,167 @@
+"""
+Throttling of the core/ endpoints that hash passwords, without an external service: token buckets in a
+memory-mapped file under THROTTLE_DIR, shared by every worker of an instance, and a cap on concurrent password
+hashes taken with flock() on one lock file per slot.
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import random
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+# Key hash (0 is an empty slot), tokens left, time of the last update
+RECORD = struct.Struct('<Qdd')
+SLOTS = 65536
+# Slots probed per key; when all are taken the least recently used bucket is given up
+PROBES = 8
+
+
+class BucketStore:
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.pid = os.getpid()
+        self.file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b', buffering=0)
+        self.fd = self.file.fileno()
+        if os.fstat(self.fd).st_size < SLOTS * RECORD.size:
+            os.ftruncate(self.fd, SLOTS * RECORD.size)
+        self.map = mmap.mmap(self.fd, SLOTS * RECORD.size)
+        # flock() excludes other processes only, threads of this one share the lock
+        self.lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, now: float | None = None) -> float:
+        """Takes a token from the bucket of ``key``; returns 0 or, when it is empty, the seconds until a refill."""
+        now = time.time() if now is None else now
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                offset, tokens, updated = self._find(digest)
+                # A new bucket, or a clock that went backwards, starts full
+                elapsed = now - updated if tokens is not None and now >= updated else None
+                tokens = capacity if elapsed is None else min(capacity, tokens + elapsed * rate)
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+                RECORD.pack_into(self.map, offset, digest, tokens - 1 if not wait else tokens, now)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return wait
+
+    def _find(self, digest: int) -> tuple[int, float | None, float]:
+        start = digest % SLOTS
+        oldest = None
+        for probe in range(PROBES):
+            offset = (start + probe) % SLOTS * RECORD.size
+            slot, tokens, updated = RECORD.unpack_from(self.map, offset)
+            if slot == digest:
+                return offset, tokens, updated
+            if slot == 0:
+                return offset, None, 0.0
+            if oldest is None or updated < oldest[1]:
+                oldest = (offset, updated)
+        return oldest[0], None, 0.0
+
+
+_store: BucketStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> BucketStore:
+    global _store
+    path = Path(settings.THROTTLE_DIR, 'buckets')
+    with _store_lock:
+        # Reopened after a fork, the parent's file description would share its flock() with the children
+        if _store is None or _store.pid != os.getpid() or _store.path != path:
+            _store = BucketStore(path)
+        return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Buckets of ``<view.throttle_scope>.<kind>`` in DEFAULT_THROTTLE_RATES: ``'5/min'`` holds 5 tokens and
+    refills one every 12 seconds. Scopes without a rate are not throttled.
+    """
+    kind: str
+
+    def get_key(self, request) -> str | None:
+        raise NotImplementedError
+
+    def allow_request(self, request, view) -> bool:
+        scope = f'{view.throttle_scope}.{self.kind}'
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None or (key := self.get_key(request)) is None:
+            return True
+
+        capacity, duration = SimpleRateThrottle.parse_rate(None, rate)
+        self.wait_seconds = get_store().take(f'{scope}:{key}', capacity, capacity / duration)
+        return not self.wait_seconds
+
+    def wait(self) -> float:
+        return self.wait_seconds
+
+
+class AddressThrottle(TokenBucketThrottle):
+    kind = 'ip'
+
+    def get_key(self, request) -> str | None:
+        return self.get_ident(request)
+
+
+class UsernameThrottle(TokenBucketThrottle):
+    """Per username tried, so guessing one account's password is slow from any number of addresses."""
+    kind = 'username'
+
+    def get_key(self, request) -> str | None:
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        return username.strip().casefold() if isinstance(username, str) and username.strip() else None
+
+
+class UserThrottle(TokenBucketThrottle):
+    kind = 'user'
+
+    def get_key(self, request) -> str | None:
+        return str(request.user.pk) if request.user.is_authenticated else None
+
+
+def hashing_slots() -> int:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    return max(1, int(cpus * settings.PASSWORD_HASHING_CPU_SHARE))
+
+
+@contextmanager
+def hashing_slot():
+    """
+    Holds one of the instance's hashing_slots() for the password hashing in the block, waiting up to
+    PASSWORD_HASHING_WAIT seconds for one to free up before the request is throttled.
+    """
+    directory = Path(settings.THROTTLE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    slots = hashing_slots()
+    deadline = time.monotonic() + settings.PASSWORD_HASHING_WAIT
+    first = random.randrange(slots)
+    while True:
+        for index in range(slots):
+            # Opened per attempt: flock() only excludes other open file descriptions, threads included
+            fd = os.open(directory / f'hashing.{(first + index) % slots}.lock', os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            try:
+                yield
+                return
+            finally:
+                os.close(fd)
+        if time.monotonic() >= deadline:
+            raise Throttled(wait=1)
+        time.sleep(0.01)
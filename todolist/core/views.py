@@ -1,10 +1,16 @@
+from django.conf import settings
 from django.contrib.auth import login, logout
+from django.http import Http404, HttpResponse
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from todolist.asyncviews import AsyncAPIView
 from todolist.core.models import User
 from todolist.core.serializers import CreateUserSerializer, LoginSerializer, ProfileSerializer, UpdatePasswordSerializer
+from todolist.core.throttling import AddressThrottle, UsernameThrottle, UserThrottle, hashing_slot
+from todolist.metrics import collect as collect_metrics, render as render_metrics
 
 
 @api_view(['GET'])
@@ -12,12 +18,33 @@ def health_check(request):
     return Response({'status': 'OK'})
 
 
+class AsyncHealthCheckView(AsyncAPIView, APIView):
+    http_method_names = ['get', 'options']
+
+    async def aget(self, request, *args, **kwargs):
+        return Response({'status': 'OK'})
+
+
+def metrics(request):
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(render_metrics(collect_metrics()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 class SignupView(generics.CreateAPIView):
     serializer_class = CreateUserSerializer
+    throttle_classes = [AddressThrottle]
+    throttle_scope = 'signup'
+
+    def perform_create(self, serializer):
+        with hashing_slot():
+            super().perform_create(serializer)
 
 
 class LoginView(generics.CreateAPIView):
     serializer_class = LoginSerializer
+    throttle_classes = [AddressThrottle, UsernameThrottle]
+    throttle_scope = 'login'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -26,7 +53,8 @@ class LoginView(generics.CreateAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def perform_create(self, serializer):
-        user = serializer.save()
+        with hashing_slot():
+            user = serializer.save()
         login(request=self.request, user=user)
 
 
@@ -46,6 +74,19 @@ class ProfileView(generics.RetrieveUpdateDestroyAPIView):
 class UpdatePasswordView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UpdatePasswordSerializer
+    throttle_classes = [UserThrottle]
+    throttle_scope = 'update_password'
 
     def get_object(self):
         return self.request.user
+
+    def update(self, request, *args, **kwargs):
+        # Checking the old password hashes as well as setting the new one
+        with hashing_slot():
+            return super().update(request, *args, **kwargs)
+
+
+class AsyncProfileView(AsyncAPIView, ProfileView):
+
+    async def aget(self, request, *args, **kwargs):
+        return Response(self.get_serializer(request.user).data)
@@ -0,0 +1,32 @@
+"""
+The PostgreSQL backend with its connections taken from and handed back to a todolist.db.pool.ConnectionPool,
+configured by the POOL entry of the database settings.
+"""
+from django.db.backends.postgresql import base, creation
+
+from todolist.db.pool import close_pools, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep the database from being dropped
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_new_connection(self, conn_params):
+        self.pool = pool = get_pool(conn_params, self.settings_dict.get('POOL', {}))
+        connection = pool.get(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        # Set by the parent for the connections it opens, see there
+        self.isolation_level = self.settings_dict['OPTIONS'].get('isolation_level', connection.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # Closed inside an atomic block, Django keeps referring to the connection: it can't be shared
+                self.pool.put(self.connection, reuse=not self.in_atomic_block)
@@ -0,0 +1,157 @@
+"""
+A per-process pool of psycopg2 connections, behind the todolist.db backend: Django still closes its connection
+at the end of every request (CONN_MAX_AGE = 0), which now hands it back to the pool instead of tearing it down.
+Connections are per thread in Django, the pool is shared by all of a worker's threads, sync or ASGI.
+"""
+import os
+import threading
+import time
+from contextlib import suppress
+from typing import Callable
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from todolist.metrics import registry
+
+
+class ConnectionPool:
+    def __init__(self, size: int, max_lifetime: float, idle_timeout: float, health_checks: bool, timeout: float):
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.health_checks = health_checks
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.pid = os.getpid()
+        # Oldest first, as (connection, returned at)
+        self.idle: list[tuple] = []
+        self.opened_at: dict = {}
+        # Connections open or being opened, idle or checked out
+        self.open = 0
+
+    def get(self, connect: Callable):
+        """Checks out an idle connection or, while the pool is not full, opens one through ``connect()``."""
+        started = time.monotonic()
+        while (connection := self._checkout(started + self.timeout)) is not None:
+            if not self.health_checks or self._healthy(connection):
+                registry.observe('todolist_db_pool_wait_seconds', {}, time.monotonic() - started)
+                return connection
+            self._discard(connection, 'broken')
+
+        registry.observe('todolist_db_pool_wait_seconds', {}, time.monotonic() - started)
+        try:
+            connection = connect()
+        except BaseException:
+            with self.condition:
+                self.open -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.opened_at[connection] = time.monotonic()
+        registry.inc('todolist_db_pool_connections_opened_total', {})
+        return connection
+
+    def put(self, connection, reuse: bool = True) -> None:
+        with self.condition:
+            opened_at = self.opened_at.get(connection)
+        if opened_at is None:
+            # Checked out before a fork, it belongs to the parent
+            return
+        reason = None if reuse else 'discarded'
+        if reason is None and time.monotonic() - opened_at >= self.max_lifetime:
+            reason = 'lifetime'
+        if reason is None:
+            try:
+                if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+                # So the health check doesn't open a transaction
+                connection.autocommit = True
+            except psycopg2.Error:
+                reason = 'broken'
+        if reason is None and connection.closed:
+            reason = 'broken'
+
+        if reason is not None:
+            self._discard(connection, reason)
+            return
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def close(self) -> None:
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for connection, _ in idle:
+            self._discard(connection, 'closed')
+
+    def _checkout(self, deadline: float):
+        """An idle connection, or None once there's room to open one; raises when the deadline passes first."""
+        with self.condition:
+            # Connections inherited through a fork belong to the parent
+            if os.getpid() != self.pid:
+                self._reset()
+            while True:
+                now = time.monotonic()
+                while self.idle and now - self.idle[0][1] >= self.idle_timeout:
+                    self._discard_locked(self.idle.pop(0)[0], 'idle')
+                if self.idle:
+                    # The most recently used one, the others are left to time out when the load drops
+                    return self.idle.pop()[0]
+                if self.open < self.size:
+                    self.open += 1
+                    return None
+                if now >= deadline or not self.condition.wait(deadline - now):
+                    registry.inc('todolist_db_pool_timeouts_total', {})
+                    raise psycopg2.OperationalError(
+                        f'No database connection free within {self.timeout:g}s, all {self.size} are in use'
+                    )
+
+    def _healthy(self, connection) -> bool:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except psycopg2.Error:
+            return False
+        return True
+
+    def _discard(self, connection, reason: str) -> None:
+        with self.condition:
+            self._discard_locked(connection, reason)
+
+    def _discard_locked(self, connection, reason: str) -> None:
+        self.open -= 1
+        self.opened_at.pop(connection, None)
+        self.condition.notify()
+        with suppress(psycopg2.Error):
+            connection.close()
+        registry.inc('todolist_db_pool_connections_closed_total', {'reason': reason})
+
+
+_pools: dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(conn_params: dict, options: dict) -> ConnectionPool:
+    key = tuple(sorted((name, str(value)) for name, value in conn_params.items()))
+    with _pools_lock:
+        if (pool := _pools.get(key)) is None:
+            pool = _pools[key] = ConnectionPool(
+                size=options.get('SIZE', 10),
+                max_lifetime=options.get('MAX_LIFETIME', 3600.0),
+                idle_timeout=options.get('IDLE_TIMEOUT', 300.0),
+                health_checks=options.get('HEALTH_CHECKS', True),
+                timeout=options.get('TIMEOUT', 5.0),
+            )
+        return pool
+
+
+def close_pools(database: str | None = None) -> None:
+    """Closes the idle connections of every pool, or of those connecting to ``database``."""
+    with _pools_lock:
+        pools = [pool for key, pool in _pools.items() if database is None or ('database', database) in key]
+    for pool in pools:
+        pool.close()
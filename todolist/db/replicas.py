@@ -0,0 +1,108 @@
+"""
+Read replicas: ReplicaMiddleware picks one of REPLICA_DATABASES for the reads of a safe request and ReplicaRouter
+sends them there; everything else, writes and reads outside requests included, goes to the primary. A user who
+wrote anything reads from the primary for the next REPLICA_PIN_SECONDS, so they always see their own writes.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+# The replica the current request reads from, None for the primary
+_replica: ContextVar[str | None] = ContextVar('replica', default=None)
+
+
+def _pin_key(user_id) -> str:
+    return f'db:primary:{user_id}'
+
+
+def pin_to_primary(user_id) -> None:
+    cache.set(_pin_key(user_id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def reading_from_replica() -> bool:
+    """Whether the current request's reads go to a replica, which may lag behind: nothing it reads should be cached."""
+    return _replica.get() is not None
+
+
+@contextmanager
+def read_from_primary():
+    """For reads that must not be older than something else read from the primary."""
+    token = _replica.set(None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        return _replica.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+        token = _replica.set(self._choose(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(token)
+        self._pin(request)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return await self.get_response(request)
+        token = _replica.set(await sync_to_async(self._choose)(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica.reset(token)
+        await sync_to_async(self._pin)(request)
+        return response
+
+    @staticmethod
+    def _choose(request) -> str | None:
+        if request.method not in SAFE_METHODS:
+            return None
+        if (user_id := request.session.get(SESSION_KEY)) is not None and cache.get(_pin_key(user_id)):
+            return None
+        return random.choice(settings.REPLICA_DATABASES)
+
+    @staticmethod
+    def _pin(request) -> None:
+        if request.method in SAFE_METHODS:
+            return
+        # After the view, so a user who just logged in is pinned too
+        if (user_id := request.session.get(SESSION_KEY)) is not None:
+            pin_to_primary(user_id)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GoalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todolist.goals'
+
+    def ready(self):
+        from todolist.goals import signals  # noqa: F401
@@ -0,0 +1,87 @@
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from todolist.db.replicas import reading_from_replica
+from todolist.goals.conditional import VALIDATOR_HEADERS, not_modified
+
+
+def _version_key(user_id: int) -> str:
+    return f'goals:version:{user_id}'
+
+
+def get_user_version(user_id: int) -> str:
+    # Random rather than incremented, so a version key lost to culling can never resurrect old entries
+    key = _version_key(user_id)
+    if (version := cache.get(key)) is None:
+        version = uuid4().hex
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_user_version(user_id: int) -> str:
+    key = _version_key(user_id)
+    if (version := await cache.aget(key)) is None:
+        version = uuid4().hex
+        if not await cache.aadd(key, version, timeout=None):
+            version = await cache.aget(key, version)
+    return version
+
+
+def invalidate_user_cache(*user_ids: int) -> None:
+    def bump():
+        cache.set_many({_version_key(user_id): uuid4().hex for user_id in user_ids}, timeout=None)
+
+    # Bump now for this process and again once the data is visible to everyone else,
+    # so a concurrent reader can't cache pre-commit rows under the new version.
+    bump()
+    transaction.on_commit(bump)
+
+
+class CachedListMixin:
+    """
+    Serves list responses from the cache, keyed on the requesting user's data version.
+    Validators set further down the chain are cached alongside the data and checked on hits.
+    Responses read from a replica are not cached, it may not have caught up with the version they'd be cached under.
+    """
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_list_cache_key()
+        if (cached := cache.get(key)) is not None:
+            data, validators = cached
+            if (response := not_modified(request, validators)) is not None:
+                return response
+            return Response(data, headers=validators)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and not reading_from_replica():
+            validators = {header: response[header] for header in VALIDATOR_HEADERS if response.has_header(header)}
+            cache.set(key, (response.data, validators), timeout=settings.LIST_CACHE_TIMEOUT)
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        key = self._list_cache_key(await aget_user_version(request.user.id))
+        if (cached := await cache.aget(key)) is not None:
+            data, validators = cached
+            if (response := not_modified(request, validators)) is not None:
+                return response
+            return Response(data, headers=validators)
+
+        response = await super().alist(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and not reading_from_replica():
+            validators = {header: response[header] for header in VALIDATOR_HEADERS if response.has_header(header)}
+            await cache.aset(key, (response.data, validators), timeout=settings.LIST_CACHE_TIMEOUT)
+        return response
+
+    def get_list_cache_key(self) -> str:
+        return self._list_cache_key(get_user_version(self.request.user.id))
+
+    def _list_cache_key(self, version: str) -> str:
+        url = hashlib.md5(self.request.build_absolute_uri().encode()).hexdigest()
+        return f'goals:list:{self.request.user.id}:{version}:{type(self).__name__}:{url}'
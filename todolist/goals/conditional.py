@@ -0,0 +1,104 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.response import Response
+
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+def make_validators(*parts, last_modified: Optional[datetime]) -> dict[str, str]:
+    headers = {'ETag': quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified.timestamp())
+    return headers
+
+
+def profile_fields(user) -> tuple:
+    """What ProfileSerializer embeds of a user, for the validators of rows serialized with it."""
+    return user.username, user.first_name, user.last_name, user.email
+
+
+def not_modified(request, validators: dict[str, str]) -> Optional[HttpResponse]:
+    response = get_conditional_response(
+        request,
+        etag=validators.get('ETag'),
+        last_modified=parse_http_date_safe(validators.get('Last-Modified')),
+    )
+    if response is not None:
+        set_validators(response, validators)
+    return response
+
+
+def set_validators(response: HttpResponse, validators: dict[str, str]) -> HttpResponse:
+    for header, value in validators.items():
+        response[header] = value
+    return response
+
+
+class ConditionalListMixin:
+    """
+    Answers conditional list requests from a MAX(updated)/COUNT(*) aggregate without serializing the page.
+    Only with an ETag: removing a row lowers the count but not MAX(updated), so Last-Modified would not change.
+    """
+
+    def list(self, request, *args, **kwargs):
+        validators = self.get_list_validators()
+        if (response := not_modified(request, validators)) is not None:
+            return response
+
+        return set_validators(super().list(request, *args, **kwargs), validators)
+
+    async def alist(self, request, *args, **kwargs):
+        validators = await self.aget_list_validators()
+        if (response := not_modified(request, validators)) is not None:
+            return response
+
+        return set_validators(await super().alist(request, *args, **kwargs), validators)
+
+    def get_list_validators(self) -> dict[str, str]:
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._list_validators(queryset.aggregate(last_modified=Max('updated'), count=Count('id')))
+
+    async def aget_list_validators(self) -> dict[str, str]:
+        queryset = await self.afilter_queryset()
+        return self._list_validators(await queryset.aaggregate(last_modified=Max('updated'), count=Count('id')))
+
+    def _list_validators(self, aggregate: dict) -> dict[str, str]:
+        user = self.request.user
+        return make_validators(
+            aggregate['last_modified'],
+            aggregate['count'],
+            self.request.build_absolute_uri(),
+            # Category and comment rows embed the author's profile, which has no `updated` of its own
+            profile_fields(user),
+            last_modified=None,
+        )
+
+
+class ConditionalRetrieveMixin:
+    """
+    Validators of the instance's pk and `updated`; views serializing related rows whose changes don't bump it
+    override get_detail_validators().
+    """
+
+    def get_detail_validators(self, instance) -> dict[str, str]:
+        return make_validators(instance.pk, instance.updated, last_modified=instance.updated)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        validators = self.get_detail_validators(instance)
+        if (response := not_modified(request, validators)) is not None:
+            return response
+        return Response(self.get_serializer(instance).data, headers=validators)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        validators = self.get_detail_validators(instance)
+        if (response := not_modified(request, validators)) is not None:
+            return response
+        return Response(self.get_serializer(instance).data, headers=validators)
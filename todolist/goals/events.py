@@ -0,0 +1,118 @@
+"""
+Change feed of a user's categories, goals and comments, sent as server-sent events by GoalEventsView.
+
+Statement-level triggers (migration 0008) NOTIFY ``goal_events`` with the ids every write created, updated,
+archived or deleted, per owner. NOTIFY is transactional: events go out on commit and never for rolled back
+writes, whichever code path made them. Every ASGI worker keeps one LISTENing connection while it has open
+streams and fans the notifications out to them, so an idle stream costs no query and no connection.
+
+Events say what changed, not how: clients refetch the rows by id. They also refetch everything they show when
+the stream (re)opens and on a ``reset`` event, sent when a stream fell too far behind and events were dropped.
+"""
+import asyncio
+import json
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import psycopg2
+from django.db import connection
+
+CHANNEL = 'goal_events'
+# Seconds between comments on idle streams: proxies close silent connections, and writes notice dead clients
+KEEPALIVE = 15
+RETRY_MS = 3000
+QUEUE_SIZE = 100
+RESET = {'type': 'reset'}
+
+
+class EventHub:
+    def __init__(self):
+        self._subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self._connection = None
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        """A queue of the user's events; ``None`` ends the stream."""
+        queue = asyncio.Queue(QUEUE_SIZE)
+        async with self._lock:
+            if self._connection is None:
+                self._connection = await asyncio.to_thread(self._listen)
+                asyncio.get_running_loop().add_reader(self._connection.fileno(), self._receive)
+            self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[user_id].discard(queue)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+            if not self._subscribers:
+                self._close()
+
+    @property
+    def listening(self) -> bool:
+        return self._connection is not None
+
+    @staticmethod
+    def _listen():
+        # A connection of its own: Django's are per thread and closed at the end of every request
+        listener = psycopg2.connect(**connection.get_connection_params())
+        listener.autocommit = True
+        with listener.cursor() as cursor:
+            cursor.execute(f'LISTEN {CHANNEL}')
+        return listener
+
+    def _receive(self):
+        try:
+            self._connection.poll()
+        except psycopg2.Error:
+            # Streams end and EventSource reconnects, which listens again
+            self._close()
+            for queues in self._subscribers.values():
+                for queue in queues:
+                    self._put(queue, None)
+            return
+
+        while self._connection.notifies:
+            event = json.loads(self._connection.notifies.pop(0).payload)
+            for queue in self._subscribers.get(event.pop('user'), ()):
+                self._put(queue, event)
+
+    def _close(self):
+        if self._connection is not None:
+            asyncio.get_running_loop().remove_reader(self._connection.fileno())
+            self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, event: dict | None):
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            if event is not None:
+                event = RESET
+        queue.put_nowait(event)
+
+
+hub = EventHub()
+
+
+def _format(event: dict) -> bytes:
+    data = {key: value for key, value in event.items() if key != 'type'}
+    return f'event: {event["type"]}\ndata: {json.dumps(data)}\n\n'.encode()
+
+
+async def event_stream(user_id: int) -> AsyncIterator[bytes]:
+    async with hub.subscribe(user_id) as queue:
+        # Sent once listening, so a client seeing it won't miss events of later writes
+        yield f'retry: {RETRY_MS}\n\n'.encode()
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield b': keepalive\n\n'
+                continue
+            if event is None:
+                return
+            yield _format(event)
@@ -0,0 +1,84 @@
+import csv
+import json
+from typing import Iterable, Iterator
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from todolist.core.models import User
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+
+CHUNK_SIZE = 2000
+DATETIME = serializers.DateTimeField()
+
+
+def _exports(user: User) -> tuple[tuple[str, QuerySet, tuple[str, ...]], ...]:
+    return (
+        (
+            'category',
+            GoalCategory.objects.filter(user_id=user.id),
+            ('id', 'title', 'is_deleted', 'created', 'updated'),
+        ),
+        (
+            'goal',
+            Goal.objects.filter(user_id=user.id),
+            ('id', 'category_id', 'title', 'description', 'status', 'priority', 'due_date', 'created', 'updated'),
+        ),
+        (
+            'comment',
+            GoalComment.objects.filter(user_id=user.id),
+            ('id', 'goal_id', 'text', 'created', 'updated'),
+        ),
+    )
+
+
+def iter_records(user: User) -> Iterator[dict]:
+    datetime_columns = {'created', 'updated', 'due_date'}
+    for kind, queryset, columns in _exports(user):
+        # iterator() streams through a server-side cursor instead of materializing the table
+        for row in queryset.order_by('id').values_list(*columns).iterator(chunk_size=CHUNK_SIZE):
+            record = {'type': kind}
+            for column, value in zip(columns, row):
+                record[column] = DATETIME.to_representation(value) if column in datetime_columns else value
+            yield record
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk.clear()
+    if chunk:
+        yield ''.join(chunk)
+
+
+def ndjson(user: User) -> Iterator[str]:
+    return _chunked(json.dumps(record, ensure_ascii=False) + '\n' for record in iter_records(user))
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_lines(user: User) -> Iterator[str]:
+    header = ['type']
+    for _, _, columns in _exports(user):
+        header.extend(column for column in columns if column not in header)
+
+    writer = csv.DictWriter(_Echo(), fieldnames=header)
+    yield writer.writerow(dict(zip(header, header)))
+    for record in iter_records(user):
+        yield writer.writerow(record)
+
+
+def csv_rows(user: User) -> Iterator[str]:
+    return _chunked(_csv_lines(user))
+
+
+FORMATS = {
+    'ndjson': (ndjson, 'application/x-ndjson'),
+    'csv': (csv_rows, 'text/csv'),
+}
@@ -1,6 +1,9 @@
 import django_filters
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.db import models
 from django_filters import rest_framework
+from rest_framework import filters
+from rest_framework.settings import api_settings
 
 from todolist.goals.models import Goal
 
@@ -18,3 +21,19 @@ class GoalDateFilter(rest_framework.FilterSet):
     filter_overrides = {
         models.DateTimeField: {'filter_class': django_filters.IsoDateTimeFilter},
     }
+
+
+class GoalSearchFilter(filters.SearchFilter):
+    # Must match the text search configuration used by the goals_goal_search_vector trigger
+    search_config = 'pg_catalog.russian'
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        query = SearchQuery(' '.join(search_terms), config=self.search_config, search_type='websearch')
+        queryset = queryset.filter(search_vector=query)
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.annotate(rank=SearchRank(models.F('search_vector'), query)).order_by('-rank', 'id')
+        return queryset
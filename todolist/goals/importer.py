@@ -0,0 +1,284 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from todolist.core.models import User
+from todolist.goals.cache import invalidate_user_cache
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+from todolist.goals.pgcopy import copy_rows
+
+BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+GOAL_COLUMNS = ('line', 'source_id', 'category_id', 'title', 'description', 'status', 'priority', 'due_date')
+COMMENT_COLUMNS = ('line', 'goal_ref', 'text')
+
+# A line's record, or why it couldn't be read
+Row = tuple[int, dict | str]
+
+
+@dataclass
+class ImportResult:
+    goals: int = 0
+    comments: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, line: int, errors: dict) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+
+def _decode(lines: Iterable[bytes]) -> Iterator[str]:
+    # Line by line, so a decoding error is raised for the line it is on
+    encoding = 'utf-8-sig'
+    for line in lines:
+        yield line.decode(encoding)
+        encoding = 'utf-8'
+
+
+def read_csv(stream: IO[bytes]) -> Iterator[Row]:
+    reader = csv.DictReader(_decode(stream))
+    while True:
+        # DictReader only updates its line_num for the rows it returns
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            yield reader.reader.line_num + 1, 'Not valid UTF-8, this and the following lines were not imported.'
+            return
+        except csv.Error as e:
+            yield reader.reader.line_num, f'Not valid CSV: {e}.'
+            continue
+        yield reader.line_num, row
+
+
+def read_ndjson(stream: IO[bytes]) -> Iterator[Row]:
+    for line, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError:
+            row = None
+        yield line, row if isinstance(row, dict) else 'Expected a JSON object.'
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+    'jsonl': read_ndjson,
+}
+
+
+class _ChoiceLabelField(serializers.Field):
+    """Accepts a choice by value, member name or label, e.g. ``3``, ``"done"`` or ``"Выполнено"``."""
+
+    def __init__(self, choices, **kwargs):
+        self.lookup = {}
+        for member in choices:
+            for key in (member.value, member.name, member.label):
+                self.lookup[str(key).lower()] = member.value
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            return self.lookup[str(data).strip().lower()]
+        except KeyError:
+            raise serializers.ValidationError(f'"{data}" is not a valid choice.')
+
+
+# Plain fields rather than a serializer per row: no instance setup or DB lookups in the hot loop
+GOAL_FIELDS = {
+    'source_id': (('id',), serializers.IntegerField(required=False)),
+    'title': (('title',), serializers.CharField(max_length=255)),
+    'description': (('description',), serializers.CharField(required=False, allow_blank=True)),
+    'status': (('status',), _ChoiceLabelField(Goal.Status, default=Goal.Status.to_do)),
+    'priority': (('priority',), _ChoiceLabelField(Goal.Priority, default=Goal.Priority.medium)),
+    'due_date': (('due_date',), serializers.DateTimeField(required=False)),
+}
+COMMENT_FIELDS = {
+    'goal_ref': (('goal', 'goal_id'), serializers.IntegerField()),
+    'text': (('text',), serializers.CharField()),
+}
+
+
+def _value(row: dict, keys: tuple[str, ...]):
+    return next((row[key] for key in keys if row.get(key) not in (None, '')), None)
+
+
+def _run_fields(fields: dict, row: dict) -> tuple[dict, dict]:
+    data, errors = {}, {}
+    for name, (keys, field_) in fields.items():
+        try:
+            if (value := _value(row, keys)) is not None:
+                data[name] = field_.run_validation(value)
+            elif field_.required:
+                raise serializers.ValidationError(field_.error_messages['required'])
+            else:
+                data[name] = None if field_.default is serializers.empty else field_.default
+        except serializers.ValidationError as e:
+            errors[keys[0]] = e.detail
+    return data, errors
+
+
+class GoalImporter:
+    """
+    Loads goals and comments for one user. Rows are validated in Python against the user's categories,
+    copied batch by batch into temporary staging tables with COPY and moved into the real tables with
+    a single INSERT ... SELECT, so per-row errors are reported without aborting the rest of the file.
+
+    Comments reference a goal either by its ``id`` earlier in the same file or by an existing goal id.
+    """
+    batch_size = BATCH_SIZE
+
+    def __init__(self, user: User):
+        self.user = user
+        self.result = ImportResult()
+        self.source_ids: set[int] = set()
+        self.category_ids: set[int] = set()
+        self.category_titles: dict[str, int] = {}
+        for category_id, title in GoalCategory.objects.filter(
+            user_id=user.id, is_deleted=False
+        ).order_by('-id').values_list('id', 'title'):
+            self.category_ids.add(category_id)
+            self.category_titles[title.upper()] = category_id
+
+    def run(self, rows: Iterable[Row]) -> ImportResult:
+        rows = iter(rows)
+        with transaction.atomic(), connection.cursor() as cursor:
+            self._create_staging(cursor)
+            while batch := list(islice(rows, self.batch_size)):
+                goals, comments = self._validate(batch)
+                self._load_goals(cursor, goals)
+                self._load_comments(cursor, comments)
+            # ON COMMIT DROP only fires with the outermost transaction, which may not be ours
+            cursor.execute('DROP TABLE goals_import_goal, goals_import_goal_map, goals_import_comment')
+            # Raw SQL sends no signals
+            invalidate_user_cache(self.user.id)
+        return self.result
+
+    def _resolve_category(self, value) -> int | None:
+        value = str(value).strip()
+        if value.isdigit() and int(value) in self.category_ids:
+            return int(value)
+        return self.category_titles.get(value.upper())
+
+    def _validate(self, batch: list[Row]) -> tuple[list[tuple], list[tuple]]:
+        goals, comments = [], []
+        for line, row in batch:
+            if isinstance(row, str):
+                self.result.add_error(line, {'non_field_errors': [row]})
+                continue
+
+            kind = row.get('type') or 'goal'
+            if kind == 'goal':
+                data, errors = _run_fields(GOAL_FIELDS, row)
+                if (category := _value(row, ('category', 'category_id'))) is None:
+                    errors['category'] = ['This field is required.']
+                elif (category_id := self._resolve_category(category)) is None:
+                    errors['category'] = [f'Category "{category}" does not exist.']
+                if data.get('source_id') in self.source_ids:
+                    errors['id'] = ['Goal appears more than once in the file.']
+                if not errors:
+                    if data['source_id'] is not None:
+                        self.source_ids.add(data['source_id'])
+                    data.update(line=line, category_id=category_id)
+                    goals.append(tuple(data[column] for column in GOAL_COLUMNS))
+            elif kind == 'comment':
+                data, errors = _run_fields(COMMENT_FIELDS, row)
+                if not errors:
+                    comments.append((line, data['goal_ref'], data['text']))
+            else:
+                errors = {'type': [f'"{kind}" is not a valid choice.']}
+
+            if errors:
+                self.result.add_error(line, errors)
+        return goals, comments
+
+    @staticmethod
+    def _create_staging(cursor) -> None:
+        # ids come straight from the goals sequence, so the source id -> new id map is known up front
+        cursor.execute("SELECT pg_get_serial_sequence('goals_goal', 'id')")
+        (sequence,) = cursor.fetchone()
+        cursor.execute(
+            """
+            CREATE TEMP TABLE goals_import_goal (
+                line integer NOT NULL,
+                source_id bigint,
+                id bigint NOT NULL DEFAULT nextval(%s::regclass),
+                category_id bigint NOT NULL,
+                title varchar(255) NOT NULL,
+                description text,
+                status smallint NOT NULL,
+                priority smallint NOT NULL,
+                due_date timestamptz
+            ) ON COMMIT DROP;
+            CREATE TEMP TABLE goals_import_goal_map (
+                source_id bigint PRIMARY KEY,
+                id bigint NOT NULL
+            ) ON COMMIT DROP;
+            CREATE TEMP TABLE goals_import_comment (
+                line integer NOT NULL,
+                goal_ref bigint NOT NULL,
+                text text NOT NULL
+            ) ON COMMIT DROP;
+            """,
+            [sequence],
+        )
+
+    def _load_goals(self, cursor, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        copy_rows(cursor, 'goals_import_goal', GOAL_COLUMNS, rows)
+        cursor.execute(
+            f"""
+            INSERT INTO {Goal._meta.db_table}
+                (id, created, updated, title, description, status, priority, due_date, category_id, user_id)
+            SELECT id, now(), now(), title, description, status, priority, due_date, category_id, %s
+            FROM goals_import_goal ORDER BY line
+            """,
+            [self.user.id],
+        )
+        self.result.goals += cursor.rowcount
+        cursor.execute(
+            """
+            INSERT INTO goals_import_goal_map (source_id, id)
+            SELECT source_id, id FROM goals_import_goal WHERE source_id IS NOT NULL;
+            TRUNCATE goals_import_goal;
+            """
+        )
+
+    def _load_comments(self, cursor, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        copy_rows(cursor, 'goals_import_comment', COMMENT_COLUMNS, rows)
+        resolved = f"""
+            FROM goals_import_comment s
+            LEFT JOIN goals_import_goal_map m ON m.source_id = s.goal_ref
+            LEFT JOIN {Goal._meta.db_table} g ON g.id = COALESCE(m.id, s.goal_ref) AND g.user_id = %s
+        """
+        cursor.execute(f'SELECT s.line, s.goal_ref {resolved} WHERE g.id IS NULL ORDER BY s.line', [self.user.id])
+        for line, goal_ref in cursor.fetchall():
+            self.result.add_error(line, {'goal': [f'Goal "{goal_ref}" does not exist.']})
+
+        cursor.execute(
+            f"""
+            INSERT INTO {GoalComment._meta.db_table} (created, updated, text, goal_id, user_id)
+            SELECT now(), now(), s.text, g.id, g.user_id {resolved} WHERE g.id IS NOT NULL ORDER BY s.line
+            """,
+            [self.user.id],
+        )
+        self.result.comments += cursor.rowcount
+        cursor.execute('TRUNCATE goals_import_comment')
+
+
+def import_goals(user: User, stream: IO[bytes], file_format: str) -> ImportResult:
+    return GoalImporter(user).run(READERS[file_format](stream))
@@ -0,0 +1,168 @@
+import datetime
+import random
+import time
+from array import array
+from itertools import islice
+from typing import Iterator
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from todolist.core.models import User
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+from todolist.goals.pgcopy import copy_rows
+
+WORDS = (
+    'отчёт', 'план', 'проект', 'спорт', 'книга', 'английский', 'ремонт', 'отпуск', 'бюджет', 'встреча',
+    'report', 'plan', 'project', 'workout', 'book', 'review', 'release', 'budget', 'meeting', 'trip',
+)
+VERBS = ('Подготовить', 'Сделать', 'Закончить', 'Прочитать', 'Обсудить', 'Write', 'Finish', 'Read', 'Review', 'Book')
+
+STATUS_WEIGHTS = {
+    Goal.Status.to_do: 40,
+    Goal.Status.in_progress: 25,
+    Goal.Status.done: 25,
+    Goal.Status.archived: 10,
+}
+PRIORITY_WEIGHTS = {
+    Goal.Priority.low: 20,
+    Goal.Priority.medium: 50,
+    Goal.Priority.high: 20,
+    Goal.Priority.critical: 10,
+}
+DELETED_CATEGORY_SHARE = 0.05
+NO_DUE_DATE_SHARE = 0.3
+HISTORY = datetime.timedelta(days=730)
+
+USER_COLUMNS = (
+    'id', 'password', 'is_superuser', 'username', 'first_name', 'last_name', 'email', 'is_staff', 'is_active',
+    'date_joined',
+)
+CATEGORY_COLUMNS = ('id', 'created', 'updated', 'title', 'user_id', 'is_deleted')
+GOAL_COLUMNS = (
+    'id', 'created', 'updated', 'title', 'description', 'category_id', 'status', 'priority', 'due_date', 'user_id',
+)
+COMMENT_COLUMNS = ('id', 'created', 'updated', 'text', 'goal_id', 'user_id')
+
+
+class Command(BaseCommand):
+    help = 'Generate users, categories, goals and comments with COPY, reproducibly for a given --seed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10_000)
+        parser.add_argument('--goals', type=int, default=1_000_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=100_000)
+        parser.add_argument('--password', default='generated', help='Password of every generated user')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or (options['goals'] and not options['categories']) or (
+            options['comments'] and not options['goals']
+        ):
+            raise CommandError('Goals need categories and comments need goals; at least one user is required')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        # Hashing is deliberately slow, so every generated user shares one precomputed hash
+        self.password = make_password(options['password'])
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            self.cursor = cursor
+            user_ids = self._load(User, options['users'], self._users)
+            category_users, category_deleted = array('q'), array('b')
+            first_category = self._load(
+                GoalCategory, options['categories'], self._categories,
+                range(user_ids, user_ids + options['users']), category_users, category_deleted,
+            )
+            goal_users = array('q')
+            first_goal = self._load(
+                Goal, options['goals'], self._goals, first_category, category_users, category_deleted, goal_users,
+            )
+            self._load(GoalComment, options['comments'], self._comments, first_goal, goal_users)
+
+        with connection.cursor() as cursor:
+            for model in (User, GoalCategory, Goal, GoalComment):
+                cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+    def _load(self, model, count: int, rows, *args) -> int:
+        """COPYs ``count`` rows in batches and returns the first of the ids reserved for them."""
+        table = model._meta.db_table
+        start = time.perf_counter()
+        # Reserving the ids up front lets child rows reference parents without reading them back
+        self.cursor.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+        self.cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+        (sequence,) = self.cursor.fetchone()
+        self.cursor.execute('SELECT nextval(%s)', [sequence])
+        (first_id,) = self.cursor.fetchone()
+        if count:
+            self.cursor.execute('SELECT setval(%s, %s)', [sequence, first_id + count - 1])
+
+        generated = rows(first_id, count, *args)
+        columns = next(generated)
+        while batch := list(islice(generated, self.batch_size)):
+            copy_rows(self.cursor, table, columns, batch)
+        self.stdout.write(f'{table}: {count} rows in {time.perf_counter() - start:.1f}s')
+        return first_id
+
+    def _created(self) -> datetime.datetime:
+        return self.now - HISTORY * self.rng.random()
+
+    def _text(self, words: int) -> str:
+        return ' '.join(self.rng.choices(WORDS, k=words))
+
+    def _users(self, first_id: int, count: int) -> Iterator[tuple]:
+        yield USER_COLUMNS
+        for user_id in range(first_id, first_id + count):
+            yield (
+                user_id, self.password, False, f'user{user_id}', '', '', f'user{user_id}@example.com', False,
+                True, self._created(),
+            )
+
+    def _categories(self, first_id: int, count: int, user_ids: range, category_users: array,
+                    category_deleted: array) -> Iterator[tuple]:
+        yield CATEGORY_COLUMNS
+        for category_id in range(first_id, first_id + count):
+            user_id = self.rng.choice(user_ids)
+            is_deleted = self.rng.random() < DELETED_CATEGORY_SHARE
+            category_users.append(user_id)
+            category_deleted.append(is_deleted)
+            created = self._created()
+            yield category_id, created, created, self._text(2).capitalize(), user_id, is_deleted
+
+    def _goals(self, first_id: int, count: int, first_category: int, category_users: array,
+               category_deleted: array, goal_users: array) -> Iterator[tuple]:
+        yield GOAL_COLUMNS
+        statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        priorities, priority_weights = list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values())
+        for goal_id in range(first_id, first_id + count):
+            index = self.rng.randrange(len(category_users))
+            user_id = category_users[index]
+            goal_users.append(user_id)
+            # Deleting a category archives its goals
+            if category_deleted[index]:
+                status = Goal.Status.archived
+            else:
+                status = self.rng.choices(statuses, status_weights)[0]
+            created = self._created()
+            updated = min(self.now, created + (self.now - created) * self.rng.random())
+            due_date = None
+            if self.rng.random() >= NO_DUE_DATE_SHARE:
+                due_date = created + datetime.timedelta(days=self.rng.uniform(1, 120))
+            yield (
+                goal_id, created, updated, f'{self.rng.choice(VERBS)} {self._text(2)}',
+                self._text(self.rng.randint(0, 12)) or None, first_category + index, status,
+                self.rng.choices(priorities, priority_weights)[0], due_date, user_id,
+            )
+
+    def _comments(self, first_id: int, count: int, first_goal: int, goal_users: array) -> Iterator[tuple]:
+        yield COMMENT_COLUMNS
+        for comment_id in range(first_id, first_id + count):
+            index = self.rng.randrange(len(goal_users))
+            created = self._created()
+            text = self._text(self.rng.randint(1, 20))
+            yield comment_id, created, created, text, first_goal + index, goal_users[index]
@@ -0,0 +1,33 @@
+import json
+import os.path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todolist.core.models import User
+from todolist.goals.importer import READERS, import_goals
+
+
+class Command(BaseCommand):
+    help = 'Import goals and comments for a user from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=list(READERS), help='Defaults to the file extension')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["username"]}" does not exist')
+
+        file_format = options['format'] or os.path.splitext(options['path'])[1].lstrip('.').lower()
+        if file_format not in READERS:
+            raise CommandError(f'Unknown format "{file_format}", pass --format')
+
+        with open(options['path'], 'rb') as stream:
+            result = import_goals(user, stream, file_format)
+
+        for error in result.errors:
+            self.stderr.write(json.dumps(error, ensure_ascii=False))
+        self.stdout.write(f'Imported {result.goals} goals and {result.comments} comments, {result.failed} rows failed')
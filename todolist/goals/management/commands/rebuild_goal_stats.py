@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from todolist.goals.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily goal statistics from the goals table, for every user or the given user ids'
+
+    def add_arguments(self, parser):
+        parser.add_argument('user_ids', nargs='*', type=int)
+
+    def handle(self, *args, **options):
+        rows = rebuild_daily_stats(options['user_ids'] or None)
+        self.stdout.write(f'{rows} daily rows written')
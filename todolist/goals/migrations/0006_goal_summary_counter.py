@@ -0,0 +1,81 @@
+# Generated by Django 4.1.13 on 2026-10-18 04:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Statement-level, so a bulk UPDATE or COPY of many goals costs one upsert per affected counter. Deltas are
+# applied in key order to keep concurrent writers from deadlocking on the counter rows.
+UPSERT = """
+    INSERT INTO goals_goalsummarycounter AS counter (user_id, category_id, status, priority, count)
+    SELECT user_id, category_id, status, priority, sum(delta)
+    FROM ({changes}) AS changes
+    GROUP BY user_id, category_id, status, priority
+    HAVING sum(delta) <> 0
+    ORDER BY user_id, category_id, status, priority
+    ON CONFLICT ON CONSTRAINT goal_summary_counter_key DO UPDATE SET count = counter.count + EXCLUDED.count
+"""
+ADDED = 'SELECT user_id, category_id, status, priority, 1 AS delta FROM new_rows'
+REMOVED = 'SELECT user_id, category_id, status, priority, -1 AS delta FROM old_rows'
+TRIGGERS = {
+    'insert': ('REFERENCING NEW TABLE AS new_rows', ADDED),
+    'update': ('REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows', f'{ADDED} UNION ALL {REMOVED}'),
+    'delete': ('REFERENCING OLD TABLE AS old_rows', REMOVED),
+}
+
+CREATE_TRIGGERS = ''.join(
+    f"""
+CREATE FUNCTION goals_goal_summary_{event}() RETURNS trigger AS $$
+BEGIN
+    {UPSERT.format(changes=changes).strip()};
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_summary_{event}
+    AFTER {event.upper()} ON goals_goal {transitions}
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goal_summary_{event}();
+"""
+    for event, (transitions, changes) in TRIGGERS.items()
+)
+
+DROP_TRIGGERS = ''.join(
+    f"""
+DROP TRIGGER goals_goal_summary_{event} ON goals_goal;
+DROP FUNCTION goals_goal_summary_{event}();
+"""
+    for event in TRIGGERS
+)
+
+# Writers wait for the backfill instead of being counted twice or not at all
+BACKFILL = """
+LOCK TABLE goals_goal IN SHARE ROW EXCLUSIVE MODE;
+""" + UPSERT.format(changes='SELECT user_id, category_id, status, priority, 1 AS delta FROM goals_goal')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0005_title_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalSummaryCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'К выполнению'), (2, 'В процессе'), (3, 'Выполнено'), (4, 'Архив')])),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'Низкий'), (2, 'Средний'), (3, 'Высокий'), (4, 'Критический')])),
+                ('count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='goals.goalcategory')),
+                ('user', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='goalsummarycounter',
+            constraint=models.UniqueConstraint(fields=('user', 'category', 'status', 'priority'), name='goal_summary_counter_key'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.1.13 on 2026-10-18 04:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Days are local to TIME_ZONE as of the migration, passed to the trigger functions as their argument.
+# Goals inserted as done count as completed on the day they were created; status 3 is Goal.Status.done.
+UPSERT = """
+    INSERT INTO goals_goaldailystat AS stat (user_id, day, goals_created, goals_completed)
+    {changes}
+    ORDER BY 1, 2
+    ON CONFLICT ON CONSTRAINT goal_daily_stat_key DO UPDATE SET
+        goals_created = stat.goals_created + EXCLUDED.goals_created,
+        goals_completed = stat.goals_completed + EXCLUDED.goals_completed
+"""
+INSERTED = """
+    SELECT user_id, (created AT TIME ZONE TG_ARGV[0])::date, count(*), count(*) FILTER (WHERE status = 3)
+    FROM new_rows
+    GROUP BY 1, 2
+"""
+COMPLETED = """
+    SELECT new_rows.user_id, (new_rows.updated AT TIME ZONE TG_ARGV[0])::date, 0, count(*)
+    FROM new_rows JOIN old_rows USING (id)
+    WHERE new_rows.status = 3 AND old_rows.status <> 3
+    GROUP BY 1, 2
+"""
+TRIGGERS = {
+    'insert': ('REFERENCING NEW TABLE AS new_rows', INSERTED),
+    'update': ('REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows', COMPLETED),
+}
+
+
+def create_triggers(apps, schema_editor):
+    for event, (transitions, changes) in TRIGGERS.items():
+        schema_editor.execute(f"""
+CREATE FUNCTION goals_goal_daily_stat_{event}() RETURNS trigger AS $$
+BEGIN
+    {UPSERT.format(changes=changes).strip()};
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_daily_stat_{event}
+    AFTER {event.upper()} ON goals_goal {transitions}
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goal_daily_stat_{event}(%s);
+""", [settings.TIME_ZONE])
+
+
+def drop_triggers(apps, schema_editor):
+    for event in TRIGGERS:
+        schema_editor.execute(f"""
+DROP TRIGGER goals_goal_daily_stat_{event} ON goals_goal;
+DROP FUNCTION goals_goal_daily_stat_{event}();
+""")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0006_goal_summary_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('goals_created', models.IntegerField(default=0)),
+                ('goals_completed', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='goaldailystat',
+            constraint=models.UniqueConstraint(fields=('user', 'day'), name='goal_daily_stat_key'),
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
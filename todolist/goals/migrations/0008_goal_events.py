@@ -0,0 +1,76 @@
+from django.db import migrations
+
+# One notification per (owner, action) and chunk of ids, sent by Postgres when the writing transaction commits.
+# Payloads are limited to 8000 bytes, hence the chunks.
+NOTIFY = """
+    PERFORM pg_notify('goal_events', json_build_object(
+        'user', user_id, 'type', '{kind}', 'action', action, 'ids', json_agg(id ORDER BY id)
+    )::text)
+    FROM (
+        SELECT user_id, action, id, (row_number() OVER (PARTITION BY user_id, action ORDER BY id) - 1) / 200 AS chunk
+        FROM ({changes}) AS changes
+    ) AS numbered
+    GROUP BY user_id, action, chunk
+"""
+CREATED = "SELECT user_id, id, 'created' AS action FROM new_rows"
+DELETED = "SELECT user_id, id, 'deleted' AS action FROM old_rows"
+UPDATED = """
+    SELECT new_rows.user_id, new_rows.id, CASE WHEN {became} THEN '{action}' ELSE 'updated' END AS action
+    FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+"""
+TABLES = {
+    'goal': ('goals_goal', UPDATED.format(became='new_rows.status = 4 AND old_rows.status <> 4', action='archived')),
+    # Deleting a category through the API only flags it
+    'category': ('goals_goalcategory', UPDATED.format(
+        became='new_rows.is_deleted AND NOT old_rows.is_deleted', action='deleted',
+    )),
+    'comment': ('goals_goalcomment', UPDATED.format(became='false', action='updated')),
+}
+
+
+def _triggers(kind: str):
+    table, updated = TABLES[kind]
+    return table, {
+        'insert': ('REFERENCING NEW TABLE AS new_rows', CREATED),
+        'update': ('REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows', updated.strip()),
+        'delete': ('REFERENCING OLD TABLE AS old_rows', DELETED),
+    }
+
+
+CREATE_TRIGGERS = ''.join(
+    f"""
+CREATE FUNCTION {table}_events_{event}() RETURNS trigger AS $$
+BEGIN
+    {NOTIFY.format(kind=kind, changes=changes).strip()};
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER {table}_events_{event}
+    AFTER {event.upper()} ON {table} {transitions}
+    FOR EACH STATEMENT EXECUTE FUNCTION {table}_events_{event}();
+"""
+    for kind in TABLES
+    for table, triggers in [_triggers(kind)]
+    for event, (transitions, changes) in triggers.items()
+)
+
+DROP_TRIGGERS = ''.join(
+    f"""
+DROP TRIGGER {table}_events_{event} ON {table};
+DROP FUNCTION {table}_events_{event}();
+"""
+    for table, _ in TABLES.values()
+    for event in ('insert', 'update', 'delete')
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0007_goal_daily_stat'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 4.1.13 on 2026-10-18 04:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# One row per object, stamped with the writing transaction; rows of deleted objects stay behind as tombstones.
+# Upserts go in key order to keep concurrent writers from deadlocking on the change rows.
+UPSERT = """
+    INSERT INTO goals_goalchange AS change (user_id, kind, object_id, xact_id)
+    SELECT user_id, {kind}, id, txid_current() FROM {rows}
+    ORDER BY id
+    ON CONFLICT ON CONSTRAINT goal_change_key DO UPDATE SET user_id = EXCLUDED.user_id, xact_id = EXCLUDED.xact_id
+"""
+TABLES = {'goals_goalcategory': 1, 'goals_goal': 2, 'goals_goalcomment': 3}
+TRIGGERS = {
+    'insert': ('REFERENCING NEW TABLE AS new_rows', 'new_rows'),
+    'update': ('REFERENCING NEW TABLE AS new_rows', 'new_rows'),
+    'delete': ('REFERENCING OLD TABLE AS old_rows', 'old_rows'),
+}
+
+# Categories and comments embed their author's profile
+PROFILE_CHANGED = """
+CREATE FUNCTION goals_change_profile() RETURNS trigger AS $$
+BEGIN
+    UPDATE goals_goalchange SET xact_id = txid_current()
+    WHERE kind IN (1, 3) AND user_id IN (
+        SELECT new_rows.id FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+        WHERE (new_rows.username, new_rows.first_name, new_rows.last_name, new_rows.email)
+            IS DISTINCT FROM (old_rows.username, old_rows.first_name, old_rows.last_name, old_rows.email)
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_change_profile
+    AFTER UPDATE ON core_user REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_change_profile();
+"""
+
+CREATE_TRIGGERS = ''.join(
+    f"""
+CREATE FUNCTION {table}_change_{event}() RETURNS trigger AS $$
+BEGIN
+    {UPSERT.format(kind=kind, rows=rows).strip()};
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER {table}_change_{event}
+    AFTER {event.upper()} ON {table} {transitions}
+    FOR EACH STATEMENT EXECUTE FUNCTION {table}_change_{event}();
+"""
+    for table, kind in TABLES.items()
+    for event, (transitions, rows) in TRIGGERS.items()
+) + PROFILE_CHANGED
+
+DROP_TRIGGERS = ''.join(
+    f"""
+DROP TRIGGER {table}_change_{event} ON {table};
+DROP FUNCTION {table}_change_{event}();
+"""
+    for table in TABLES
+    for event in TRIGGERS
+) + """
+DROP TRIGGER goals_change_profile ON core_user;
+DROP FUNCTION goals_change_profile();
+"""
+
+# Writers wait for the backfill instead of being recorded twice or not at all
+BACKFILL = f"""
+LOCK TABLE {', '.join(TABLES)} IN SHARE ROW EXCLUSIVE MODE;
+""" + ';'.join(UPSERT.format(kind=kind, rows=table) for table, kind in TABLES.items())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0008_goal_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Категория'), (2, 'Цель'), (3, 'Комментарий')])),
+                ('object_id', models.BigIntegerField()),
+                ('xact_id', models.BigIntegerField()),
+                ('user', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='goalchange',
+            index=models.Index(fields=['user', 'xact_id', 'kind', 'object_id'], name='goal_change_sync_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='goalchange',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='goal_change_key'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 
 from todolist.core.models import User
 
@@ -19,6 +22,19 @@ class GoalCategory(BaseModel):
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(
+                fields=('user', 'title', 'id'),
+                condition=models.Q(is_deleted=False),
+                name='category_user_title_idx',
+            ),
+            models.Index(
+                fields=('user', 'created', 'id'),
+                condition=models.Q(is_deleted=False),
+                name='category_user_created_idx',
+            ),
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='category_title_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -57,10 +73,32 @@ class Goal(BaseModel):
     )
     due_date = models.DateTimeField(verbose_name='Дедлайн', null=True, blank=True)
     user = models.ForeignKey(User, on_delete=models.PROTECT, verbose_name='Автор', related_name='goals')
+    # Maintained by the goals_goal_search_vector trigger from title and description
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = 'Цель'
         verbose_name_plural = 'Цели'
+        # Partial on ~Q(status=Status.archived): the nested Meta can't see the enclosing class namespace
+        indexes = [
+            models.Index(
+                fields=('user', 'title', 'id'),
+                condition=~models.Q(status=4),
+                name='goal_user_title_idx',
+            ),
+            models.Index(
+                fields=('user', 'created', 'id'),
+                condition=~models.Q(status=4),
+                name='goal_user_created_idx',
+            ),
+            models.Index(
+                fields=('user', 'due_date'),
+                condition=~models.Q(status=4),
+                name='goal_user_due_date_idx',
+            ),
+            GinIndex(fields=('search_vector',), name='goal_search_vector_idx'),
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='goal_title_trgm_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -74,6 +112,82 @@ class GoalComment(BaseModel):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=('user', '-created', '-id'), name='comment_user_created_idx'),
+            models.Index(fields=('user', 'goal', '-created', '-id'), name='comment_user_goal_created_idx'),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class GoalSummaryCounter(models.Model):
+    """Number of goals per (user, category, status, priority), maintained by the goals_goal_summary triggers."""
+    # Zeroed rows may outlive their category or user, so there are no FK constraints; the unique key indexes user
+    user = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+',
+    )
+    category = models.ForeignKey(
+        GoalCategory, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+',
+    )
+    status = models.PositiveSmallIntegerField(choices=Goal.Status.choices)
+    priority = models.PositiveSmallIntegerField(choices=Goal.Priority.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'category', 'status', 'priority'),
+                name='goal_summary_counter_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}/{self.category_id}/{self.status}/{self.priority}: {self.count}'
+
+
+class GoalDailyStat(models.Model):
+    """
+    Goals a user created and moved to done per local day, maintained by the goals_goal_daily_stat triggers.
+    Completions are events: reopening a done goal does not take its completion back.
+    """
+    user = models.ForeignKey(User, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+')
+    day = models.DateField()
+    goals_created = models.IntegerField(default=0)
+    goals_completed = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('user', 'day'), name='goal_daily_stat_key'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}/{self.day}: {self.goals_created} created, {self.goals_completed} completed'
+
+
+class GoalChange(models.Model):
+    """
+    The last change to every category, goal and comment, deleted ones included, maintained by the
+    goals_change triggers for delta sync (todolist.goals.sync).
+    """
+    class Kind(models.IntegerChoices):
+        category = 1, 'Категория'
+        goal = 2, 'Цель'
+        comment = 3, 'Комментарий'
+
+    user = models.ForeignKey(User, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+')
+    kind = models.PositiveSmallIntegerField(choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    # txid_current() of the last writing transaction
+    xact_id = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('kind', 'object_id'), name='goal_change_key'),
+        ]
+        indexes = [
+            models.Index(fields=('user', 'xact_id', 'kind', 'object_id'), name='goal_change_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} {self.object_id} @ {self.xact_id}'
@@ -0,0 +1,173 @@
+import datetime
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+
+
+def seek(ordering, position) -> Q:
+    """
+    Rows strictly after ``position`` in ``ordering``: ``(a > x) OR (a = x AND b > y) OR ...``
+    guarded with ``a >= x`` so the planner can use the leading column as an index range bound.
+    """
+    conditions = []
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        equal = {prev.lstrip('-'): value for prev, value in zip(ordering[:index], position)}
+        conditions.append(Q(**equal, **{f'{name}__{lookup}': position[index]}))
+
+    first = ordering[0]
+    bound = Q(**{first.lstrip('-') + ('__lte' if first.startswith('-') else '__gte'): position[0]})
+    return bound & reduce(or_, conditions)
+
+
+class KeysetPagination(pagination.CursorPagination):
+    """
+    Cursor pagination that seeks by the full ordering tuple instead of DRF's position + offset pair,
+    so every page is a single index range scan no matter how deep the client scrolled.
+    """
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+    tiebreaker = 'id'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (queryset := self._page_queryset(queryset, request, view)) is None:
+            return None
+        return self._set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if (queryset := self._page_queryset(queryset, request, view)) is None:
+            return None
+        return self._set_page([row async for row in queryset])
+
+    def _page_queryset(self, queryset, request, view):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        self.reverse = bool(self.cursor and self.cursor.reverse)
+        self.position = self.cursor.position if self.cursor else None
+        ordering = pagination._reverse_ordering(self.ordering) if self.reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(seek(ordering, self.position))
+        return queryset[:self.page_size + 1]
+
+    def _set_page(self, results: list) -> list:
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if self.reverse:
+            self.page.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = has_more if self.reverse else self.position is not None
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        if any(field.lstrip('-') in queryset.query.annotations for field in queryset.query.order_by):
+            # Ordered by a filter on an annotation, e.g. GoalSearchFilter's rank, which the ordering fields can't do
+            ordering = tuple(queryset.query.order_by)
+        else:
+            ordering = super().get_ordering(request, queryset, view)
+        if not any(field.lstrip('-') in (self.tiebreaker, 'pk') for field in ordering):
+            direction = '-' if ordering[-1].startswith('-') else ''
+            ordering += (direction + self.tiebreaker,)
+        return ordering
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+
+        # Minted for this ordering, with values its fields accept: anything else would fail in the query
+        try:
+            ordering, values = json.loads(cursor.position)
+            if ordering != list(self.ordering) or not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            position = [self._field(name.lstrip('-')).to_python(value) for name, value in zip(ordering, values)]
+        except (ValueError, TypeError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor._replace(position=position)
+
+    def _field(self, name: str):
+        if name in self.annotations:
+            return self.annotations[name].output_field
+        return self.model._meta.pk if name == 'pk' else self.model._meta.get_field(name)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering) if self.page else None
+        return self.encode_cursor(pagination.Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering) if self.page else None
+        return self.encode_cursor(pagination.Cursor(offset=0, reverse=True, position=position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            field = field.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[field]
+            else:
+                value = instance.pk if field == 'pk' else instance.serializable_value(field)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            values.append(value)
+        return json.dumps([list(ordering), values])
+
+
+class GoalsPagination(pagination.LimitOffsetPagination):
+    """
+    Limit/offset by default, keyset pagination once the client sends ``?cursor=`` (empty for the first page).
+    """
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() with the count and the page read by the async ORM."""
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        self.request = request
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return [row async for row in queryset[self.offset:self.offset + self.limit]]
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,25 @@
+import datetime
+import io
+from typing import Iterable
+
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def copy_value(value) -> str:
+    """Encodes a value for COPY's text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, int):
+        return str(int(value))
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value.translate(COPY_ESCAPES)
+
+
+def copy_rows(cursor, table: str, columns: Iterable[str], rows: Iterable[tuple]) -> None:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(map(copy_value, row)))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(f'COPY {table} ({", ".join(columns)}) FROM STDIN', buffer)
@@ -0,0 +1,147 @@
+from functools import lru_cache
+from typing import Callable, Iterable, Type
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation() is a no-op for the Python value a database column already comes back as
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.EmailField,
+    serializers.IntegerField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+class _Strftime:
+    """DateTimeField.to_representation() with the format and timezone looked up once per page."""
+
+    def __init__(self, field: serializers.DateTimeField, output_format: str):
+        self.field = field
+        self.output_format = output_format
+
+    def bind(self) -> Callable:
+        field_timezone = getattr(self.field, 'timezone', None) or self.field.default_timezone()
+        output_format = self.output_format
+        if field_timezone is None:
+            return self.field.to_representation
+        return lambda value: value.astimezone(field_timezone).strftime(output_format)
+
+
+class ValuesReader:
+    """
+    Produces the same output as ``serializer_class(many=True).data`` from ``QuerySet.values()`` rows,
+    without building model instances or walking the serializer's fields for every row.
+    Nested serializers are read through ``__`` lookups, e.g. ``user__username``.
+    """
+
+    def __init__(self, serializer_class: Type[serializers.Serializer]):
+        self.columns: list[str] = []
+        self.plan = self._compile(serializer_class(), prefix='')
+
+    def _compile(self, serializer: serializers.Serializer, prefix: str) -> list[tuple]:
+        plan = []
+        for field in serializer._readable_fields:
+            if field.source == '*' or isinstance(field, (
+                serializers.ListSerializer, serializers.SerializerMethodField, relations.ManyRelatedField
+            )):
+                raise ImproperlyConfigured(
+                    f'{type(serializer).__name__}.{field.field_name} cannot be read from values() rows'
+                )
+
+            column = prefix + '__'.join(field.source_attrs)
+            if isinstance(field, serializers.Serializer):
+                plan.append((field.field_name, None, self._compile(field, column + '__')))
+                continue
+
+            self.columns.append(column)
+            if type(field) in IDENTITY_FIELDS:
+                converter = None
+            elif isinstance(field, serializers.DateTimeField) and (
+                output_format := getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            ) and output_format.lower() != ISO_8601:
+                converter = _Strftime(field, output_format)
+            else:
+                converter = field.to_representation
+            plan.append((field.field_name, column, converter))
+        return plan
+
+    @classmethod
+    def _bind(cls, plan: list[tuple]) -> list[tuple]:
+        bound = []
+        for name, column, converter in plan:
+            if column is None:
+                converter = cls._bind(converter)
+            elif isinstance(converter, _Strftime):
+                converter = converter.bind()
+            bound.append((name, column, converter))
+        return bound
+
+    @classmethod
+    def _render_row(cls, plan: list[tuple], row: dict) -> dict:
+        data = {}
+        for name, column, converter in plan:
+            if column is None:
+                data[name] = cls._render_row(converter, row)
+            elif converter is None or (value := row[column]) is None:
+                data[name] = row[column]
+            else:
+                data[name] = converter(value)
+        return data
+
+    def render(self, rows: Iterable[dict]) -> list[dict]:
+        plan = self._bind(self.plan)
+        return [self._render_row(plan, row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def get_reader(serializer_class: Type[serializers.Serializer]) -> ValuesReader:
+    return ValuesReader(serializer_class)
+
+
+def render_many(serializer_class: Type[serializers.Serializer], queryset) -> list:
+    """``serializer_class(queryset, many=True).data``, through a ValuesReader unless FAST_LIST_SERIALIZERS is off."""
+    if not settings.FAST_LIST_SERIALIZERS:
+        return serializer_class(queryset, many=True).data
+    reader = get_reader(serializer_class)
+    return reader.render(queryset.values(*reader.columns))
+
+
+class ValuesListMixin:
+    """
+    List views render pages with a ValuesReader instead of the serializer, unless FAST_LIST_SERIALIZERS is off.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_SERIALIZERS:
+            return super().list(request, *args, **kwargs)
+
+        reader = get_reader(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset())
+        # Selected annotations (e.g. search rank) stay available to keyset pagination
+        queryset = queryset.values(*reader.columns, *queryset.query.annotation_select)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(reader.render(page))
+        return Response(reader.render(queryset))
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset()
+        if settings.FAST_LIST_SERIALIZERS:
+            reader = get_reader(self.get_serializer_class())
+            queryset = queryset.values(*reader.columns, *queryset.query.annotation_select)
+            render = reader.render
+        else:
+            def render(instances):
+                return self.get_serializer(instances, many=True).data
+
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        if page is not None:
+            return self.get_paginated_response(render(page))
+        return Response(render([row async for row in queryset]))
@@ -1,9 +1,14 @@
+import datetime
 from typing import Type
 
+from django.utils import timezone
 from rest_framework import exceptions, serializers
+from rest_framework.exceptions import ValidationError
 
 from todolist.core.serializers import ProfileSerializer
 from todolist.goals.models import Goal, GoalCategory, GoalComment
+from todolist.goals.stats import PERIODS
+from todolist.goals.sync import SyncCursor
 
 
 class GoalCategoryCreateSerializer(serializers.ModelSerializer):
@@ -35,7 +40,7 @@ class GoalCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Goal
-        fields = '__all__'
+        exclude = ('search_vector',)
         read_only_fields = ('id', 'created', 'updated', 'user')
 
     def validate_category(self, value: Type[GoalCategory]):
@@ -47,7 +52,7 @@ class GoalCreateSerializer(serializers.ModelSerializer):
 class GoalSerializer(serializers.ModelSerializer):
     class Meta:
         model = Goal
-        fields = '__all__'
+        exclude = ('search_vector',)
         read_only_fields = ('id', 'created', 'updated', 'user')
 
     def validate_category(self, value: GoalCategory):
@@ -56,6 +61,55 @@ class GoalSerializer(serializers.ModelSerializer):
         return value
 
 
+class GoalBulkItemSerializer(serializers.ModelSerializer):
+    ACTIONS = ('create', 'update', 'archive')
+
+    action = serializers.ChoiceField(choices=ACTIONS)
+    id = serializers.IntegerField(required=False)
+    # Ownership is checked for the whole batch at once by the view
+    category = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Goal
+        fields = ('action', 'id', 'title', 'description', 'category', 'status', 'priority', 'due_date')
+        extra_kwargs = {'title': {'required': False}}
+
+    def validate(self, attrs: dict) -> dict:
+        required = ('title', 'category') if attrs['action'] == 'create' else ('id',)
+        if missing := [field for field in required if field not in attrs]:
+            raise ValidationError({field: self.error_messages['required'] for field in missing})
+        if attrs['action'] == 'create' and 'id' in attrs:
+            raise ValidationError({'id': 'Must not be set when creating a goal.'})
+        return attrs
+
+
+class GoalStatsQuerySerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=list(PERIODS), default='day')
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        default_span, max_span = PERIODS[attrs['period']]
+        attrs.setdefault('date_to', timezone.localdate())
+        attrs.setdefault('date_from', attrs['date_to'] - datetime.timedelta(days=default_span))
+        if attrs['date_from'] > attrs['date_to']:
+            raise ValidationError({'date_from': 'Must not be after date_to.'})
+        if (attrs['date_to'] - attrs['date_from']).days > max_span:
+            raise ValidationError({'date_from': f'At most {max_span} days per {attrs["period"]} series.'})
+        return attrs
+
+
+class GoalSyncQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False, allow_blank=True, default='')
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=500)
+
+    def validate_cursor(self, value: str) -> SyncCursor:
+        try:
+            return SyncCursor.decode(value)
+        except ValueError:
+            raise ValidationError('Invalid cursor.')
+
+
 class GoalCommentCreateSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from todolist.core.models import User
+from todolist.goals.cache import invalidate_user_cache
+from todolist.goals.models import Goal, GoalCategory, GoalComment
+
+
+@receiver([post_save, post_delete], sender=GoalCategory)
+@receiver([post_save, post_delete], sender=Goal)
+@receiver([post_save, post_delete], sender=GoalComment)
+def invalidate_owner_cache(sender, instance, **kwargs):
+    invalidate_user_cache(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_cache(sender, instance: User, **kwargs):
+    # Category and comment lists embed the author's profile
+    invalidate_user_cache(instance.id)
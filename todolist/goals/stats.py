@@ -0,0 +1,77 @@
+import datetime
+from collections import defaultdict
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from todolist.goals.models import Goal, GoalDailyStat
+
+# Default and maximum span of a series, in days
+PERIODS = {
+    'day': (29, 366),
+    'week': (7 * 12 - 1, 366 * 3),
+    'month': (365, 366 * 10),
+}
+
+REBUILD = """
+INSERT INTO goals_goaldailystat (user_id, day, goals_created, goals_completed)
+SELECT user_id, day, sum(goals_created), sum(goals_completed)
+FROM (
+    SELECT user_id, (created AT TIME ZONE %(timezone)s)::date AS day, 1 AS goals_created, 0 AS goals_completed
+    FROM goals_goal {where}
+    UNION ALL
+    SELECT user_id, (updated AT TIME ZONE %(timezone)s)::date, 0, 1
+    FROM goals_goal {where} {conjunction} status = %(done)s
+) AS events
+GROUP BY user_id, day
+"""
+
+
+def rebuild_daily_stats(user_ids: Iterable[int] | None = None) -> int:
+    """
+    Recomputes the rollup from goals_goal and returns the number of rows written. History is not kept, so
+    a goal that is done now counts as completed on the day it was last updated.
+    """
+    where, conjunction = ('WHERE user_id = ANY(%(user_ids)s)', 'AND') if user_ids is not None else ('', 'WHERE')
+    params = {'timezone': settings.TIME_ZONE, 'done': Goal.Status.done, 'user_ids': list(user_ids or ())}
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Writers wait instead of being counted twice or not at all
+        cursor.execute('LOCK TABLE goals_goal IN SHARE ROW EXCLUSIVE MODE')
+        cursor.execute(f'DELETE FROM goals_goaldailystat {where}', params)
+        cursor.execute(REBUILD.format(where=where, conjunction=conjunction), params)
+        return cursor.rowcount
+
+
+def bucket(day: datetime.date, period: str) -> datetime.date:
+    if period == 'week':
+        return day - datetime.timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _next(start: datetime.date, period: str) -> datetime.date:
+    if period == 'month':
+        return (start + datetime.timedelta(days=32)).replace(day=1)
+    return start + datetime.timedelta(days=7 if period == 'week' else 1)
+
+
+def series(user_id: int, period: str, date_from: datetime.date, date_to: datetime.date) -> list[dict]:
+    """Created and completed goals per day, week (from Monday) or month, with empty buckets filled in."""
+    totals: dict[datetime.date, list[int]] = defaultdict(lambda: [0, 0])
+    rows = GoalDailyStat.objects.filter(user_id=user_id, day__range=(date_from, date_to)).values_list(
+        'day', 'goals_created', 'goals_completed',
+    )
+    for day, created, completed in rows:
+        total = totals[bucket(day, period)]
+        total[0] += created
+        total[1] += completed
+
+    result = []
+    start = bucket(date_from, period)
+    while start <= date_to:
+        created, completed = totals.get(start, (0, 0))
+        result.append({'date': start, 'created': created, 'completed': completed})
+        start = _next(start, period)
+    return result
@@ -0,0 +1,80 @@
+"""
+Delta sync for offline clients: the categories, goals and comments changed since a cursor, and tombstones for
+those deleted, archived or otherwise gone from the lists since.
+
+Changes are read from GoalChange, where triggers stamp every written object with the writing transaction's
+txid_current(). The cursor is a transaction id rather than an ``updated`` time: ``updated`` is set when a row
+is written, not when it commits, so a slow transaction could commit behind a cursor that already passed it.
+A pass hands out as its successor the oldest transaction still running when it began, so whatever commits
+later is in the next pass. Changes may be sent twice, but never missed.
+"""
+import base64
+import json
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.db import connection
+
+from todolist.goals.models import GoalChange
+from todolist.goals.pagination import seek
+
+ORDERING = ('xact_id', 'kind', 'object_id')
+
+
+class SyncCursor(NamedTuple):
+    # Changes of this transaction and later ones are in the pass, 0 for a full sync
+    since: int = 0
+    # Where the next pass starts, fixed by the first page of a paged pass
+    until: int | None = None
+    # Position of the last change handed out, while a pass is paged
+    after: tuple[int, int, int] | None = None
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(json.dumps(self).encode()).decode()
+
+    @classmethod
+    def decode(cls, value: str) -> 'SyncCursor':
+        if not value:
+            return cls()
+        try:
+            # binascii.Error and JSONDecodeError are ValueErrors
+            since, until, after = json.loads(base64.urlsafe_b64decode(value.encode()))
+        except (ValueError, TypeError):
+            raise ValueError('Invalid cursor')
+        if not isinstance(since, int) or not (until is None or isinstance(until, int)) or not (
+            after is None or isinstance(after, list) and len(after) == 3 and all(isinstance(v, int) for v in after)
+        ):
+            raise ValueError('Invalid cursor')
+        return cls(since, until, tuple(after) if after else None)
+
+
+class SyncPage(NamedTuple):
+    # Ids of the changed objects per GoalChange.Kind
+    changes: dict[int, list[int]]
+    cursor: SyncCursor
+    has_more: bool
+
+
+def changes(user_id: int, cursor: SyncCursor, limit: int) -> SyncPage:
+    if (until := cursor.until) is None:
+        # Taken before reading the changes: anything committing from here on has a transaction id >= until
+        with connection.cursor() as db:
+            db.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+            (until,) = db.fetchone()
+
+    queryset = GoalChange.objects.filter(user_id=user_id, xact_id__gte=cursor.since)
+    if cursor.after is not None:
+        queryset = queryset.filter(seek(ORDERING, cursor.after))
+    rows = list(queryset.order_by(*ORDERING).values_list(*ORDERING)[:limit + 1])
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    ids = defaultdict(list)
+    for _, kind, object_id in rows:
+        ids[kind].append(object_id)
+
+    if has_more:
+        next_cursor = SyncCursor(cursor.since, until, rows[-1])
+    else:
+        next_cursor = SyncCursor(until)
+    return SyncPage(dict(ids), next_cursor, has_more)
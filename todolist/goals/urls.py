@@ -5,13 +5,22 @@ from todolist.goals import views
 urlpatterns = [
     path('goal_category/create', views.GoalCategoryCreateView.as_view(), name='create-category'),
     path('goal_category/list', views.GoalCategoryListView.as_view(), name='list-categories'),
+    path('goal_category/autocomplete', views.GoalCategoryAutocompleteView.as_view(), name='autocomplete-categories'),
     path('goal_category/<pk>', views.GoalCategoryView.as_view(), name='retrieve-update-destroy-category'),
 
     path('goal/create', views.GoalCreateView.as_view(), name='create-goal'),
     path('goal/list', views.GoalListView.as_view(), name='list-goals'),
+    path('goal/autocomplete', views.GoalAutocompleteView.as_view(), name='autocomplete-goals'),
+    path('goal/bulk', views.GoalBulkView.as_view(), name='bulk-goals'),
+    path('goal/summary', views.GoalSummaryView.as_view(), name='summary-goals'),
+    path('goal/stats', views.GoalStatsView.as_view(), name='stats-goals'),
+    path('goal/sync', views.GoalSyncView.as_view(), name='sync-goals'),
+    path('goal/import', views.GoalImportView.as_view(), name='import-goals'),
     path('goal/<pk>', views.GoalView.as_view(), name='retrieve-update-destroy-goal'),
 
     path('goal_comment/create', views.GoalCommentCreateView.as_view(), name='create-comment'),
     path('goal_comment/list', views.GoalCommentListView.as_view(), name='list-comment'),
     path('goal_comment/<pk>', views.GoalCommentView.as_view(), name='retrieve-update-destroy-comment'),
+
+    path('export.<str:export_format>', views.ExportView.as_view(), name='export'),
 ]
@@ -1,15 +1,41 @@
-from django.db import transaction
-from django.db.models import Q
+import os.path
+from collections import defaultdict
+from dataclasses import asdict
+
+from asgiref.sync import sync_to_async
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections, transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Upper
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics, permissions
+from rest_framework import filters, generics, permissions, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 
-from todolist.goals.filters import GoalDateFilter
-from todolist.goals.models import Goal, GoalCategory, GoalComment
+from todolist.asyncviews import (
+    AsyncAPIView, AsyncListMixin, AsyncRetrieveMixin, AsyncStreamingResponse, EventStreamRenderer, EventStreamResponse,
+)
+from todolist.db.replicas import read_from_primary
+from todolist.goals.cache import CachedListMixin, invalidate_user_cache
+from todolist.goals.conditional import ConditionalListMixin, ConditionalRetrieveMixin, make_validators, profile_fields
+from todolist.goals.events import event_stream
+from todolist.goals.export import FORMATS as EXPORT_FORMATS
+from todolist.goals.filters import GoalDateFilter, GoalSearchFilter
+from todolist.goals.importer import READERS as IMPORT_FORMATS, import_goals
+from todolist.goals.models import Goal, GoalCategory, GoalChange, GoalComment, GoalSummaryCounter
+from todolist.goals.pagination import GoalsPagination
 from todolist.goals.permissions import IsOwnerOrReadOnly
+from todolist.goals.readers import ValuesListMixin, render_many
 from todolist.goals.serializers import (
-    GoalCategoryCreateSerializer, GoalCategorySerializer, GoalCommentCreateSerializer, GoalCommentSerializer,
-    GoalCreateSerializer, GoalSerializer,
+    GoalBulkItemSerializer, GoalCategoryCreateSerializer, GoalCategorySerializer, GoalCommentCreateSerializer,
+    GoalCommentSerializer, GoalCreateSerializer, GoalSerializer, GoalStatsQuerySerializer, GoalSyncQuerySerializer,
 )
+from todolist.goals.stats import series
+from todolist.goals.sync import changes
 
 
 class GoalCategoryCreateView(generics.CreateAPIView):
@@ -17,10 +43,11 @@ class GoalCategoryCreateView(generics.CreateAPIView):
     serializer_class = GoalCategoryCreateSerializer
 
 
-class GoalCategoryListView(generics.ListAPIView):
+class GoalCategoryListView(CachedListMixin, ConditionalListMixin, ValuesListMixin, generics.ListAPIView):
     model = GoalCategory
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalCategorySerializer
+    pagination_class = GoalsPagination
     filter_backends = [filters.OrderingFilter, filters.SearchFilter]
     ordering_fields = ['title', 'created']
     ordering = ['title']
@@ -33,19 +60,53 @@ class GoalCategoryListView(generics.ListAPIView):
         )
 
 
-class GoalCategoryView(generics.RetrieveUpdateDestroyAPIView):
+class TitleAutocompleteView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    search_param = 'search'
+    min_length = 2
+    max_results = 10
+
+    def get(self, request, *args, **kwargs):
+        term = request.query_params.get(self.search_param, '').strip()
+        if len(term) < self.min_length:
+            return Response([])
+
+        # Both predicates are served by the gin_trgm_ops index on UPPER(title)
+        is_prefix = Q(title__istartswith=term)
+        queryset = self.get_queryset().alias(title_upper=Upper('title')).filter(
+            is_prefix | Q(title_upper__trigram_word_similar=term)
+        ).annotate(
+            is_prefix=ExpressionWrapper(is_prefix, output_field=BooleanField()),
+            similarity=TrigramWordSimilarity(term, 'title_upper'),
+        ).order_by('-is_prefix', '-similarity', 'title', 'id')
+        return Response(list(queryset.values('id', 'title')[:self.max_results]))
+
+
+class GoalCategoryAutocompleteView(TitleAutocompleteView):
+    def get_queryset(self):
+        return GoalCategory.objects.filter(user_id=self.request.user.id, is_deleted=False)
+
+
+class GoalCategoryView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     model = GoalCategory
     serializer_class = GoalCategorySerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
 
     def get_queryset(self):
-        return GoalCategory.objects.filter(is_deleted=False)
+        return GoalCategory.objects.select_related('user').filter(is_deleted=False)
+
+    def get_detail_validators(self, instance: GoalCategory) -> dict[str, str]:
+        # The embedded author's profile has no `updated` of its own, so there's no Last-Modified either
+        return make_validators(instance.pk, instance.updated, profile_fields(instance.user), last_modified=None)
 
     def perform_destroy(self, instance: GoalCategory):
         with transaction.atomic():
             instance.is_deleted = True
             instance.save(update_fields=('is_deleted',))
-            instance.goals.update(status=Goal.Status.archived)
+            # QuerySet.update() sends no signals, so the goal owners are invalidated explicitly
+            owner_ids = set(instance.goals.values_list('user_id', flat=True))
+            instance.goals.update(status=Goal.Status.archived, updated=timezone.now())
+            invalidate_user_cache(*owner_ids)
         return instance
 
 
@@ -54,15 +115,15 @@ class GoalCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class GoalListView(generics.ListAPIView):
+class GoalListView(CachedListMixin, ConditionalListMixin, ValuesListMixin, generics.ListAPIView):
     model = Goal
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalSerializer
+    pagination_class = GoalsPagination
     filterset_class = GoalDateFilter
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, GoalSearchFilter]
     ordering_fields = ['title', 'created']
     ordering = ['title']
-    search_fields = ['title', 'description']
 
     def get_queryset(self):
         return Goal.objects.filter(
@@ -70,7 +131,197 @@ class GoalListView(generics.ListAPIView):
         )
 
 
-class GoalView(generics.RetrieveUpdateAPIView):
+class GoalAutocompleteView(TitleAutocompleteView):
+    def get_queryset(self):
+        return Goal.objects.filter(
+            Q(user_id=self.request.user.id) & ~Q(status=Goal.Status.archived) & Q(category__is_deleted=False)
+        )
+
+
+class GoalBulkView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalBulkItemSerializer
+    max_items = 500
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, list) or not 0 < len(request.data) <= self.max_items:
+            raise ValidationError(f'Expected a list of 1 to {self.max_items} items.')
+
+        items = [self.get_serializer(data=item) for item in request.data]
+        valid = [item.validated_data for item in items if item.is_valid()]
+        results: list[dict] = []
+        created: list[Goal] = []
+        changed: dict[int, Goal] = {}
+        # Every goal writes only the fields its own item set, by groups of goals setting the same ones
+        updates: dict[tuple[str, ...], list[Goal]] = defaultdict(list)
+        now = timezone.now()
+
+        with transaction.atomic():
+            categories = set(GoalCategory.objects.filter(
+                id__in={data['category'] for data in valid if 'category' in data},
+                user_id=request.user.id,
+                is_deleted=False,
+            ).values_list('id', flat=True))
+            # Locked until the writes, in id order like every other batched write so concurrent batches
+            # can't deadlock: a concurrent PATCH can't be overwritten with what was read here before it
+            goals = {goal.id: goal for goal in self.get_queryset().filter(
+                id__in={data['id'] for data in valid if 'id' in data},
+            ).select_for_update(of=('self',)).order_by('id')}
+
+            for item in items:
+                if errors := item.errors or self._check_item(item.validated_data, categories, goals, changed):
+                    results.append({'errors': errors})
+                    continue
+
+                data = dict(item.validated_data)
+                action = data.pop('action')
+                if 'category' in data:
+                    data['category_id'] = data.pop('category')
+
+                if action == 'create':
+                    goal = Goal(user_id=request.user.id, **data)
+                    created.append(goal)
+                else:
+                    goal_id = data.pop('id')
+                    goal = changed[goal_id] = goals[goal_id]
+                    if action == 'archive':
+                        data = {'status': Goal.Status.archived}
+                    for field, value in data.items():
+                        setattr(goal, field, value)
+                    goal.updated = now
+                    updates[tuple(sorted({*data, 'updated'}))].append(goal)
+                results.append({'action': action, 'goal': goal})
+
+            Goal.objects.bulk_create(created)
+            for fields, group in updates.items():
+                Goal.objects.bulk_update(group, fields=fields)
+            # Bulk writes send no signals
+            invalidate_user_cache(request.user.id)
+
+        for result in results:
+            if 'goal' in result:
+                result['goal'] = GoalSerializer(result['goal']).data
+        return Response(results, status=status.HTTP_200_OK)
+
+    def get_queryset(self):
+        return Goal.objects.filter(
+            Q(user_id=self.request.user.id) & ~Q(status=Goal.Status.archived) & Q(category__is_deleted=False)
+        )
+
+    @staticmethod
+    def _check_item(data: dict, categories: set[int], goals: dict[int, Goal], changed: dict[int, Goal]) -> dict:
+        if 'category' in data and data['category'] not in categories:
+            return {'category': [f'Invalid pk "{data["category"]}" - object does not exist.']}
+        if 'id' in data and data['id'] not in goals:
+            return {'id': [f'Invalid pk "{data["id"]}" - object does not exist.']}
+        if 'id' in data and data['id'] in changed:
+            return {'id': ['Goal appears more than once in the batch.']}
+        return {}
+
+
+class GoalImportView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        if (upload := request.FILES.get('file')) is None:
+            raise ValidationError({'file': ['This field is required.']})
+        file_format = os.path.splitext(upload.name)[1].lstrip('.').lower()
+        if file_format not in IMPORT_FORMATS:
+            raise ValidationError({'file': [f'Expected one of: {", ".join(IMPORT_FORMATS)}.']})
+
+        result = import_goals(request.user, upload, file_format)
+        return Response(asdict(result), status=status.HTTP_200_OK)
+
+
+class GoalSummaryView(generics.GenericAPIView):
+    """Goal counts for a dashboard, read from the counters the goals_goal triggers keep up to date."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        counters = GoalSummaryCounter.objects.filter(
+            user_id=request.user.id, category__is_deleted=False, count__gt=0,
+        ).values_list('category_id', 'category__title', 'status', 'priority', 'count')
+
+        by_status = dict.fromkeys(Goal.Status.values, 0)
+        by_priority = dict.fromkeys(Goal.Priority.values, 0)
+        categories: dict[int, dict] = {}
+        for category_id, title, goal_status, priority, count in counters:
+            by_status[goal_status] += count
+            # Archived goals are counted by status only, like the goal list leaves them out
+            if goal_status == Goal.Status.archived:
+                continue
+            by_priority[priority] += count
+            category = categories.setdefault(category_id, {'id': category_id, 'title': title, 'count': 0})
+            category['count'] += count
+
+        return Response({
+            'total': sum(by_priority.values()),
+            'by_status': [{'status': key, 'count': value} for key, value in by_status.items()],
+            'by_priority': [{'priority': key, 'count': value} for key, value in by_priority.items()],
+            'categories': sorted(categories.values(), key=lambda category: (category['title'], category['id'])),
+        })
+
+
+class GoalStatsView(generics.GenericAPIView):
+    """Goals created and completed per day, week or month, read from the daily rollup."""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalStatsQuerySerializer
+
+    def get(self, request, *args, **kwargs):
+        query = self.get_serializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        return Response({
+            'period': params['period'],
+            'date_from': params['date_from'],
+            'date_to': params['date_to'],
+            'series': series(request.user.id, params['period'], params['date_from'], params['date_to']),
+        })
+
+
+class GoalSyncView(generics.GenericAPIView):
+    """
+    Categories, goals and comments changed since ``?cursor=``, as the list views show them, and the ids of
+    those the lists no longer show. Clients repeat with the returned cursor while ``has_more``, see todolist.goals.sync.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalSyncQuerySerializer
+
+    def get(self, request, *args, **kwargs):
+        # Cursors are transaction ids of the primary, a replica lagging behind could skip changes for good
+        with read_from_primary():
+            query = self.get_serializer(data=request.query_params)
+            query.is_valid(raise_exception=True)
+            cursor = query.validated_data['cursor']
+            page = changes(request.user.id, cursor, query.validated_data['limit'])
+
+            data = {'cursor': page.cursor.encode(), 'has_more': page.has_more}
+            deleted = {}
+            for kind, name, serializer_class in (
+                (GoalChange.Kind.category, 'categories', GoalCategorySerializer),
+                (GoalChange.Kind.goal, 'goals', GoalSerializer),
+                (GoalChange.Kind.comment, 'comments', GoalCommentSerializer),
+            ):
+                ids = page.changes.get(kind, [])
+                data[name] = render_many(serializer_class, self.get_queryset(kind).filter(id__in=ids).order_by('id'))
+                # A full sync has nothing to delete on the client
+                deleted[name] = sorted(set(ids) - {item['id'] for item in data[name]}) if cursor.since else []
+            data['deleted'] = deleted
+            return Response(data)
+
+    def get_queryset(self, kind: int = None):
+        user_id = self.request.user.id
+        if kind == GoalChange.Kind.category:
+            return GoalCategory.objects.select_related('user').filter(user_id=user_id, is_deleted=False)
+        if kind == GoalChange.Kind.goal:
+            return Goal.objects.filter(
+                Q(user_id=user_id) & ~Q(status=Goal.Status.archived) & Q(category__is_deleted=False)
+            )
+        return GoalComment.objects.select_related('user').filter(user_id=user_id)
+
+
+class GoalView(ConditionalRetrieveMixin, generics.RetrieveUpdateAPIView):
     model = Goal
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
     serializer_class = GoalSerializer
@@ -84,22 +335,83 @@ class GoalCommentCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class GoalCommentListView(generics.ListAPIView):
+class GoalCommentListView(CachedListMixin, ConditionalListMixin, ValuesListMixin, generics.ListAPIView):
     model = GoalComment
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalCommentSerializer
+    pagination_class = GoalsPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['goal']
     ordering = ['-created']
 
     def get_queryset(self):
-        return GoalComment.objects.filter(user_id=self.request.user.id)
+        return GoalComment.objects.select_related('user').filter(user_id=self.request.user.id)
 
 
-class GoalCommentView(generics.RetrieveUpdateDestroyAPIView):
+class GoalCommentView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     model = GoalComment
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
     serializer_class = GoalCommentSerializer
 
     def get_queryset(self):
-        return GoalComment.objects.filter(user_id=self.request.user.id)
+        return GoalComment.objects.select_related('user').filter(user_id=self.request.user.id)
+
+    def get_detail_validators(self, instance: GoalComment) -> dict[str, str]:
+        return make_validators(instance.pk, instance.updated, profile_fields(instance.user), last_modified=None)
+
+
+class ExportView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, export_format: str, *args, **kwargs):
+        if export_format not in EXPORT_FORMATS:
+            raise NotFound
+        stream, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(request.user), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="todolist.{export_format}"'
+        return response
+
+
+# Served instead of the views above by todolist.asgi_urls
+
+class AsyncGoalCategoryListView(AsyncAPIView, AsyncListMixin, GoalCategoryListView):
+    pass
+
+
+class AsyncGoalCategoryView(AsyncAPIView, AsyncRetrieveMixin, GoalCategoryView):
+    pass
+
+
+class AsyncGoalListView(AsyncAPIView, AsyncListMixin, GoalListView):
+    pass
+
+
+class AsyncGoalView(AsyncAPIView, AsyncRetrieveMixin, GoalView):
+    pass
+
+
+class AsyncGoalCommentListView(AsyncAPIView, AsyncListMixin, GoalCommentListView):
+    pass
+
+
+class AsyncGoalCommentView(AsyncAPIView, AsyncRetrieveMixin, GoalCommentView):
+    pass
+
+
+class AsyncExportView(AsyncAPIView, ExportView):
+
+    async def aget(self, request, *args, **kwargs):
+        # Django 4.1 iterates streaming bodies on the event loop, where the export's queries are not allowed
+        return AsyncStreamingResponse.from_streaming(self.get(request, *args, **kwargs))
+
+
+class GoalEventsView(AsyncAPIView, generics.GenericAPIView):
+    """Server-sent events for changes to the user's categories, goals and comments, see todolist.goals.events."""
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+    http_method_names = ['get', 'options']
+
+    async def aget(self, request, *args, **kwargs):
+        # Authentication was the last query, the stream must not hold on to the connection
+        await sync_to_async(connections.close_all)()
+        return EventStreamResponse(event_stream(request.user.id))
@@ -0,0 +1,198 @@
+"""
+Process-local request/DB metrics, shared between gunicorn workers through per-process JSON snapshots in
+METRICS_DIR and rendered in the Prometheus text exposition format.
+"""
+import fcntl
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from uuid import uuid4
+
+from django.conf import settings
+
+# Of a worker's snapshot: its PID and a random id, as a later worker may get the same PID
+SNAPSHOT_NAME = re.compile(r'(?P<pid>\d+)-[0-9a-f]+\.json')
+# The totals of exited workers
+EXITED = 'exited.json'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'todolist_http_requests_total': ('counter', 'Requests by route, method and status.'),
+    'todolist_http_request_duration_seconds': ('histogram', 'Time spent handling a request.'),
+    'todolist_http_response_size_bytes_total': ('counter', 'Response body bytes sent.'),
+    'todolist_db_queries_total': ('counter', 'Database queries executed while handling requests.'),
+    'todolist_db_query_duration_seconds_total': ('counter', 'Time spent in database queries.'),
+    'todolist_db_pool_wait_seconds': ('histogram', 'Time spent checking out a pooled database connection.'),
+    'todolist_db_pool_connections_opened_total': ('counter', 'Database connections opened by the pool.'),
+    'todolist_db_pool_connections_closed_total': ('counter', 'Pooled database connections closed, by reason.'),
+    'todolist_db_pool_timeouts_total': ('counter', 'Checkouts that found no free database connection in time.'),
+}
+
+
+def _empty_histogram() -> dict:
+    return {'buckets': [0] * len(DURATION_BUCKETS), 'sum': 0.0, 'count': 0}
+
+
+def _key(name: str, labels: dict[str, str]) -> str:
+    return json.dumps([name, sorted(labels.items())], ensure_ascii=False)
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flushed_at = 0.0
+        self.pid = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counters: dict[str, float] = defaultdict(float)
+            self.histograms: dict[str, dict] = {}
+
+    def inc(self, name: str, labels: dict[str, str], value: float = 1) -> None:
+        with self.lock:
+            self.counters[_key(name, labels)] += value
+
+    def observe(self, name: str, labels: dict[str, str], value: float) -> None:
+        key = _key(name, labels)
+        with self.lock:
+            histogram = self.histograms.setdefault(key, _empty_histogram())
+            if (index := bisect_left(DURATION_BUCKETS, value)) < len(DURATION_BUCKETS):
+                histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {
+                    key: dict(value, buckets=list(value['buckets'])) for key, value in self.histograms.items()
+                },
+            }
+
+    def flush(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self.flushed_at < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self.flushed_at = now
+        directory = Path(settings.METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        if self.pid != os.getpid():
+            # Also after a fork, the child must not overwrite its parent's snapshot
+            self.pid, self.name = os.getpid(), f'{os.getpid()}-{uuid4().hex}.json'
+        _write(directory / self.name, self.snapshot())
+
+
+registry = Registry()
+
+
+def _write(path: Path, data: dict) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _read(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _add(totals: dict, snapshot: dict) -> None:
+    for key, value in snapshot['counters'].items():
+        totals['counters'][key] = totals['counters'].get(key, 0) + value
+    for key, value in snapshot['histograms'].items():
+        total = totals['histograms'].setdefault(key, _empty_histogram())
+        total['buckets'] = [a + b for a, b in zip(total['buckets'], value['buckets'])]
+        total['sum'] += value['sum']
+        total['count'] += value['count']
+
+
+def _running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _fold_exited(directory: Path) -> None:
+    """Adds the snapshots of exited workers to EXITED and removes them, so the directory doesn't keep growing."""
+    exited = _read(directory / EXITED) or {'counters': {}, 'histograms': {}, 'folded': []}
+    # Folded but not removed yet, when a collect() died in between
+    folded = [path for path in directory.glob('*.json') if path.name in exited['folded']]
+    paths = [
+        path for path in directory.glob('*.json')
+        if (match := SNAPSHOT_NAME.fullmatch(path.name)) and path.name not in exited['folded']
+        and not _running(int(match['pid']))
+    ]
+    if paths:
+        for path in paths:
+            if (snapshot := _read(path)) is not None:
+                _add(exited, snapshot)
+        exited['folded'] = [path.name for path in (*folded, *paths)]
+        _write(directory / EXITED, exited)
+    for path in (*folded, *paths):
+        path.unlink(missing_ok=True)
+
+
+def collect() -> dict:
+    """Sums the snapshots of every worker that has ever served a request, those of exited ones from EXITED."""
+    registry.flush(force=True)
+    directory = Path(settings.METRICS_DIR)
+    totals = {'counters': defaultdict(float), 'histograms': {}}
+    with open(directory / '.lock', 'a') as lock:
+        # Held while reading too, so a concurrent collect() can't fold a snapshot away between the two
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        _fold_exited(directory)
+        for path in directory.glob('*.json'):
+            if (snapshot := _read(path)) is not None:
+                _add(totals, snapshot)
+    return totals
+
+
+def _labels(labels: list, **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(metrics: dict) -> str:
+    series: dict[str, list[str]] = defaultdict(list)
+    for key, value in sorted(metrics['counters'].items()):
+        name, labels = json.loads(key)
+        series[name].append(f'{name}{_labels(labels)} {_number(value)}')
+    for key, histogram in sorted(metrics['histograms'].items()):
+        name, labels = json.loads(key)
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, histogram['buckets']):
+            cumulative += count
+            series[name].append(f'{name}_bucket{_labels(labels, le=f"{bound:g}")} {cumulative}')
+        series[name].append(f'{name}_bucket{_labels(labels, le="+Inf")} {histogram["count"]}')
+        series[name].append(f'{name}_sum{_labels(labels)} {_number(histogram["sum"])}')
+        series[name].append(f'{name}_count{_labels(labels)} {histogram["count"]}')
+
+    lines = []
+    for name, samples in series.items():
+        kind, description = HELP[name]
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} {kind}', *samples]
+    return '\n'.join(lines) + '\n'
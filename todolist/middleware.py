@@ -1,8 +1,17 @@
 import logging
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.core.handlers.wsgi import WSGIRequest
-from django.db import connection, reset_queries
+from django.db import connection, connections, reset_queries
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from todolist.asyncviews import AsyncStreamingResponse, EventStreamResponse
+from todolist.metrics import registry
 
 
 class QueryDebuggerMiddleware:  # pragma: no cover
@@ -32,3 +41,117 @@ class QueryDebuggerMiddleware:  # pragma: no cover
             self.logger.debug('Estimated %.2f ms', (end - start) * 1000)
 
         return response
+
+
+class _QueryTimer:
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.duration += time.perf_counter() - start
+
+    @contextmanager
+    def installed(self):
+        for conn in connections.all(initialized_only=True):
+            _install_timed_execute(connection=conn)
+        token = _current_timer.set(self)
+        try:
+            yield
+        finally:
+            _current_timer.reset(token)
+
+
+# Connections are per thread and async views query from sync_to_async() threads, which run in a copy of
+# the request's context: so the timer is found through a context variable by a wrapper on every connection.
+_current_timer: ContextVar[Optional[_QueryTimer]] = ContextVar('query_timer', default=None)
+
+
+def _timed_execute(execute, sql, params, many, context):
+    if (timer := _current_timer.get()) is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def _install_timed_execute(sender=None, connection=None, **kwargs):
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+class MetricsMiddleware:
+    """
+    Production-safe counterpart to QueryDebuggerMiddleware: per-route latency, status, response size
+    and DB query count/time, recorded into todolist.metrics without needing DEBUG.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # A sync-only middleware would make Django run every ASGI request in a thread of its own
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timer = _QueryTimer()
+        start = time.perf_counter()
+        with timer.installed():
+            response = self.get_response(request)
+        return self._finish(request, response, timer, start)
+
+    async def __acall__(self, request):
+        timer = _QueryTimer()
+        start = time.perf_counter()
+        with timer.installed():
+            response = await self.get_response(request)
+        return self._finish(request, response, timer, start)
+
+    def _finish(self, request, response, timer: _QueryTimer, start: float):
+        if isinstance(response, EventStreamResponse):
+            # Open-ended, so the time until the stream starts is recorded
+            self._record(request, response, timer, time.perf_counter() - start, 0)
+        elif isinstance(response, AsyncStreamingResponse):
+            response.chunks = self._astream(request, response, response.chunks, timer, start)
+        elif response.streaming:
+            # Streamed bodies (e.g. exports) do their work while being consumed, so measure until the last chunk
+            response.streaming_content = self._stream(request, response, response.streaming_content, timer, start)
+        else:
+            self._record(request, response, timer, time.perf_counter() - start, len(response.content))
+        return response
+
+    def _stream(self, request, response, chunks, timer: _QueryTimer, start: float):
+        size = 0
+        with timer.installed():
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        self._record(request, response, timer, time.perf_counter() - start, size)
+
+    async def _astream(self, request, response, chunks, timer: _QueryTimer, start: float):
+        size = 0
+        with timer.installed():
+            async for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        self._record(request, response, timer, time.perf_counter() - start, size)
+
+    @staticmethod
+    def _record(request, response, timer: _QueryTimer, duration: float, size: int) -> None:
+        match = getattr(request, 'resolver_match', None)
+        # The route pattern, never the raw path, keeps label cardinality bounded
+        labels = {'route': match.route if match else 'unmatched', 'method': request.method}
+        registry.observe('todolist_http_request_duration_seconds', labels, duration)
+        registry.inc('todolist_http_requests_total', {**labels, 'status': str(response.status_code)})
+        registry.inc('todolist_http_response_size_bytes_total', labels, size)
+        registry.inc('todolist_db_queries_total', labels, timer.queries)
+        registry.inc('todolist_db_query_duration_seconds_total', labels, timer.duration)
+        registry.flush()
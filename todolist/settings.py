@@ -1,6 +1,8 @@
+import tempfile
 from pathlib import Path
 from typing import Any
 
+from django.core.exceptions import ImproperlyConfigured
 from envparse import env
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -15,6 +17,13 @@ DEBUG = env.bool('DEBUG', default=False)
 
 ALLOWED_HOSTS = env.list('ALLOWED_HOSTS', default=['*'])
 
+# 'full' serves everything; 'api' leaves out admin, OAuth and the browsable API, which a separate 'full'
+# deployment serves, so API workers boot faster and with less memory (see benchmarks/startup.py).
+# Both deployments must share the cache (CACHES): saves made through the admin invalidate cached users and lists
+APP_PROFILE = env.str('APP_PROFILE', default='full')
+if APP_PROFILE not in ('full', 'api'):
+    raise ImproperlyConfigured(f'Unknown APP_PROFILE {APP_PROFILE!r}')
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -22,6 +31,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters',
     'social_django',
@@ -30,17 +40,29 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'todolist.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'todolist.db.replicas.ReplicaMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'todolist.core.auth.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # 'todolist.middleware.QueryDebuggerMiddleware',
 ]
 
-ROOT_URLCONF = 'todolist.urls'
+if APP_PROFILE == 'api':
+    # social_django stays: sessions of users who logged in through OAuth name its backend, which needs its models
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in (
+        'django.contrib.admin', 'django.contrib.messages', 'django.contrib.staticfiles',
+    )]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in (
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )]
+
+ROOT_URLCONF = env.str('ROOT_URLCONF', default='todolist.urls')
 
 TEMPLATES = [
     {
@@ -53,23 +75,86 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
-            ],
+            ] if APP_PROFILE == 'full' else [],
         },
     },
 ]
 
 WSGI_APPLICATION = 'todolist.wsgi.application'
 
+# Connections are taken from a pool in every worker process and handed back after each request (todolist.db.pool)
+DB_POOL = env.bool('DB_POOL', default=True)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'todolist.db' if DB_POOL else 'django.db.backends.postgresql',
         'NAME': env.str('POSTGRES_DB'),
         'USER': env.str('POSTGRES_USER'),
         'PASSWORD': env.str('POSTGRES_PASSWORD'),
         'HOST': env.str('POSTGRES_HOST', default='127.0.0.1'),
         'PORT': env.int('POSTGRES_PORT', default=5432),
+        # Per process; checked out connections are pinged first unless DB_POOL_HEALTH_CHECKS is off, and a request
+        # finding none free within DB_POOL_TIMEOUT seconds fails
+        'POOL': {
+            'SIZE': env.int('DB_POOL_SIZE', default=10),
+            'MAX_LIFETIME': env.float('DB_POOL_MAX_LIFETIME', default=3600.0),
+            'IDLE_TIMEOUT': env.float('DB_POOL_IDLE_TIMEOUT', default=300.0),
+            'HEALTH_CHECKS': env.bool('DB_POOL_HEALTH_CHECKS', default=True),
+            'TIMEOUT': env.float('DB_POOL_TIMEOUT', default=5.0),
+        },
     }
 }
+# Read replicas of the database above, as host[:port]; reads of safe requests are spread over them, see
+# todolist.db.replicas. Tests read them from the primary.
+for index, replica in enumerate(env.list('POSTGRES_REPLICA_HOSTS', default=[])):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': int(port) if port else DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['todolist.db.replicas.ReplicaRouter']
+# Users read from the primary for this long after they write anything, longer than replicas lag behind
+REPLICA_PIN_SECONDS = env.float('REPLICA_PIN_SECONDS', default=5.0)
+
+CACHES = {
+    'default': {
+        'BACKEND': env.str('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        # Holds sessions and users: a directory of the app's own, created private, not one in the shared /tmp
+        'LOCATION': env.str('CACHE_LOCATION', default=str(Path.home().joinpath('.cache', 'todolist'))),
+        'OPTIONS': {
+            'MAX_ENTRIES': env.int('CACHE_MAX_ENTRIES', default=10000),
+        },
+    }
+}
+LIST_CACHE_TIMEOUT = env.int('LIST_CACHE_TIMEOUT', default=300)
+FAST_LIST_SERIALIZERS = env.bool('FAST_LIST_SERIALIZERS', default=True)
+
+# Sessions (written through to the database) and the users behind them are read from the cache, see todolist.core.auth
+CACHED_AUTH = env.bool('CACHED_AUTH', default=True)
+if CACHED_AUTH:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+USER_CACHE_TIMEOUT = env.int('USER_CACHE_TIMEOUT', default=3600)
+# Every worker writes last_login once per this many logins or seconds
+LAST_LOGIN_BATCH_SIZE = env.int('LAST_LOGIN_BATCH_SIZE', default=100)
+LAST_LOGIN_FLUSH_INTERVAL = env.float('LAST_LOGIN_FLUSH_INTERVAL', default=60.0)
+
+# Every worker writes its metrics snapshot here; the directory must be shared by all workers of one instance
+# and by no other instance, the snapshots of workers whose PID isn't running here are taken for exited ones'
+METRICS_DIR = env.str('METRICS_DIR', default=str(Path(tempfile.gettempdir(), 'todolist-metrics')))
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=1.0)
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1'])
+
+# Workers build URL resolvers, serializers, validators etc. when they boot rather than on their first request
+WARMUP = env.bool('WARMUP', default=True)
+
+# Token buckets of the core/ throttles and the password hashing slots, shared by all workers of one instance,
+# see todolist.core.throttling
+THROTTLE_DIR = env.str('THROTTLE_DIR', default=str(Path(tempfile.gettempdir(), 'todolist-throttle')))
+# Password hashes running at once per instance, as a share of its CPUs, and how long a request waits for one
+PASSWORD_HASHING_CPU_SHARE = env.float('PASSWORD_HASHING_CPU_SHARE', default=0.5)
+PASSWORD_HASHING_WAIT = env.float('PASSWORD_HASHING_WAIT', default=2.0)
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -162,4 +247,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
+    # Proxies in front of the app appending to X-Forwarded-For, the client address is the one the outermost
+    # added: anything before it came from the client. 1 for the bundled nginx, 0 when serving clients directly
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=1),
+    # Token buckets: '5/min' holds 5 requests and refills one every 12 seconds
+    'DEFAULT_THROTTLE_RATES': {
+        'login.ip': env.str('THROTTLE_LOGIN_IP', default='30/min'),
+        'login.username': env.str('THROTTLE_LOGIN_USERNAME', default='5/min'),
+        'signup.ip': env.str('THROTTLE_SIGNUP_IP', default='10/hour'),
+        'update_password.user': env.str('THROTTLE_UPDATE_PASSWORD', default='5/min'),
+    },
 }
+if APP_PROFILE == 'api':
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['rest_framework.renderers.JSONRenderer']
@@ -1,12 +1,19 @@
-from django.contrib import admin
+from django.conf import settings
 from django.urls import include, path
 
-from todolist.core.views import health_check
+from todolist.core.views import health_check, metrics
 
 urlpatterns = [
     path('core/', include('todolist.core.urls')),
     path('goals/', include('todolist.goals.urls')),
-    path('oauth/', include('social_django.urls', namespace='social')),
     path('ping/', health_check, name='health-check'),
-    path('admin/', admin.site.urls),
+    path('metrics/', metrics, name='metrics'),
 ]
+
+if settings.APP_PROFILE == 'full':
+    from django.contrib import admin
+
+    urlpatterns += [
+        path('oauth/', include('social_django.urls', namespace='social')),
+        path('admin/', admin.site.urls),
+    ]
@@ -0,0 +1,60 @@
+"""
+Does at worker boot what the first request of every worker would otherwise pay for, see warm_up().
+Called by the WSGI and ASGI entry points unless WARMUP is off.
+"""
+import logging
+import time
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.contrib.auth import get_backends
+from django.contrib.auth.password_validation import get_default_password_validators
+from django.db import DatabaseError, connections
+from django.urls import URLResolver, get_resolver
+
+from todolist.core.throttling import get_store
+from todolist.goals.readers import ValuesListMixin, get_reader
+
+logger = logging.getLogger(__name__)
+
+
+def _callbacks(resolver: URLResolver) -> Iterator[Callable]:
+    for pattern in resolver.url_patterns:
+        # Compiled on first use otherwise
+        pattern.pattern.regex  # noqa: B018
+        if isinstance(pattern, URLResolver):
+            yield from _callbacks(pattern)
+        else:
+            yield pattern.callback
+
+
+def warm_up() -> None:
+    started = time.perf_counter()
+
+    # Imports the URLconf with every view and serializer module, and fills the reverse() lookups
+    resolver = get_resolver()
+    resolver.reverse_dict  # noqa: B018
+    for callback in _callbacks(resolver):
+        view_class = getattr(callback, 'cls', None)
+        if (serializer_class := getattr(view_class, 'serializer_class', None)) is None:
+            continue
+        # Model field introspection, validators and their regexes
+        serializer_class().fields  # noqa: B018
+        if issubclass(view_class, ValuesListMixin) and settings.FAST_LIST_SERIALIZERS:
+            get_reader(serializer_class)
+
+    # CommonPasswordValidator reads its gzipped list, social-auth backends are imported
+    get_default_password_validators()
+    get_backends()
+    get_store()
+
+    # The first connection of a process also looks up the server version and contrib.postgres' type OIDs.
+    # Closed again, i.e. handed to the pool, which a worker forked from a master loading the app doesn't inherit.
+    try:
+        connections['default'].ensure_connection()
+    except DatabaseError:
+        logger.warning('Warmup could not connect to the database', exc_info=True)
+    finally:
+        connections.close_all()
+
+    logger.info('Warmed up in %.2f ms', (time.perf_counter() - started) * 1000)
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
 
 application = get_wsgi_application()
+
+# Every gunicorn worker imports this module when it boots
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP:
+    from todolist.warmup import warm_up
+
+    warm_up()